@@ -1,71 +1,182 @@
-import tkinter as tk
-from tkinter import ttk
-from scripts.theme_manager import apply_theme
-from scripts.main_menu import MainMenu
-from scripts.quiz_menu import QuizMenu
-from scripts.settings_menu import SettingsMenu
-from scripts.verses_menu import VersesMenu
+import sys
+from scripts.startup_profile import profiler
+
+# --profile-startup has to be known before the imports it measures
+profiler.enabled = "--profile-startup" in sys.argv
+
+with profiler.phase("import tkinter"):
+    import tkinter as tk
+    from tkinter import ttk
+if profiler.enabled:
+    with profiler.phase("import pythonbible"):
+        # imported on its own first so its cost isn't folded into the menu imports
+        import pythonbible
+with profiler.phase("import theme_manager"):
+    from scripts.theme_manager import apply_theme
+with profiler.phase("import menus"):
+    from scripts.main_menu import MainMenu
+    from scripts.quiz_menu import QuizMenu
+    from scripts.settings_menu import SettingsMenu
+    from scripts.verses_menu import VersesMenu
+    from scripts.quiz_timer import QuizTimer
+    from scripts.review_scheduler import ReviewScheduler
+    from scripts.sheath import passage_key
+    from scripts.sheath_model import get_sheath_model
+    from scripts import passage_text
+    from scripts.latency_monitor import LatencyMonitor
+    from scripts.settings import get_settings
+    from scripts.metrics import metrics
+import argparse
+import atexit
 import ctypes
 import os
+import threading
 
 APPID = "com.tnjpl.swordofthespirit"
+# Pause between building frames in the background after startup
+PREWARM_DELAY_MS = 200
+# How often --metrics rewrites its file
+METRICS_INTERVAL_MS = 60 * 1000
+TIMER_SETTINGS = {"timer_enabled", "quiz_interval_minutes", "countdown_seconds"}
+
+
+def follow_settings(app):
+    """Apply the saved theme and quiz timer settings to `app` and keep them in sync."""
+    store = get_settings()
+
+    def apply(settings, changed):
+        if "theme" in changed:
+            apply_theme(settings.theme, app)
+        if changed & TIMER_SETTINGS:
+            app.quiz_timer.configure(
+                interval_minutes=settings.quiz_interval_minutes,
+                countdown_seconds=settings.countdown_seconds,
+                enabled=settings.timer_enabled,
+            )
+
+    apply(store.settings, {"theme"} | TIMER_SETTINGS)
+    store.subscribe(apply, "theme", *TIMER_SETTINGS)
 
 class App(tk.Tk):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, prewarm=True):
+        with profiler.phase("create Tk root"):
+            super().__init__()
+        self._prewarm = prewarm
 
         # Hide immediately so the window doesn't flash while building frames
         self.withdraw()
 
         self.title("Sword of the Spirit")
+        self._current_frame = None
 
         container = ttk.Frame(self)
         container.pack(fill="both", expand=True)
         container.grid_rowconfigure(0, weight=1)
         container.grid_columnconfigure(0, weight=1)
 
+        # Frames are built on first show_frame (and pre-warmed when the app is idle)
+        self.container = container
+        self.frame_classes = {
+            "MainMenu": MainMenu,
+            "SettingsMenu": SettingsMenu,
+            "VersesMenu": VersesMenu,
+            "QuizMenu": QuizMenu,
+        }
         self.frames = {}
-        for F, name in (
-            (MainMenu, "MainMenu"),
-            (SettingsMenu, "SettingsMenu"),
-            (VersesMenu, "VersesMenu"),
-            (QuizMenu, "QuizMenu"),
-        ):
-            frame = F(container, self)
-            self.frames[name] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
+
+        # Read the sheath on its writer thread; frames are told when it arrives
+        get_sheath_model(self)
 
         self.show_frame("MainMenu")
-        apply_theme("MidnightIndigo", self)
+        with profiler.phase("apply_theme (parses themes.json)"):
+            apply_theme(get_settings().settings.theme, self)
 
-        ico_path = os.path.join("assets", "icon.ico")
-        self.iconbitmap(ico_path)
-        icon = tk.PhotoImage(file="assets/icon1x1.png")
-        self.iconphoto(False, icon)
+        with profiler.phase("load icons"):
+            ico_path = os.path.join("assets", "icon.ico")
+            self.iconbitmap(ico_path)
+            icon = tk.PhotoImage(file="assets/icon1x1.png")
+            self.iconphoto(False, icon)
 
         ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(APPID)
 
         # Now that everything is built, show the window
-        self.update_idletasks()
-        self.deiconify()
-        self.lift()
-        self.focus_force()
+        with profiler.phase("first layout and show"):
+            self.update_idletasks()
+            self.deiconify()
+            self.lift()
+            self.focus_force()
 
         # Center window after layout is ready
         self.after(0, self._center_window)
 
+        # Build the other frames one at a time once the main menu is up
+        if prewarm:
+            self._schedule_prewarm()
+
+        # Timed quizzes: one pending after() between quizzes, countdown, then fullscreen quiz
+        self.quiz_timer = QuizTimer(
+            self,
+            self._start_timed_quiz,
+            is_busy=lambda: "QuizMenu" in self.frames and self.frames["QuizMenu"].quiz_active,
+        )
+        follow_settings(self)
+
+    def _start_timed_quiz(self):
+        self.deiconify()
+        self.lift()
+        self.focus_force()
+        self.show_frame("QuizMenu")
+        self.get_frame("QuizMenu").start_quiz()
+
     def _center_window(self):
-        self.update_idletasks()
-        w = self.winfo_width()
-        h = self.winfo_height()
-        sw = self.winfo_screenwidth()
-        sh = self.winfo_screenheight()
-        x = (sw - w) // 2
-        y = (sh - h) // 2
-        self.geometry(f"{w}x{h}+{x}+{y}")
+        with profiler.phase("_center_window"):
+            self.update_idletasks()
+            w = self.winfo_width()
+            h = self.winfo_height()
+            sw = self.winfo_screenwidth()
+            sh = self.winfo_screenheight()
+            x = (sw - w) // 2
+            y = (sh - h) // 2
+            self.geometry(f"{w}x{h}+{x}+{y}")
+        profiler.mark("main menu interactive")
+        if profiler.enabled and not self._prewarm:
+            profiler.write_report()
 
+    def get_frame(self, name):
+        """Return the named frame, building it on first use."""
+        frame = self.frames.get(name)
+        if frame is None:
+            with profiler.phase(f"build {name}"):
+                frame = self.frame_classes[name](self.container, self)
+                self.frames[name] = frame
+                frame.grid(row=0, column=0, sticky="nsew")
+        return frame
+
+    def _schedule_prewarm(self):
+        self.after(PREWARM_DELAY_MS, lambda: self.after_idle(self._prewarm_frames))
+
+    def _prewarm_frames(self):
+        """Build one not-yet-built frame per idle slot so input is never held up for long."""
+        for name in self.frame_classes:
+            if name not in self.frames:
+                self.get_frame(name)
+                # keep the current frame on top (and its min size) after building another
+                if self._current_frame is not None:
+                    self._current_frame.tkraise()
+                    try:
+                        self._current_frame.enforce_minsize()
+                    except Exception:
+                        pass
+                self._schedule_prewarm()
+                return
+        # every frame is built; startup is over
+        if profiler.enabled:
+            profiler.write_report()
+
+    @metrics.timed("frame_switch_seconds", "Time to show a frame (including building it the first time)")
     def show_frame(self, name):
-        frame = self.frames[name]
+        frame = self.get_frame(name)
+        self._current_frame = frame
         frame.tkraise()
         try:
             frame.enforce_minsize()
@@ -73,6 +184,105 @@ class App(tk.Tk):
             pass
 
 
+class ResidentApp(tk.Tk):
+    """
+    All-day mode: the root window stays hidden and no menu frames are built.
+    Between quizzes the process holds only the quiz timer and a warm passage
+    cache; the quiz window is built when a quiz is due and destroyed afterwards.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.withdraw()
+        self.title("Sword of the Spirit")
+
+        try:
+            ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(APPID)
+        except Exception:
+            pass
+
+        self.quiz_window = None
+        self.quiz_timer = QuizTimer(self, self._show_quiz, is_busy=lambda: self.quiz_window is not None)
+        follow_settings(self)
+        get_sheath_model(self).when_loaded(self._warm_next_passage)
+
+    def _warm_next_passage(self):
+        """Load the next scheduled passage's text in the background so the pop-up is instant."""
+        def worker():
+            try:
+                passages = get_sheath_model().passages()
+                scheduler = ReviewScheduler("resources/schedule.json")
+                scheduler.sync(passages)
+                by_key = {passage_key(ref): ref for ref in passages}
+                ref = by_key.get(scheduler.next_due())
+                if ref is not None:
+                    passage_text.warm([ref])
+            except Exception:
+                pass
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _show_quiz(self):
+        win = tk.Toplevel(self)
+        win.withdraw()
+        win.title("Sword of the Spirit")
+        win.configure(bg=self.cget("bg"))
+        try:
+            win.iconbitmap(os.path.join("assets", "icon.ico"))
+        except Exception:
+            pass
+
+        container = ttk.Frame(win)
+        container.pack(fill="both", expand=True)
+        quiz = QuizMenu(container, self)
+        quiz.pack(fill="both", expand=True)
+
+        self.quiz_window = win
+        win.bind("<Destroy>", self._on_quiz_destroyed, add="+")
+        win.deiconify()
+        win.lift()
+        win.focus_force()
+        quiz.start_quiz()
+
+    def show_frame(self, name):
+        # QuizMenu goes back to the main menu when it is done; here that ends the quiz
+        self._close_quiz()
+
+    def _close_quiz(self):
+        if self.quiz_window is not None:
+            self.quiz_window.destroy()
+
+    def _on_quiz_destroyed(self, event):
+        # <Destroy> also fires for every child widget; only react to the window itself
+        if event.widget is not self.quiz_window:
+            return
+        self.quiz_window = None
+        self._warm_next_passage()
+
+
 if __name__ == "__main__":
-    app = App()
+    parser = argparse.ArgumentParser(description="Sword of the Spirit")
+    parser.add_argument("--resident", action="store_true",
+                        help="run in the background and only open a window when a quiz is due")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="time the startup phases and write startup_profile.txt")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="write performance metrics to FILE every minute and at exit "
+                             "(JSON if it ends in .json, Prometheus text otherwise)")
+    parser.add_argument("--monitor-latency", action="store_true",
+                        help="log event-loop hitches (and what caused them) to hitches.log")
+    args = parser.parse_args()
+
+    app = ResidentApp() if args.resident else App()
+    if args.metrics:
+        def export_metrics():
+            metrics.write(args.metrics)
+            app.after(METRICS_INTERVAL_MS, export_metrics)
+        app.after(METRICS_INTERVAL_MS, export_metrics)
+        atexit.register(metrics.write, args.metrics)
+    if args.monitor_latency:
+        monitor = LatencyMonitor(app)
+        monitor.start()
     app.mainloop()
+    if args.monitor_latency:
+        print(monitor.summary())
@@ -0,0 +1,188 @@
+# scripts/api_server.py
+"""
+Local HTTP API over the sheath:  python -m scripts.api_server [--port 5000]
+
+    GET    /api/passages                  list (ETag / If-None-Match)
+    POST   /api/passages                  {"reference": "John 3:16", "memorized": false, "favorite": false}
+                                          (201 when added; 200 with the flags applied if already there)
+    GET    /api/passages/<key>
+    PATCH  /api/passages/<key>            {"memorized": true, "favorite": true}
+    DELETE /api/passages/<key>
+    GET    /api/passages/<key>/text
+    POST   /api/passages/<key>/grade      {"attempt": "...", "mode": "recite" | "reference", "duration": 12.5}
+    GET    /api/history                   per-passage attempt stats (ETag / If-None-Match)
+    GET    /api/history/<key>
+    GET    /metrics                       Prometheus text (?format=json for a JSON snapshot)
+
+Every request shares the process-wide SheathModel, passage-text cache and
+attempt history, so nothing re-reads verses.csv per request.
+"""
+import argparse
+import time
+
+import pythonbible as bible
+from flask import Flask, Response, jsonify, request
+
+from scripts.grading import grade_recitation
+from scripts.history import get_history
+from scripts.metrics import metrics
+from scripts.passage_text import get_canonical, get_passage_text
+from scripts.settings import get_settings
+from scripts.sheath_model import get_sheath_model
+from scripts.verse_index import grade_reference
+
+# Changes with every server start so ETags from an earlier run never match
+BOOT_ID = format(int(time.time()), "x")
+
+
+def passage_json(entry):
+    ref = entry.ref
+    return {
+        "key": entry.key,
+        "reference": bible.format_scripture_references([ref]),
+        "book": ref.book.value,
+        "start_chapter": ref.start_chapter,
+        "start_verse": ref.start_verse,
+        "end_chapter": ref.end_chapter,
+        "end_verse": ref.end_verse,
+        "end_book": ref.end_book.value if ref.end_book else None,
+        "memorized": entry.memorized,
+        "favorite": entry.favorite,
+    }
+
+
+def error(message, status):
+    response = jsonify({"error": message})
+    response.status_code = status
+    return response
+
+
+def conditional(payload, etag):
+    """JSON response carrying `etag`; answers 304 when the client already has it."""
+    response = jsonify(payload)
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
+def create_app(model=None, history=None, settings=None):
+    app = Flask(__name__)
+    model = model or get_sheath_model()
+    history = history or get_history()
+    settings = settings or get_settings()
+
+    def find(key):
+        return model.entries.get(key)
+
+    def apply_flags(entry, data):
+        if "memorized" in data:
+            model.set_status(entry.ref, 1 if data["memorized"] else 0)
+        if "favorite" in data:
+            model.set_favorite(entry.ref, bool(data["favorite"]))
+
+    @app.get("/api/passages")
+    def list_passages():
+        version = model.version
+        payload = [passage_json(entry) for entry in list(model.entries.values())]
+        return conditional(payload, f"{BOOT_ID}-{version}")
+
+    @app.post("/api/passages")
+    def add_passage():
+        data = request.get_json(silent=True) or {}
+        refs = bible.get_references(str(data.get("reference", "")))
+        if not refs:
+            return error("reference not recognised", 400)
+        existing = model.get(refs[0])
+        if existing is not None:
+            # already in the sheath: apply the flags that were given, like PATCH
+            apply_flags(existing, data)
+            return jsonify(passage_json(existing))
+        status = 1 if data.get("memorized") else 0
+        entry = model.add(refs[0], status, bool(data.get("favorite", False)))
+        response = jsonify(passage_json(entry))
+        response.status_code = 201
+        return response
+
+    @app.get("/api/passages/<key>")
+    def get_passage(key):
+        entry = find(key)
+        if entry is None:
+            return error("no such passage", 404)
+        return jsonify(passage_json(entry))
+
+    @app.patch("/api/passages/<key>")
+    def update_passage(key):
+        entry = find(key)
+        if entry is None:
+            return error("no such passage", 404)
+        apply_flags(entry, request.get_json(silent=True) or {})
+        return jsonify(passage_json(entry))
+
+    @app.delete("/api/passages/<key>")
+    def remove_passage(key):
+        entry = find(key)
+        if entry is None:
+            return error("no such passage", 404)
+        model.remove(entry.ref)
+        return "", 204
+
+    @app.get("/api/passages/<key>/text")
+    def passage_text(key):
+        entry = find(key)
+        if entry is None:
+            return error("no such passage", 404)
+        # the text of a reference never changes, so the key is a valid ETag
+        return conditional({"key": key, "text": get_passage_text(entry.ref)}, key)
+
+    @app.post("/api/passages/<key>/grade")
+    def grade(key):
+        entry = find(key)
+        if entry is None:
+            return error("no such passage", 404)
+        data = request.get_json(silent=True) or {}
+        attempt = str(data.get("attempt", ""))
+        if not attempt.strip():
+            return error("attempt is empty", 400)
+        mode = data.get("mode", "recite")
+        pass_score = settings.settings.pass_score
+        if mode == "reference":
+            percent, message = grade_reference(attempt, entry.ref)
+        elif mode == "recite":
+            percent, message = grade_recitation(get_canonical(entry.ref), attempt, pass_score)
+        else:
+            return error("mode must be 'recite' or 'reference'", 400)
+        try:
+            duration = float(data.get("duration", 0))
+        except (TypeError, ValueError):
+            duration = 0.0
+        history.record(entry.ref, percent, duration, mode, pass_score, source="api")
+        return jsonify({"key": key, "score": percent, "passed": percent >= pass_score,
+                        "message": message, "stats": history.get_stats(entry.ref, mode)})
+
+    @app.get("/api/history")
+    def list_history():
+        etag = f"{BOOT_ID}-{model.version}-{history.version}"
+        payload = {entry.key: history.get_stats(entry.ref) for entry in list(model.entries.values())}
+        return conditional(payload, etag)
+
+    @app.get("/api/history/<key>")
+    def passage_history(key):
+        entry = find(key)
+        if entry is None:
+            return error("no such passage", 404)
+        return jsonify(history.get_stats(entry.ref))
+
+    @app.get("/metrics")
+    def export_metrics():
+        if request.args.get("format") == "json":
+            return jsonify(metrics.snapshot())
+        return Response(metrics.prometheus_text(), mimetype="text/plain; version=0.0.4")
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sword of the Spirit local API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    args = parser.parse_args()
+    create_app().run(host=args.host, port=args.port, threaded=True)
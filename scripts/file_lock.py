@@ -0,0 +1,30 @@
+# scripts/file_lock.py
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Exclusive lock on `path` (created if missing) shared between processes, so
+    the app, the resident timer, the terminal quiz and the API server can share
+    the files under resources/. Blocks until the lock is free.
+    """
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            # LK_LOCK retries for about 10 seconds before raising OSError
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
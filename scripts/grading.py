@@ -0,0 +1,264 @@
+# scripts/grading.py
+import re
+from difflib import SequenceMatcher
+
+# Recitation scores at or above this get "Excellent!"
+EXCELLENT_SCORE = 95
+DEFAULT_PASS_SCORE = 75
+
+
+def clean_text(s: str) -> str:
+    """Lower-case, strip punctuation and collapse whitespace before comparing."""
+    if s is None:
+        return ""
+    s = re.sub(r"[^\w\s]", "", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s.lower()
+
+
+def similarity(canonical, attempt):
+    """Percent similarity of two already-cleaned strings."""
+    return int(SequenceMatcher(None, canonical, attempt).ratio() * 100)
+
+
+def result_message(percent, pass_score=DEFAULT_PASS_SCORE):
+    if percent >= EXCELLENT_SCORE:
+        return f"Excellent! Similarity: {percent}%."
+    if percent >= pass_score:
+        return f"Good! Similarity: {percent}%."
+    return f"Keep practicing to get above a {pass_score}%. Similarity: {percent}%."
+
+
+def grade_recitation(passage_text, attempt, pass_score=DEFAULT_PASS_SCORE):
+    """
+    Grade a recited attempt against the passage text (a string or a
+    CanonicalText). Returns (percent, message).
+    """
+    percent = similarity(prepare_canonical(passage_text).cleaned, clean_text(attempt))
+    return percent, result_message(percent, pass_score)
+
+
+def word_diff(canonical, attempt):
+    """
+    Word-level diff of the cleaned texts: a list of (op, canonical_words, attempt_words)
+    with op one of "equal", "replace", "delete" (words left out) or "insert" (extra words).
+    """
+    canon_words = clean_text(canonical).split()
+    attempt_words = clean_text(attempt).split()
+    matcher = SequenceMatcher(None, canon_words, attempt_words, autojunk=False)
+    return [(op, canon_words[i1:i2], attempt_words[j1:j2])
+            for op, i1, i2, j1, j2 in matcher.get_opcodes()]
+
+
+def strip_punct(s: str) -> str:
+    """Return string with punctuation removed for comparison (keeps letters/numbers)."""
+    if s is None:
+        return ""
+    return re.sub(r"[^\w\s]", "", s).lower()
+
+
+def tokenize_for_diff(text: str):
+    """Tokenize text into words, punctuation, and whitespace tokens."""
+    if text is None:
+        return []
+    return re.findall(r'(\w+|[^\w\s]|\s+)', text)
+
+
+def build_word_list(tokens):
+    """
+    Words of a token list (punctuation and whitespace skipped) and, for each word,
+    its index in `tokens`. Word i of a passage is the i-th word here.
+    """
+    words = []
+    idx_map = []
+    for i, t in enumerate(tokens):
+        if t.isspace():
+            continue
+        if re.fullmatch(r'[^\w\s]', t):
+            continue
+        words.append(t)
+        idx_map.append(i)
+    return words, idx_map
+
+
+class CanonicalText:
+    """
+    Everything grading needs from a passage, computed once: the text, its
+    cleaned form, its diff tokens and its words with their token indices.
+    """
+    __slots__ = ("text", "cleaned", "tokens", "words", "word_map")
+
+    def __init__(self, text):
+        self.text = text or ""
+        self.cleaned = clean_text(self.text)
+        self.tokens = tokenize_for_diff(self.text)
+        self.words, self.word_map = build_word_list(self.tokens)
+
+
+def prepare_canonical(canonical):
+    """CanonicalText for a passage string (already-prepared passages pass through)."""
+    return canonical if isinstance(canonical, CanonicalText) else CanonicalText(canonical)
+
+
+def annotation_segments(canonical, user_attempt: str, errors=None):
+    """
+    Mark up the passage (a string or a CanonicalText, whose tokens are reused)
+    against an attempt as a list of (text, tag) segments (QuizMenu shows them
+    in the answer box):
+    - punctuation/case-only differences -> 'cap'
+    - character-level differences -> 'wrong' (user's chars) + 'added' (passage's chars)
+    - omitted canonical tokens -> 'added'
+    - extra user tokens -> 'wrong'
+    Tag None / 'normal' is plain text. Index accesses are bounded and
+    canon_pos/user_pos always advance, so it cannot loop forever.
+
+    If `errors` is a list, the index of every passage word that was missed or
+    typed wrong (not just in case/punctuation) is appended to it.
+    """
+    segments = []
+
+    # Tokenize (only the attempt; the passage side is prepared once per passage)
+    canonical = prepare_canonical(canonical)
+    canon_tokens = canonical.tokens
+    canon_words, canon_map = canonical.words, canonical.word_map
+    user_tokens = tokenize_for_diff(user_attempt)
+    user_words, user_map = build_word_list(user_tokens)
+
+    sm = SequenceMatcher(None, canon_words, user_words)
+
+    canon_pos = 0   # index into canon_tokens
+    user_pos = 0    # index into user_tokens
+
+    def insert_token(tok, tag=None):
+        if tok:
+            segments.append((tok, tag))
+
+    def insert_intervening(from_idx, to_idx, tokens):
+        # Insert tokens[from_idx:to_idx] safely
+        if from_idx < 0:
+            from_idx = 0
+        if to_idx > len(tokens):
+            to_idx = len(tokens)
+        for i in range(from_idx, to_idx):
+            insert_token(tokens[i])
+        return to_idx
+
+    # Character-level annotate helper
+    def annotate_token_chars(canon_tok, user_tok):
+        if user_tok is None:
+            insert_token(canon_tok, "added")
+            return
+
+        # punctuation/case-only difference -> cap
+        if strip_punct(user_tok) == strip_punct(canon_tok) and user_tok != canon_tok:
+            insert_token(canon_tok, "cap")
+            return
+
+        # char-level diff
+        char_sm = SequenceMatcher(None, user_tok, canon_tok)
+        for op, a0, a1, b0, b1 in char_sm.get_opcodes():
+            if op == "equal":
+                insert_token(canon_tok[b0:b1], "normal")
+            elif op == "replace":
+                # user chars crossed out, canonical chars added
+                if a0 < a1:
+                    insert_token(user_tok[a0:a1], "wrong")
+                if b0 < b1:
+                    insert_token(canon_tok[b0:b1], "added")
+            elif op == "delete":
+                # user had extra chars
+                insert_token(user_tok[a0:a1], "wrong")
+            elif op == "insert":
+                # canonical has extra chars
+                insert_token(canon_tok[b0:b1], "added")
+
+    # Walk opcodes safely
+    try:
+        for opcode, a0, a1, b0, b1 in sm.get_opcodes():
+            if opcode == "equal":
+                for wi in range(a0, a1):
+                    if wi >= len(canon_map):
+                        break
+                    tok_index = canon_map[wi]
+                    canon_pos = insert_intervening(canon_pos, tok_index, canon_tokens)
+                    # find corresponding user token index safely
+                    user_index_in_map = b0 + (wi - a0)
+                    user_tok = ""
+                    if 0 <= user_index_in_map < len(user_map):
+                        user_tok_index = user_map[user_index_in_map]
+                        user_tok = user_tokens[user_tok_index] if 0 <= user_tok_index < len(user_tokens) else ""
+                    canon_tok = canon_tokens[canon_pos] if canon_pos < len(canon_tokens) else ""
+                    if strip_punct(user_tok) == strip_punct(canon_tok) and user_tok != canon_tok:
+                        insert_token(canon_tok, "cap")
+                    else:
+                        insert_token(canon_tok, "normal")
+                    canon_pos += 1
+                    # advance user_pos to at least after the user token we consumed
+                    if 0 <= user_index_in_map < len(user_map):
+                        user_pos = max(user_pos, user_map[user_index_in_map] + 1)
+            elif opcode == "replace":
+                # pair up tokens as much as possible, but bound indices
+                pair_count = max(a1 - a0, b1 - b0)
+                for i in range(pair_count):
+                    # canonical token (if exists)
+                    canon_tok = None
+                    if a0 + i < a1 and (a0 + i) < len(canon_map):
+                        canon_tok_index = canon_map[a0 + i]
+                        canon_pos = insert_intervening(canon_pos, canon_tok_index, canon_tokens)
+                        if canon_pos < len(canon_tokens):
+                            canon_tok = canon_tokens[canon_pos]
+                    # user token (if exists)
+                    user_tok = None
+                    if b0 + i < b1 and (b0 + i) < len(user_map):
+                        user_tok_index = user_map[b0 + i]
+                        if 0 <= user_tok_index < len(user_tokens):
+                            user_tok = user_tokens[user_tok_index]
+                    # annotate
+                    if canon_tok is not None and user_tok is not None:
+                        annotate_token_chars(canon_tok, user_tok)
+                        if errors is not None and strip_punct(user_tok) != strip_punct(canon_tok):
+                            errors.append(a0 + i)
+                        canon_pos += 1
+                        user_pos = max(user_pos, (user_tok_index or 0) + 1)
+                    elif canon_tok is not None and user_tok is None:
+                        insert_token(canon_tok, "added")
+                        if errors is not None:
+                            errors.append(a0 + i)
+                        canon_pos += 1
+                    elif canon_tok is None and user_tok is not None:
+                        insert_token(user_tok, "wrong")
+                        user_pos = max(user_pos, (user_tok_index or 0) + 1)
+                # any extra user tokens in this replace block -> crossed out
+                for uj in range(b0 + pair_count, b1):
+                    if uj < len(user_map):
+                        uidx = user_map[uj]
+                        if 0 <= uidx < len(user_tokens):
+                            insert_token(user_tokens[uidx], "wrong")
+                            user_pos = max(user_pos, uidx + 1)
+            elif opcode == "delete":
+                for wi in range(a0, a1):
+                    if wi >= len(canon_map):
+                        break
+                    canon_tok_index = canon_map[wi]
+                    canon_pos = insert_intervening(canon_pos, canon_tok_index, canon_tokens)
+                    if canon_pos < len(canon_tokens):
+                        insert_token(canon_tokens[canon_pos], "added")
+                        if errors is not None:
+                            errors.append(wi)
+                        canon_pos += 1
+            elif opcode == "insert":
+                for uj in range(b0, b1):
+                    if uj >= len(user_map):
+                        break
+                    uidx = user_map[uj]
+                    if 0 <= uidx < len(user_tokens):
+                        insert_token(user_tokens[uidx], "wrong")
+                        user_pos = max(user_pos, uidx + 1)
+    except Exception:
+        # If anything unexpected happens, fall back to inserting canonical text plainly
+        insert_token(canonical.text, "added")
+
+    # Insert any remaining canonical tokens
+    canon_pos = insert_intervening(canon_pos, len(canon_tokens), canon_tokens)
+
+    return segments
@@ -0,0 +1,91 @@
+# scripts/hints.py
+import re
+from difflib import SequenceMatcher
+
+# How far ahead in the passage an exact word match may be found (covers skipped words)
+LOOKAHEAD = 4
+# How similar a word must be to the expected one to count as a misspelling of it
+FUZZY_RATIO = 0.6
+
+
+def _clean_word(w):
+    return re.sub(r"[^\w]", "", w).lower()
+
+
+class PrefixAligner:
+    """
+    Tracks where the user is in the passage while they type.
+    Keeps one canonical position per typed word, so each update only
+    re-aligns the words at or after the first changed character.
+    """
+
+    def __init__(self, canonical_text):
+        # display words (with punctuation) and their cleaned forms, kept parallel
+        self.display_words = []
+        self.words = []
+        for raw in (canonical_text or "").split():
+            cleaned = _clean_word(raw)
+            if cleaned:
+                self.display_words.append(raw)
+                self.words.append(cleaned)
+
+        self._text = ""
+        self._ends = []       # end offset of each typed word in self._text
+        self._positions = []  # canonical position after each typed word
+
+    @property
+    def position(self):
+        """Index of the next canonical word the user has not typed yet."""
+        return self._positions[-1] if self._positions else 0
+
+    def update(self, text):
+        """Re-align after an edit; only the changed tail is tokenized and matched."""
+        old = self._text
+        if text.startswith(old):
+            # plain typing at the end: nothing before the old end changed
+            common = len(old)
+        else:
+            common = 0
+            limit = min(len(old), len(text))
+            while common < limit and old[common] == text[common]:
+                common += 1
+
+        # drop typed words that touch the changed region (a word that ends exactly
+        # at `common` may have grown, so it is re-aligned too)
+        keep = len(self._ends)
+        while keep and self._ends[keep - 1] >= common:
+            keep -= 1
+        tail_start = self._ends[keep - 1] if keep else 0
+        del self._ends[keep:]
+        del self._positions[keep:]
+
+        self._text = text
+        pos = self.position
+        for m in re.finditer(r"\S+", text[tail_start:]):
+            word = _clean_word(m.group())
+            if not word:
+                continue
+            pos = self._advance(pos, word)
+            self._ends.append(tail_start + m.end())
+            self._positions.append(pos)
+        return self.position
+
+    def _advance(self, pos, word):
+        """Canonical position after matching `word` typed at `pos`."""
+        words = self.words
+        # exact match nearby (the user may have skipped a word or two)
+        for k in range(pos, min(pos + LOOKAHEAD, len(words))):
+            if words[k] == word:
+                return k + 1
+        if pos < len(words):
+            expected = words[pos]
+            # partially typed or misspelled word still counts as that word
+            if expected.startswith(word) or SequenceMatcher(None, expected, word).ratio() >= FUZZY_RATIO:
+                return pos + 1
+        # an extra word the passage doesn't have: stay put
+        return pos
+
+    def next_words(self, count=3, start=None):
+        """Return the next `count` passage words (with punctuation) after the user's position."""
+        start = self.position if start is None else start
+        return self.display_words[start:start + count]
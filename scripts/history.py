@@ -0,0 +1,212 @@
+# scripts/history.py
+import atexit
+import json
+import os
+import threading
+import time
+
+from scripts.file_lock import file_lock
+from scripts.sheath import passage_key
+
+HISTORY_FILE = "resources/history.log"
+STATS_FILE = "resources/history_stats.json"
+
+# Appends are buffered and written once this many are pending or this many seconds pass
+FLUSH_EVERY = 16
+FLUSH_SECONDS = 30
+# Fold the log into the aggregates once it holds this many attempts
+COMPACT_AFTER = 500
+# Pass mark for attempts logged without one (events written before `passed` was stored)
+PASS_SCORE = 75
+# Reference-recall attempts (naming the reference from the text) are aggregated
+# separately: they say nothing about whether the passage itself is memorized
+REFERENCE_MODE = "reference"
+
+
+def _key(ref):
+    """Passage key for a reference (keys may also be passed in directly)."""
+    return ref if isinstance(ref, str) else passage_key(ref)
+
+
+def _empty_stats():
+    return {"count": 0, "total": 0, "mean": 0.0, "last": None, "best": 0,
+            "streak": 0, "last_time": None}
+
+
+class AttemptHistory:
+    """
+    Append-only log of quiz attempts (one JSON object per line) plus
+    per-passage aggregates (count, mean, last score, best, passing streak) of
+    recitations, with reference-recall attempts aggregated on their own.
+
+    The aggregates are kept current in memory on every record. Compaction
+    folds the log into STATS_FILE and starts a new log generation; each log
+    begins with a {"gen": N} header so a crash between writing the stats and
+    resetting the log never counts attempts twice.
+
+    Several processes (the app, the terminal quiz, the API server) may share
+    the files: appends and compaction hold a lock file, and compaction re-reads
+    the files first, so attempts logged by another process are folded in too.
+    """
+
+    def __init__(self, log_filename=HISTORY_FILE, stats_filename=STATS_FILE):
+        self.log_filename = log_filename
+        self.stats_filename = stats_filename
+        self.lock_filename = log_filename + ".lock"
+        self.stats = {}       # passage key -> aggregate dict (recitations)
+        self.reference_stats = {}  # passage key -> aggregate dict (reference recall)
+        self.version = 0      # bumped on every recorded attempt (used for HTTP ETags)
+        self._gen = 0
+        self._log_count = 0   # attempts in the current log generation
+        self._pending = []
+        self._flush_timer = None
+        self._lock = threading.Lock()
+        self.load()
+
+    # ----------------- Loading -----------------
+    def load(self):
+        """Read the aggregates snapshot and replay the (short) log tail on top of it."""
+        with file_lock(self.lock_filename):
+            with self._lock:
+                self._read_files()
+        if self._log_count >= COMPACT_AFTER:
+            self.compact()
+
+    def _read_files(self):
+        """Replace the in-memory aggregates with the files' (hold both locks)."""
+        self.version += 1
+        try:
+            with open(self.stats_filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._gen = data.get("gen", 0)
+            self.stats = data.get("passages", {})
+            self.reference_stats = data.get("reference", {})
+        except (FileNotFoundError, ValueError):
+            self._gen = 0
+            self.stats = {}
+            self.reference_stats = {}
+
+        self._log_count = 0
+        try:
+            with open(self.log_filename, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline() or "{}")
+                if header.get("gen") != self._gen:
+                    # log from an older generation was already folded in
+                    raise FileNotFoundError
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue  # torn final line from a crash
+                    self._apply(event)
+                    self._log_count += 1
+        except FileNotFoundError:
+            self._start_log()
+
+    def _start_log(self):
+        tmp = self.log_filename + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"gen": self._gen}) + "\n")
+        os.replace(tmp, self.log_filename)
+        self._log_count = 0
+
+    # ----------------- Recording -----------------
+    def _apply(self, event):
+        table = self.reference_stats if event.get("mode") == REFERENCE_MODE else self.stats
+        stats = table.setdefault(event["ref"], _empty_stats())
+        score = event["score"]
+        stats["count"] += 1
+        stats["total"] += score
+        stats["mean"] = round(stats["total"] / stats["count"], 2)
+        stats["last"] = score
+        stats["best"] = max(stats["best"], score)
+        passed = event.get("passed", score >= PASS_SCORE)
+        stats["streak"] = stats["streak"] + 1 if passed else 0
+        stats["last_time"] = event["t"]
+        self.version += 1
+
+    def record(self, ref, score, duration, mode, pass_score=PASS_SCORE, **extra):
+        """
+        Append one attempt and update its passage's aggregates. Whether it passed
+        is judged with the caller's pass_score (the configured one) and logged.
+        """
+        event = {"t": round(time.time(), 3), "ref": _key(ref), "score": int(score),
+                 "duration": round(duration, 2), "mode": mode, "passed": score >= pass_score}
+        event.update(extra)
+        with self._lock:
+            self._apply(event)
+            self._pending.append(json.dumps(event))
+            due = len(self._pending) >= FLUSH_EVERY
+            if not due and self._flush_timer is None:
+                # the first buffered attempt is written within FLUSH_SECONDS
+                self._flush_timer = threading.Timer(FLUSH_SECONDS, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write pending attempts to the log in one append."""
+        if not self._pending:
+            return
+        with file_lock(self.lock_filename):
+            with self._lock:
+                if not self._pending:
+                    return
+                self._append_pending()
+                compact = self._log_count >= COMPACT_AFTER
+        if compact:
+            self.compact()
+
+    def _append_pending(self):
+        """Move the buffered attempts into the log (hold both locks)."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        lines, self._pending = self._pending, []
+        if lines:
+            with open(self.log_filename, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            self._log_count += len(lines)
+
+    def compact(self):
+        """
+        Fold everything logged so far (by any process) into the aggregates file
+        and start a new log.
+        """
+        with file_lock(self.lock_filename):
+            with self._lock:
+                # everything buffered goes into the log being folded, so it is counted exactly once
+                self._append_pending()
+                # another process may have logged (or compacted) since we loaded: start from the files
+                self._read_files()
+                data = {"gen": self._gen + 1, "passages": self.stats, "reference": self.reference_stats}
+                tmp = self.stats_filename + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=1)
+                os.replace(tmp, self.stats_filename)
+                self._gen += 1
+                self._start_log()
+
+    # ----------------- Queries -----------------
+    def get_stats(self, ref, mode=None):
+        """
+        Return the recitation aggregates for a passage (zeros if it was never
+        attempted), or its reference-recall aggregates with mode=REFERENCE_MODE.
+        """
+        table = self.reference_stats if mode == REFERENCE_MODE else self.stats
+        return table.get(_key(ref), _empty_stats())
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def get_history():
+    """Return the shared AttemptHistory (flushed automatically at exit)."""
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = AttemptHistory()
+            atexit.register(_history.flush)
+        return _history
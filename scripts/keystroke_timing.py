@@ -0,0 +1,129 @@
+# scripts/keystroke_timing.py
+from array import array
+from collections import OrderedDict
+
+from scripts.persisted_store import PersistedStore, shared_store
+
+HESITATION_FILE = "resources/hesitation.json"
+
+# Keystrokes kept per attempt; older ones are overwritten (ring buffer)
+CAPACITY = 4096
+# Gaps longer than this are the user stepping away, not hesitating
+MAX_GAP_MS = 60000
+# A pause before a word this long counts as hesitation in the result message
+HESITATION_MS = 1500
+# Passages and words per passage kept in the aggregates
+MAX_PASSAGES = 500
+MAX_WORDS = 2000
+# Weight of the newest attempt in the per-word moving average
+SMOOTHING = 0.3
+
+
+class KeystrokeRecorder:
+    """
+    Per-keystroke timing for one attempt: the Tk event time (ms) and the
+    aligner's passage position after each key, in two parallel array('I')
+    ring buffers. record() is two stores and an increment.
+    """
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.times = array("I", [0]) * capacity
+        self.positions = array("I", [0]) * capacity
+        self.count = 0   # keystrokes recorded since reset (may exceed capacity)
+
+    def reset(self):
+        self.count = 0
+
+    def record(self, time_ms, position):
+        i = self.count % self.capacity
+        self.times[i] = time_ms & 0xFFFFFFFF
+        self.positions[i] = position
+        self.count += 1
+
+    def _ordered(self):
+        """(time, position) pairs oldest first."""
+        n = min(self.count, self.capacity)
+        start = self.count - n
+        for k in range(start, self.count):
+            i = k % self.capacity
+            yield self.times[i], self.positions[i]
+
+    def word_pauses(self, word_count):
+        """
+        Longest pause (ms) before a keystroke on each passage word. A key that
+        leaves the aligner at position p was typed on word p - 1.
+        """
+        pauses = array("I", [0]) * word_count
+        prev = None
+        for t, pos in self._ordered():
+            if prev is not None and 0 < pos <= word_count:
+                gap = (t - prev) & 0xFFFFFFFF   # Tk event times wrap at 2**32
+                if gap <= MAX_GAP_MS and gap > pauses[pos - 1]:
+                    pauses[pos - 1] = gap
+            prev = t
+        return pauses
+
+
+def hesitations(pauses, words, limit=3, threshold=HESITATION_MS):
+    """The `limit` words with the longest pauses over `threshold`, as (word, seconds)."""
+    slow = sorted((p, i) for i, p in enumerate(pauses) if p >= threshold)
+    return [(words[i], p / 1000) for p, i in reversed(slow[-limit:])]
+
+
+class HesitationStore(PersistedStore):
+    """
+    Per-passage moving average of the pause before each word (ms, array('I')),
+    persisted to HESITATION_FILE. Only the MAX_PASSAGES most recently practiced
+    passages are kept.
+    """
+
+    def __init__(self, filename=HESITATION_FILE):
+        self.passages = OrderedDict()   # passage key -> array('I') of per-word pauses
+        super().__init__(filename)
+
+    def from_json(self, data):
+        for key, values in data.items():
+            self.passages[key] = array("I", values[:MAX_WORDS])
+
+    def to_json(self):
+        return {key: values.tolist() for key, values in self.passages.items()}
+
+    def record(self, key, pauses):
+        """Fold one attempt's per-word pauses into the passage's averages."""
+        pauses = pauses[:MAX_WORDS]
+        if not pauses:
+            return
+        with self._lock:
+            averages = self.passages.pop(key, None)
+            if averages is None or len(averages) != len(pauses):
+                averages = array("I", pauses)
+            else:
+                for i, p in enumerate(pauses):
+                    averages[i] = int(averages[i] + SMOOTHING * (p - averages[i]))
+            self.passages[key] = averages
+            while len(self.passages) > MAX_PASSAGES:
+                self.passages.popitem(last=False)
+            due = self._changed()
+        if due:
+            self.save()
+
+    def get(self, key):
+        return self.passages.get(key)
+
+    def weight_factor(self, key, floor_ms=1000, span_ms=4000):
+        """
+        Sampling multiplier from 1.0 (fluent) to 2.0 (long pauses): passages
+        the user hesitates in come up more often.
+        """
+        averages = self.passages.get(key)
+        if not averages:
+            return 1.0
+        slowest = sorted(averages)[-3:]
+        mean = sum(slowest) / len(slowest)
+        return 1.0 + min(max(mean - floor_ms, 0) / span_ms, 1.0)
+
+
+def get_hesitation_store():
+    """Return the shared HesitationStore (saved automatically at exit)."""
+    return shared_store(HesitationStore)
@@ -0,0 +1,146 @@
+# scripts/latency_monitor.py
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+LOG_FILE = "hitches.log"
+LOG_MAX_BYTES = 256 * 1024
+LOG_BACKUPS = 2
+INTERVAL_MS = 50        # heartbeat period
+THRESHOLD_MS = 100      # lag that counts as a hitch
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Hitch:
+    __slots__ = ("time", "lag_ms", "handler", "location")
+
+    def __init__(self, lag_ms, handler, location):
+        self.time = time.time()
+        self.lag_ms = lag_ms
+        self.handler = handler      # outermost app function on the stack, e.g. "QuizMenu._on_submit"
+        self.location = location    # innermost app frame, "file:line in function"
+
+    def __str__(self):
+        text = f"hitch {self.lag_ms:.0f} ms in {self.handler or 'Tk (no app code on stack)'}"
+        if self.location:
+            text += f" at {self.location}"
+        return text
+
+
+class LatencyMonitor:
+    """
+    Measures Tk event-loop lag (main.py --monitor-latency).
+
+    A heartbeat after() callback notes when it should fire next; if it fires
+    more than THRESHOLD_MS late, the loop was blocked and a hitch is recorded.
+    To say *what* blocked it, a watchdog thread samples the Tk thread's stack
+    as soon as the heartbeat is overdue, while the slow handler is still running.
+    Hitches go to a rotating log file and are kept in `hitches` for display.
+    """
+
+    def __init__(self, root, interval_ms=INTERVAL_MS, threshold_ms=THRESHOLD_MS, log_file=LOG_FILE):
+        self.root = root
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.hitches = deque(maxlen=200)
+        self.worst = None
+
+        self._main_ident = threading.get_ident()
+        self._expected = None
+        self._sample = None         # (handler, location) captured by the watchdog
+        self._job = None
+        self._running = False
+
+        self.log = logging.getLogger("sword.latency")
+        self.log.propagate = False
+        if log_file and not self.log.handlers:
+            handler = RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES,
+                                          backupCount=LOG_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.log.addHandler(handler)
+            self.log.setLevel(logging.INFO)
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._schedule()
+        threading.Thread(target=self._watch, name="latency-watchdog", daemon=True).start()
+
+    def stop(self):
+        self._running = False
+        if self._job is not None:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    # ----------------- Heartbeat (Tk thread) -----------------
+    def _schedule(self):
+        self._expected = time.perf_counter() + self.interval
+        self._job = self.root.after(int(self.interval * 1000), self._beat)
+
+    def _beat(self):
+        lag = time.perf_counter() - self._expected
+        if lag >= self.threshold:
+            handler, location = self._sample or (None, None)
+            self._record(Hitch(lag * 1000, handler, location))
+        self._sample = None
+        if self._running:
+            self._schedule()
+
+    def _record(self, hitch):
+        self.hitches.append(hitch)
+        if self.worst is None or hitch.lag_ms > self.worst.lag_ms:
+            self.worst = hitch
+        self.log.info(str(hitch))
+
+    # ----------------- Watchdog (background thread) -----------------
+    def _watch(self):
+        while self._running:
+            time.sleep(self.interval / 2)
+            expected = self._expected
+            if expected is None or self._sample is not None:
+                continue
+            if time.perf_counter() - expected >= self.threshold:
+                self._sample = self._sample_tk_thread()
+
+    def _sample_tk_thread(self):
+        """Return (handler, location) for the app code the Tk thread is running."""
+        frame = sys._current_frames().get(self._main_ident)
+        if frame is None:
+            return None, None
+        app_frames = [
+            f for f in traceback.extract_stack(frame)
+            if f.filename.startswith(APP_DIR) and f.name not in ("<module>", "mainloop", "<lambda>")
+            # instrumentation wrappers (metrics.timed) would hide the handler they wrap
+            and not f.filename.endswith(("latency_monitor.py", "metrics.py"))
+        ]
+        if not app_frames:
+            return None, None
+        outer, inner = app_frames[0], app_frames[-1]
+        location = f"{os.path.relpath(inner.filename, APP_DIR)}:{inner.lineno} in {inner.name}"
+        return _qualified_name(frame, outer), location
+
+    def summary(self):
+        if not self.hitches:
+            return "No hitches recorded."
+        return f"{len(self.hitches)} hitches, worst: {self.worst}"
+
+
+def _qualified_name(frame, summary):
+    """Prefix a stack entry's function name with its class when it is a method."""
+    while frame is not None:
+        if frame.f_code.co_filename == summary.filename and frame.f_code.co_name == summary.name:
+            owner = frame.f_locals.get("self")
+            if owner is not None:
+                return f"{type(owner).__name__}.{summary.name}"
+            break
+        frame = frame.f_back
+    return summary.name
@@ -0,0 +1,181 @@
+# scripts/load_test.py
+"""
+Headless load test of the quiz core:  python -m scripts.load_test [--users 50] [--sessions 20]
+
+Each virtual user works on its own copy of the sheath and runs quiz sessions:
+read the sheath, resolve the passage text, type an attempt with realistic
+mistakes, grade it, build the annotation segments and save a flag change
+back to the sheath. Reports throughput, p50/p95/p99 latency per operation
+and peak RSS.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scripts.grading import annotation_segments, grade_recitation
+from scripts.passage_text import get_canonical
+from scripts.sheath import Sheath
+
+SHEATH_FILE = "resources/verses.csv"
+OPERATIONS = ("sheath read", "passage text", "grade", "annotate", "sheath write", "session")
+
+
+def make_attempt(text, rng, error_rate):
+    """Recitation with typical mistakes: dropped, swapped, misspelled and extra words."""
+    words = text.split()
+    attempt = []
+    for word in words:
+        roll = rng.random()
+        if roll >= error_rate:
+            attempt.append(word)
+        elif roll < error_rate * 0.3:
+            continue                                    # forgot the word
+        elif roll < error_rate * 0.5 and attempt:
+            attempt.insert(len(attempt) - 1, word)      # swapped with the previous word
+        elif roll < error_rate * 0.8 and len(word) > 2:
+            i = rng.randrange(len(word) - 1)            # typo: transposed letters
+            attempt.append(word[:i] + word[i + 1] + word[i] + word[i + 2:])
+        else:
+            attempt.append(word)
+            attempt.append(rng.choice(("and", "the", "unto", "of")))  # extra word
+    return " ".join(attempt)
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(p / 100 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class LoadTest:
+    def __init__(self, users, sessions, error_rate=0.15, seed=1, sheath_file=SHEATH_FILE):
+        self.users = users
+        self.sessions = sessions
+        self.error_rate = error_rate
+        self.seed = seed
+        self.sheath_file = sheath_file
+        self.timings = {op: [] for op in OPERATIONS}
+        self._lock = threading.Lock()
+        self.errors = 0
+
+    def _timed(self, samples, op, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        samples[op].append(time.perf_counter() - start)
+        return result
+
+    def virtual_user(self, n, workdir):
+        rng = random.Random(self.seed * 100003 + n)
+        filename = os.path.join(workdir, f"user{n}.csv")
+        shutil.copy(self.sheath_file, filename)
+        sheath = Sheath(filename)
+        samples = {op: [] for op in OPERATIONS}
+        errors = 0
+
+        for _ in range(self.sessions):
+            session_start = time.perf_counter()
+            try:
+                entries = self._timed(samples, "sheath read", sheath.getEntries)
+                ref, status, favorite = rng.choice(entries)
+                canonical = self._timed(samples, "passage text", get_canonical, ref)
+                attempt = make_attempt(canonical.text, rng, self.error_rate)
+                self._timed(samples, "grade", grade_recitation, canonical, attempt)
+                self._timed(samples, "annotate", annotation_segments, canonical, attempt)
+                write = sheath.unsetFavorites if favorite else sheath.setFavorites
+                self._timed(samples, "sheath write", write, [ref])
+            except Exception:
+                errors += 1
+                continue
+            samples["session"].append(time.perf_counter() - session_start)
+
+        with self._lock:
+            for op, values in samples.items():
+                self.timings[op].extend(values)
+            self.errors += errors
+
+    def run(self):
+        workdir = tempfile.mkdtemp(prefix="sword-load-")
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=self.users) as pool:
+                for future in [pool.submit(self.virtual_user, n, workdir) for n in range(self.users)]:
+                    future.result()
+            elapsed = time.perf_counter() - start
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        return self.report(elapsed)
+
+    def report(self, elapsed):
+        sessions = len(self.timings["session"])
+        result = {
+            "users": self.users,
+            "sessions": sessions,
+            "errors": self.errors,
+            "seconds": round(elapsed, 3),
+            "sessions_per_second": round(sessions / elapsed, 1) if elapsed else 0.0,
+            "peak_rss_mb": peak_rss_mb(),
+            "operations": {},
+        }
+        for op in OPERATIONS:
+            values = sorted(self.timings[op])
+            result["operations"][op] = {
+                "count": len(values),
+                "per_second": round(len(values) / elapsed, 1) if elapsed else 0.0,
+                "p50_ms": round(percentile(values, 50) * 1000, 3),
+                "p95_ms": round(percentile(values, 95) * 1000, 3),
+                "p99_ms": round(percentile(values, 99) * 1000, 3),
+            }
+        return result
+
+
+def format_report(result):
+    rss = result["peak_rss_mb"]
+    lines = [
+        f"{result['users']} users, {result['sessions']} sessions in {result['seconds']} s "
+        f"({result['sessions_per_second']} sessions/s), {result['errors']} errors, "
+        f"peak RSS {f'{rss:.1f} MB' if rss is not None else 'n/a'}",
+        f"{'operation':<14}{'count':>8}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}",
+    ]
+    for op, stats in result["operations"].items():
+        lines.append(f"{op:<14}{stats['count']:>8}{stats['per_second']:>10}"
+                     f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless load test of the quiz core")
+    parser.add_argument("--users", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--sessions", type=int, default=20, help="quiz sessions per user")
+    parser.add_argument("--error-rate", type=float, default=0.15, help="share of words typed wrong")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--sheath", default=SHEATH_FILE, help="sheath CSV each user starts from")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    test = LoadTest(args.users, args.sessions, args.error_rate, args.seed, args.sheath)
+    result = test.run()
+    print(json.dumps(result, indent=2) if args.json else format_report(result))
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
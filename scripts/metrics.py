@@ -0,0 +1,143 @@
+# scripts/metrics.py
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+# Histogram bucket upper bounds in seconds (Prometheus convention); +Inf is implied
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+PREFIX = "sword_"
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+class Histogram:
+    """Timing histogram with fixed buckets: observe() is a bisect and three adds."""
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)   # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        i = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += seconds
+            self.count += 1
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Metrics:
+    """
+    Named counters and timing histograms for the core paths, exported as
+    Prometheus text or a JSON snapshot (main.py --metrics FILE, or GET /metrics
+    on the API server). Metrics are created on first use.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, help_text=""):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, Counter(name, help_text))
+        return metric
+
+    def histogram(self, name, help_text="", buckets=DEFAULT_BUCKETS):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, Histogram(name, help_text, buckets))
+        return metric
+
+    def timed(self, name, help_text=""):
+        """Decorator recording each call's duration in histogram `name`."""
+        def decorate(fn):
+            histogram = self.histogram(name, help_text)
+
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    histogram.observe(time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    # ----------------- Export -----------------
+    def snapshot(self):
+        data = {"time": time.time(), "counters": {}, "histograms": {}}
+        for name, metric in sorted(self._metrics.items()):
+            if isinstance(metric, Counter):
+                data["counters"][name] = metric.value
+            else:
+                with metric._lock:
+                    data["histograms"][name] = {
+                        "count": metric.count,
+                        "sum": round(metric.sum, 6),
+                        "buckets": dict(zip([*map(str, metric.buckets), "+Inf"], metric.counts)),
+                    }
+        return data
+
+    def prometheus_text(self):
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            full = PREFIX + name
+            if metric.help:
+                lines.append(f"# HELP {full} {metric.help}")
+            if isinstance(metric, Counter):
+                lines.append(f"# TYPE {full} counter")
+                lines.append(f"{full} {metric.value}")
+                continue
+            lines.append(f"# TYPE {full} histogram")
+            with metric._lock:
+                counts, total, count = list(metric.counts), metric.sum, metric.count
+            cumulative = 0
+            for bound, n in zip([*map(repr, metric.buckets), "+Inf"], counts):
+                cumulative += n
+                lines.append(f'{full}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f"{full}_sum {total!r}")
+            lines.append(f"{full}_count {count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, filename):
+        """Write a JSON snapshot (*.json) or Prometheus text (anything else), atomically."""
+        if filename.endswith(".json"):
+            text = json.dumps(self.snapshot(), indent=1)
+        else:
+            text = self.prometheus_text()
+        tmp = filename + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, filename)
+
+
+metrics = Metrics()
@@ -0,0 +1,129 @@
+# scripts/passage_text.py
+import threading
+from collections import OrderedDict
+
+from pythonbible import InvalidVerseError, get_verse_id, get_verse_text
+
+from scripts.grading import CanonicalText
+from scripts.metrics import metrics
+from scripts.sheath import passage_key
+
+# Passages kept in memory; a sheath rarely has more than this many in rotation
+CACHE_SIZE = 256
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+# Grading-ready form of the cached passages (same keys; evicted with the text)
+_prepared = {}
+_hits = metrics.counter("passage_text_cache_hits_total", "Passage text served from the LRU cache")
+_misses = metrics.counter("passage_text_cache_misses_total", "Passage text read from pythonbible")
+_read_time = metrics.histogram("passage_text_read_seconds", "Time to read a passage's text from pythonbible")
+
+
+def _read_full_range(ref):
+    """
+    Return the concatenated verse text for the full range described by `ref`.
+    Handles single-verse, multi-verse, and multi-chapter ranges by advancing
+    chapter/verse until the end reference is reached or no further verses exist.
+    """
+    texts = []
+    book = ref.book
+    ch = int(ref.start_chapter)
+    v = int(ref.start_verse)
+    end_ch = int(getattr(ref, "end_chapter", ref.start_chapter))
+    end_v = int(getattr(ref, "end_verse", ref.start_verse))
+
+    # Defensive: ensure end is not before start; if it is, treat as single verse
+    try:
+        if (end_ch < ch) or (end_ch == ch and end_v < v):
+            end_ch, end_v = ch, v
+    except Exception:
+        end_ch, end_v = ch, v
+
+    # Iterate from start to end inclusive
+    while True:
+        try:
+            vid = get_verse_id(book, ch, v)
+            verse_text = get_verse_text(vid) or ""
+            texts.append(verse_text)
+        except InvalidVerseError:
+            # If verse number invalid in this chapter, try next chapter starting at verse 1
+            ch += 1
+            v = 1
+            # Check whether next chapter exists by attempting verse 1; if not, stop
+            try:
+                _ = get_verse_id(book, ch, 1)
+            except Exception:
+                break
+            # continue loop to attempt verse 1 of next chapter
+            continue
+        except Exception:
+            # Any other error: stop collecting further verses
+            break
+
+        # If we've reached the requested end verse, stop
+        if ch == end_ch and v == end_v:
+            break
+
+        # Advance to next verse
+        v += 1
+
+    # Join verses with a space so matching works across verse boundaries
+    return " ".join(t for t in texts if t)
+
+
+def get_passage_text(ref, cache=True):
+    """
+    Return the full text of a passage, from the in-memory LRU cache when possible.
+    With cache=False a miss is read without being stored (for bulk scans that
+    should not evict the passages in rotation).
+    """
+    if ref is None:
+        return ""
+    key = passage_key(ref)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            _hits.inc()
+            return _cache[key]
+
+    _misses.inc()
+    with _read_time.time():
+        text = _read_full_range(ref)
+    if not cache:
+        return text
+
+    with _cache_lock:
+        _cache[key] = text
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _prepared.pop(_cache.popitem(last=False)[0], None)
+    return text
+
+
+def get_canonical(ref):
+    """
+    Return the passage as a grading.CanonicalText (cleaned text, tokens and
+    word map), prepared once per cached passage so a submit only has to
+    process the attempt.
+    """
+    text = get_passage_text(ref)
+    key = passage_key(ref) if ref is not None else None
+    with _cache_lock:
+        canonical = _prepared.get(key)
+    if canonical is not None:
+        return canonical
+    canonical = CanonicalText(text)
+    with _cache_lock:
+        if key in _cache:
+            _prepared[key] = canonical
+    return canonical
+
+
+def warm(refs):
+    """Load passages into the cache ahead of time (call from a background thread)."""
+    for ref in refs:
+        try:
+            get_passage_text(ref)
+        except Exception:
+            pass
@@ -0,0 +1,64 @@
+# scripts/persisted_store.py
+import atexit
+import json
+import os
+import threading
+
+# Save after this many changes (and at exit)
+SAVE_EVERY = 8
+
+
+class PersistedStore:
+    """
+    Base for small in-memory stores kept in a JSON file: read once on creation,
+    written atomically (tmp + os.replace) after every SAVE_EVERY changes and
+    at exit. Subclasses convert with from_json/to_json and call _changed()
+    (holding self._lock) after each update.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            data = {}
+        self.from_json(data)
+
+    def from_json(self, data):
+        raise NotImplementedError
+
+    def to_json(self):
+        raise NotImplementedError
+
+    def _changed(self):
+        """Count one change; returns True when a save is due."""
+        self._unsaved += 1
+        return self._unsaved >= SAVE_EVERY
+
+    def save(self):
+        with self._lock:
+            if not self._unsaved:
+                return
+            data = self.to_json()
+            self._unsaved = 0
+        tmp = self.filename + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.filename)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def shared_store(cls):
+    """Return the process-wide instance of a PersistedStore subclass (saved automatically at exit)."""
+    with _stores_lock:
+        store = _stores.get(cls)
+        if store is None:
+            store = _stores[cls] = cls()
+            atexit.register(store.save)
+        return store
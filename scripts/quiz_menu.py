@@ -1,24 +1,30 @@
 # scripts/quiz_menu.py
-import random
-import re
 import threading
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
 
-import pythonbible as bible
-from pythonbible import InvalidVerseError, get_verse_id, get_verse_text
-
-from scripts.sheath import Sheath
+from scripts.review_scheduler import ReviewScheduler
+from scripts.session_sampler import SessionSampler, passage_weight
+from scripts.sheath import passage_key
+from scripts.sheath_model import get_sheath_model
+from scripts.hints import PrefixAligner
+from scripts.metrics import metrics
+from scripts.history import get_history
+from scripts.keystroke_timing import KeystrokeRecorder, get_hesitation_store, hesitations
+from scripts.passage_text import get_canonical, get_passage_text
+from scripts.settings import get_settings
 from scripts.ui_common import MinSizeMixin
-from difflib import SequenceMatcher
+from scripts.verse_index import grade_reference
+from scripts.word_errors import get_word_errors
+from scripts.grading import annotation_segments, clean_text, prepare_canonical, result_message, similarity
 
+_canonical_fetch = metrics.histogram("canonical_fetch_seconds", "Quiz start to passage text ready for grading")
+_grading_time = metrics.histogram("grading_seconds", "Time to score a recitation on submit")
 
-def _clean_text(s: str) -> str:
-    if s is None:
-        return ""
-    s = re.sub(r"[^\w\s]", "", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s.lower()
+# Quiz modes: recite the passage from its reference, or name the reference from its text
+RECITE_MODE = "recite"
+REFERENCE_MODE = "reference"
 
 
 class QuizMenu(ttk.Frame, MinSizeMixin):
@@ -26,7 +32,10 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
         super().__init__(parent)
 
         self.controller = controller
-        self.sheath = Sheath("resources/verses.csv")
+        self.model = get_sheath_model()
+        self.store = get_settings()
+        self.scheduler = ReviewScheduler("resources/schedule.json")
+        self._scheduler_version = -1  # model.version the scheduler was last synced at
 
         # Outer container fills the frame
         outer = ttk.Frame(self)
@@ -49,6 +58,15 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
         self.start_btn = ttk.Button(content, text="Start Quiz", command=self.start_quiz)
         self.start_btn.pack(pady=(0, 10))
 
+        # Quiz mode selector (hidden once a quiz starts)
+        self.mode_var = tk.StringVar(value=RECITE_MODE)
+        self.mode_frame = ttk.Frame(content)
+        ttk.Radiobutton(self.mode_frame, text="Recite the passage", variable=self.mode_var,
+                        value=RECITE_MODE).pack(side="left", padx=5)
+        ttk.Radiobutton(self.mode_frame, text="Name the reference", variable=self.mode_var,
+                        value=REFERENCE_MODE).pack(side="left", padx=5)
+        self.mode_frame.pack(pady=(0, 10))
+
         # Reference label
         self.ref_var = tk.StringVar(value="")
         self.ref_label = ttk.Label(content, textvariable=self.ref_var, font=("Arial", 12, "bold"))
@@ -64,6 +82,8 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
         self.answer_text.bind("<Control-a>", lambda e: self._select_all(e))
         self.answer_text.bind("<Control-A>", lambda e: self._select_all(e))
         self.answer_text.bind("<Control-c>", lambda e: "break")  # disable copy
+        self.answer_text.bind("<Control-h>", self._show_hint)
+        self.answer_text.bind("<Control-H>", self._show_hint)
 
         self._text_scroll = ttk.Scrollbar(text_frame, orient="vertical", command=self.answer_text.yview)
         self.answer_text.config(yscrollcommand=self._text_scroll.set)
@@ -97,14 +117,36 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
         # State
         self.current_ref = None
         self.current_canonical = ""
+        self.current_text = ""
+        self._canonical = prepare_canonical("")  # grading-ready passage (cleaned text, tokens, word map)
         self._max_text_height = 18
         self._canonical_ready = False
         self._canonical_lock = threading.Lock()
         self._canonical_job_id = 0
         self._max_canonical_chars = 8000
         self._last_score = 0
-
-        self.winfo_toplevel().bind("<Escape>", lambda e: self._return_to_main() if self._last_score >= 75 else None)
+        self.quiz_active = False  # True from start_quiz until the user returns to the main menu
+        self._reviewed = False  # only the first submit of each passage counts as a review
+        self._attempt_started = time.monotonic()
+        self.history = get_history()
+        # "Another Verse" draws without replacement for the rest of the quiz session
+        self._sampler = None
+        self._sampler_version = -1
+        self._sampler_keys = set()
+
+        # Hint state: aligner tracks the user's position in the passage as they type
+        self._aligner = None
+        self._hint_pos = -1
+        self._hint_count = 0
+        self._hints_used = 0
+
+        # Per-keystroke timing of the current attempt, folded into per-passage hesitation averages
+        self._keys = KeystrokeRecorder()
+        self.hesitation = get_hesitation_store()
+        # Per-word error counters behind the Verses menu heatmap
+        self.word_errors = get_word_errors()
+
+        self.winfo_toplevel().bind("<Escape>", lambda e: self._return_to_main() if self._last_score >= self.pass_score else None)
         self.enforce_minsize()
 
 
@@ -129,33 +171,45 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
             if self._text_scroll.winfo_ismapped():
                 self._text_scroll.pack_forget()
 
-    def _strip_punct(self, s: str) -> str:
-        """Return string with punctuation removed for comparison (keeps letters/numbers)."""
-        if s is None:
-            return ""
-        return re.sub(r"[^\w\s]", "", s).lower()
+        # Keep the hint aligner in step with the typed text (only the changed tail is re-aligned)
+        aligner = self._aligner
+        if aligner is not None:
+            pos = aligner.update(self.answer_text.get("1.0", "end-1c"))
+            if event is not None:
+                self._keys.record(event.time, pos)
+
+    def _show_hint(self, event=None):
+        """Reveal the next few words after the user's position; repeated presses reveal more."""
+        aligner = self._aligner
+        if aligner is None or self.mode_var.get() == REFERENCE_MODE:
+            return "break"
+        pos = aligner.update(self.answer_text.get("1.0", "end-1c"))
+        if pos == self._hint_pos:
+            self._hint_count += 3
+        else:
+            self._hint_pos = pos
+            self._hint_count = 3
+        self._hints_used += 1
 
-    def _tokenize_for_diff(self, text: str):
-        """
-        Tokenize text into words, punctuation, and whitespace tokens.
-        Use a raw regex string to avoid SyntaxWarning.
-        """
-        if text is None:
-            return []
-        # raw string to avoid invalid escape sequence warnings
-        tokens = re.findall(r'(\w+|[^\w\s]|\s+)', text)
-        return tokens
-    
-
-    def _annotate_in_text_widget(self, canonical: str, user_attempt: str):
+        words = aligner.next_words(self._hint_count)
+        if words:
+            self.result_var.set("Hint: " + " ".join(words) + " ...")
+        else:
+            self.result_var.set("You've reached the end of the passage.")
+        return "break"
+
+    def _reset_hints(self):
+        self._hint_pos = -1
+        self._hint_count = 0
+        self._hints_used = 0
+
+    @metrics.timed("annotation_seconds", "Time to diff and render the annotated attempt")
+    def _annotate_in_text_widget(self, canonical, user_attempt: str):
         """
-        Robust, defensive annotation:
-        - punctuation/case-only differences -> 'cap' (yellow)
-        - character-level differences -> 'wrong' (red overstrike) + 'added' (red)
-        - omitted canonical tokens -> 'added'
-        - extra user tokens -> 'wrong'
-        This version carefully bounds all index accesses and always advances
-        canon_pos/user_pos so it cannot loop forever.
+        Show the attempt annotated against the passage (see grading.annotation_segments):
+        'cap' for punctuation/case-only differences, 'wrong' for the user's
+        incorrect or extra text, 'added' for passage text that was missed.
+        Returns the indices of the passage words that were missed or typed wrong.
         """
         # Make editable and clear
         try:
@@ -170,164 +224,14 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
         self.answer_text.tag_configure("cap", background="yellow")
         self.answer_text.tag_configure("normal", foreground="black")
 
-        # Tokenize
-        canon_tokens = self._tokenize_for_diff(canonical)
-        user_tokens = self._tokenize_for_diff(user_attempt)
-
-        # Build word lists (skip punctuation-only tokens for matching)
-        def build_word_list(tokens):
-            words = []
-            idx_map = []
-            for i, t in enumerate(tokens):
-                if t.isspace():
-                    continue
-                if re.fullmatch(r'[^\w\s]', t):
-                    continue
-                words.append(t)
-                idx_map.append(i)
-            return words, idx_map
-
-        canon_words, canon_map = build_word_list(canon_tokens)
-        user_words, user_map = build_word_list(user_tokens)
-
-        sm = SequenceMatcher(None, canon_words, user_words)
-
-        canon_pos = 0   # index into canon_tokens
-        user_pos = 0    # index into user_tokens
-
-        def insert_token(tok, tag=None):
-            if not tok:
-                return
-            start = self.answer_text.index("end-1c")
-            self.answer_text.insert("end", tok)
-            end = self.answer_text.index("end-1c")
-            if tag:
-                try:
-                    self.answer_text.tag_add(tag, start, end)
-                except Exception:
-                    pass
-
-        def insert_intervening(from_idx, to_idx, tokens):
-            # Insert tokens[from_idx:to_idx] safely
-            if from_idx < 0:
-                from_idx = 0
-            if to_idx > len(tokens):
-                to_idx = len(tokens)
-            for i in range(from_idx, to_idx):
-                insert_token(tokens[i])
-            return to_idx
-
-        # Character-level annotate helper
-        def annotate_token_chars(canon_tok, user_tok):
-            if user_tok is None:
-                insert_token(canon_tok, "added")
-                return
-
-            # punctuation/case-only difference -> cap
-            if self._strip_punct(user_tok) == self._strip_punct(canon_tok) and user_tok != canon_tok:
-                insert_token(canon_tok, "cap")
-                return
-
-            # char-level diff
-            char_sm = SequenceMatcher(None, user_tok, canon_tok)
-            for op, a0, a1, b0, b1 in char_sm.get_opcodes():
-                if op == "equal":
-                    insert_token(canon_tok[b0:b1], "normal")
-                elif op == "replace":
-                    # user chars crossed out, canonical chars added
-                    if a0 < a1:
-                        insert_token(user_tok[a0:a1], "wrong")
-                    if b0 < b1:
-                        insert_token(canon_tok[b0:b1], "added")
-                elif op == "delete":
-                    # user had extra chars
-                    insert_token(user_tok[a0:a1], "wrong")
-                elif op == "insert":
-                    # canonical has extra chars
-                    insert_token(canon_tok[b0:b1], "added")
-
-        # Walk opcodes safely
-        try:
-            for opcode, a0, a1, b0, b1 in sm.get_opcodes():
-                if opcode == "equal":
-                    for wi in range(a0, a1):
-                        if wi >= len(canon_map):
-                            break
-                        tok_index = canon_map[wi]
-                        canon_pos = insert_intervening(canon_pos, tok_index, canon_tokens)
-                        # find corresponding user token index safely
-                        user_index_in_map = b0 + (wi - a0)
-                        user_tok = ""
-                        if 0 <= user_index_in_map < len(user_map):
-                            user_tok_index = user_map[user_index_in_map]
-                            user_tok = user_tokens[user_tok_index] if 0 <= user_tok_index < len(user_tokens) else ""
-                        canon_tok = canon_tokens[canon_pos] if canon_pos < len(canon_tokens) else ""
-                        if self._strip_punct(user_tok) == self._strip_punct(canon_tok) and user_tok != canon_tok:
-                            insert_token(canon_tok, "cap")
-                        else:
-                            insert_token(canon_tok, "normal")
-                        canon_pos += 1
-                        # advance user_pos to at least after the user token we consumed
-                        if 0 <= user_index_in_map < len(user_map):
-                            user_pos = max(user_pos, user_map[user_index_in_map] + 1)
-                elif opcode == "replace":
-                    # pair up tokens as much as possible, but bound indices
-                    pair_count = max(a1 - a0, b1 - b0)
-                    for i in range(pair_count):
-                        # canonical token (if exists)
-                        canon_tok = None
-                        if a0 + i < a1 and (a0 + i) < len(canon_map):
-                            canon_tok_index = canon_map[a0 + i]
-                            canon_pos = insert_intervening(canon_pos, canon_tok_index, canon_tokens)
-                            if canon_pos < len(canon_tokens):
-                                canon_tok = canon_tokens[canon_pos]
-                        # user token (if exists)
-                        user_tok = None
-                        if b0 + i < b1 and (b0 + i) < len(user_map):
-                            user_tok_index = user_map[b0 + i]
-                            if 0 <= user_tok_index < len(user_tokens):
-                                user_tok = user_tokens[user_tok_index]
-                        # annotate
-                        if canon_tok is not None and user_tok is not None:
-                            annotate_token_chars(canon_tok, user_tok)
-                            canon_pos += 1
-                            user_pos = max(user_pos, (user_tok_index or 0) + 1)
-                        elif canon_tok is not None and user_tok is None:
-                            insert_token(canon_tok, "added")
-                            canon_pos += 1
-                        elif canon_tok is None and user_tok is not None:
-                            insert_token(user_tok, "wrong")
-                            user_pos = max(user_pos, (user_tok_index or 0) + 1)
-                    # any extra user tokens in this replace block -> crossed out
-                    for uj in range(b0 + pair_count, b1):
-                        if uj < len(user_map):
-                            uidx = user_map[uj]
-                            if 0 <= uidx < len(user_tokens):
-                                insert_token(user_tokens[uidx], "wrong")
-                                user_pos = max(user_pos, uidx + 1)
-                elif opcode == "delete":
-                    for wi in range(a0, a1):
-                        if wi >= len(canon_map):
-                            break
-                        canon_tok_index = canon_map[wi]
-                        canon_pos = insert_intervening(canon_pos, canon_tok_index, canon_tokens)
-                        if canon_pos < len(canon_tokens):
-                            insert_token(canon_tokens[canon_pos], "added")
-                            canon_pos += 1
-                elif opcode == "insert":
-                    for uj in range(b0, b1):
-                        if uj >= len(user_map):
-                            break
-                        uidx = user_map[uj]
-                        if 0 <= uidx < len(user_tokens):
-                            insert_token(user_tokens[uidx], "wrong")
-                            user_pos = max(user_pos, uidx + 1)
-        except Exception:
-            # If anything unexpected happens, fall back to inserting canonical text plainly
-            insert_token(canonical, "added")
-
-        # Insert any remaining canonical tokens
-        canon_pos = insert_intervening(canon_pos, len(canon_tokens), canon_tokens)
+        # One insert call for all segments (text, tags, text, tags, ...)
+        args = []
+        errors = []
+        for text, tag in annotation_segments(canonical, user_attempt, errors):
+            args.append(text)
+            args.append(tag or ())
+        if args:
+            self.answer_text.insert("end", *args)
 
         # Leave widget editable and place cursor at end
         try:
@@ -336,19 +240,37 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
             self.answer_text.see("insert")
         except Exception:
             pass
+        return errors
+
+    @property
+    def pass_score(self):
+        """Percent needed to pass, from the settings store."""
+        return self.store.settings.pass_score
 
     # ----------------- Quiz flow -----------------
     def start_quiz(self):
+        if not self.model.loaded:
+            # the sheath is still being read in the background
+            self.model.when_loaded(self.start_quiz,
+                                   lambda error: self.result_var.set(f"Could not load verses: {error}"))
+            return
         try:
-            passages = self.sheath.getPassages()
+            passages = self.model.passages()
             if not passages:
                 messagebox.showwarning("No verses", "No verses found in the verses file.")
                 return
-            self.current_ref = random.choice(passages)
+            self.current_ref = self._pick_passage(passages)
+            self._sampler = None
         except Exception as e:
             messagebox.showerror("Error", f"Could not load verses: {e}")
             return
 
+        # A new quiz must be passed before Escape lets the user out again
+        self.quiz_active = True
+        self._last_score = 0
+        self.try_again_btn.pack_forget()
+        self.return_btn.pack_forget()
+
         # Prepare UI for a fresh attempt
         self._show_quiz_controls(show_submit_only=True)
         # Clear previous canonical and start background fetch
@@ -356,8 +278,9 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
             self.current_canonical = ""
             self._canonical_ready = False
         self._load_canonical_async()
-        # Hide start button (no restart)
+        # Hide start button and mode selector (no restart)
         self.start_btn.pack_forget()
+        self.mode_frame.pack_forget()
 
         root = self.winfo_toplevel()
         root.attributes("-fullscreen", True)
@@ -373,7 +296,13 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
         except Exception:
             pass
 
-        self.ref_var.set(self._format_ref_label(self.current_ref))
+        if self.mode_var.get() == REFERENCE_MODE:
+            # the passage text replaces the reference once it has loaded
+            self.ref_var.set("Loading passage...")
+            self.ref_label.config(wraplength=700)
+        else:
+            self.ref_var.set(self._format_ref_label(self.current_ref))
+            self.ref_label.config(wraplength=0)
         self.ref_label.pack()
         self.answer_text.pack(side="left", fill="x", expand=True)
         # Clear any previous content and reset height
@@ -393,6 +322,10 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
             self.another_btn.pack()
 
         self.result_var.set("")
+        self._reset_hints()
+        self._reviewed = False
+        self._attempt_started = time.monotonic()
+        self._keys.reset()
         self._update_fav_button_label()
 
 
@@ -410,72 +343,25 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
 
     def _get_full_range_text(self, ref):
         """
-        Return the concatenated verse text for the full range described by `ref`.
-        Handles single-verse, multi-verse, and multi-chapter ranges by advancing
-        chapter/verse until the end reference is reached or no further verses exist.
+        Return the concatenated verse text for the full range described by `ref`
+        (served from the shared passage cache).
         """
-        if ref is None:
-            return ""
+        return get_passage_text(ref)
 
-        texts = []
-        book = ref.book
-        ch = int(ref.start_chapter)
-        v = int(ref.start_verse)
-        end_ch = int(getattr(ref, "end_chapter", ref.start_chapter))
-        end_v = int(getattr(ref, "end_verse", ref.start_verse))
-
-        # Defensive: ensure end is not before start; if it is, treat as single verse
-        try:
-            if (end_ch < ch) or (end_ch == ch and end_v < v):
-                end_ch, end_v = ch, v
-        except Exception:
-            end_ch, end_v = ch, v
-
-        # Iterate from start to end inclusive
-        while True:
-            try:
-                vid = get_verse_id(book, ch, v)
-                verse_text = get_verse_text(vid) or ""
-                texts.append(verse_text)
-            except InvalidVerseError:
-                # If verse number invalid in this chapter, try next chapter starting at verse 1
-                ch += 1
-                v = 1
-                # Check whether next chapter exists by attempting verse 1; if not, stop
-                try:
-                    _ = get_verse_id(book, ch, 1)
-                except Exception:
-                    break
-                # continue loop to attempt verse 1 of next chapter
-                continue
-            except Exception:
-                # Any other error: stop collecting further verses
-                break
-
-            # If we've reached the requested end verse, stop
-            if ch == end_ch and v == end_v:
-                break
-
-            # Advance to next verse
-            v += 1
-            # If next verse doesn't exist in this chapter, the next loop iteration will
-            # catch InvalidVerseError and advance chapter/verse accordingly.
-
-        # Join verses with a space so matching works across verse boundaries
-        return " ".join(t for t in texts if t)
-
-    def _fetch_canonical_text(self):
+    def _fetch_canonical_text(self, ref):
         """
-        Fetch and store the cleaned canonical text for the current reference.
-        Uses the full range if start != end.
+        Return the prepared canonical text for `ref` (cleaned, tokenized and
+        word-mapped once per passage by the passage cache).
+        Large passages are truncated to a safe size to avoid huge diffs.
         """
         try:
-            full_text = self._get_full_range_text(self.current_ref)
+            canonical = get_canonical(ref)
         except Exception:
-            full_text = ""
+            canonical = prepare_canonical("")
 
-        # Clean and store for comparison
-        self.current_canonical = _clean_text(full_text)
+        if len(canonical.text) > self._max_canonical_chars:
+            canonical = prepare_canonical(canonical.text[: self._max_canonical_chars] + " ...")
+        return canonical
 
     def _on_submit(self):
         if not self.current_ref:
@@ -492,67 +378,54 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
 
         # Get user input and cleaned form
         user_text = self.answer_text.get("1.0", "end-1c")
-        cleaned = _clean_text(user_text)
+        cleaned = clean_text(user_text)
         if not cleaned:
             self.result_var.set("Please enter your attempt before submitting.")
             return
 
-        # Compute similarity
-        ratio = SequenceMatcher(None, self.current_canonical, cleaned).ratio()
-        percent = int(ratio * 100)
+        if self.mode_var.get() == REFERENCE_MODE:
+            self._on_submit_reference(user_text)
+            return
 
-        if percent >= 95:
-            msg = f"Excellent! Similarity: {percent}%."
-        elif percent >= 75:
-            msg = f"Good! Similarity: {percent}%."
-        else:
-            msg = f"Keep practicing to get above a 75%. Similarity: {percent}%."
+        # Compute similarity
+        with _grading_time.time():
+            percent = similarity(self.current_canonical, cleaned)
+        msg = result_message(percent, self.pass_score)
+        if self._hints_used:
+            msg += f" ({self._hints_used} hint(s) used)"
+        msg += self._record_hesitation()
 
         self._last_score = percent
-
-        # Hide Submit until user presses Try Again
-        self.submit_btn.pack_forget()
-        self.try_again_btn.pack()
-
-        if percent >= 75:
-            root = self.winfo_toplevel()
-            root.attributes("-fullscreen", False)
-            root.protocol("WM_DELETE_WINDOW", root.destroy)
-            self.fav_btn.pack()
-            self.another_btn.pack()
-            self.return_btn.pack()
-        else:
-            self.fav_btn.pack_forget()
-            self.another_btn.pack_forget()
-            self.return_btn.pack_forget()
-
-
+        msg += self._record_result(percent)
+        self._show_result_controls(percent)
 
         # ----------------- Defensive annotator call (step 5) -----------------
-        # Build full canonical (non-cleaned) for annotation and display, but truncate to safe size
-        try:
-            full_text = self._get_full_range_text(self.current_ref) or "(no text available)"
-        except Exception:
-            full_text = "(no text available)"
-
-        # Truncate to avoid extremely long diffs that can freeze the UI
-        if len(full_text) > self._max_canonical_chars:
-            truncated = full_text[: self._max_canonical_chars] + " ..."
-        else:
-            truncated = full_text
+        # The passage was prepared (and truncated to a safe size) when it loaded;
+        # only the attempt is tokenized here
+        canonical = self._canonical
+        if not canonical.text:
+            canonical = prepare_canonical("(no text available)")
 
         # Try to annotate; if annotation fails, fall back to showing canonical in the result label
         try:
-            self._annotate_in_text_widget(truncated, user_text)
+            errors = self._annotate_in_text_widget(canonical, user_text)
         except Exception as e:
             # Fallback: show canonical text in the result area and keep UI responsive
-            self.result_var.set(msg + f"\n\nCanonical: {full_text}")
+            self.result_var.set(msg + f"\n\nCanonical: {canonical.text}")
             # Reveal favorite and another buttons anyway
             self.fav_btn.pack()
             self.another_btn.pack()
             self._update_fav_button_label()
             return
 
+        # Fold the wrong words into the passage's counters (the Verses menu heatmap);
+        # an attempt graded against the placeholder says nothing about the passage
+        if self._canonical.text:
+            try:
+                self.word_errors.record(passage_key(self.current_ref), errors)
+            except Exception:
+                pass
+
         # If annotation succeeded, show the short feedback message and reveal post-submit controls
         self.result_var.set(msg)
         
@@ -560,6 +433,120 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
 
         self.enforce_minsize()
 
+    def _on_submit_reference(self, user_text):
+        """Grade a typed reference (reference-recall mode) with partial credit for near misses."""
+        percent, verdict = grade_reference(user_text, self.current_ref)
+        self._last_score = percent
+        note = self._record_result(percent)
+        self._show_result_controls(percent)
+
+        answer = self._format_ref_label(self.current_ref)
+        self.result_var.set(f"{verdict} Score: {percent}%.{note}\nAnswer: {answer}")
+        self._update_fav_button_label()
+        self.enforce_minsize()
+
+    def _pick_passage(self, passages, exclude=None):
+        """Return the passage the review scheduler says is most overdue."""
+        if self.model.version != self._scheduler_version:
+            # only re-match the scheduler to the sheath when the sheath changed
+            self.scheduler.sync(passages)
+            self._scheduler_version = self.model.version
+        key = self.scheduler.next_due(exclude=passage_key(exclude) if exclude else None)
+        entry = self.model.entries.get(key)
+        return entry.ref if entry is not None else passages[0]
+
+    def _build_sampler(self, entries):
+        """Session sampler over the sheath, weighted by staleness, last score and favorite flag."""
+        passages = [entry.ref for entry in entries]
+        weights = [self._passage_weight(entry.ref, entry.favorite) for entry in entries]
+        sampler = SessionSampler(passages, weights)
+        self._sampler_version = self.model.version
+        self._sampler_keys = {entry.key for entry in entries}
+        if self.current_ref is not None:
+            sampler.mark_drawn(self.current_ref)
+        return sampler
+
+    def _passage_weight(self, ref, favorite):
+        """Sampling weight from the attempt history, boosted for passages the user hesitates in."""
+        stats = self.history.get_stats(ref)
+        return passage_weight(stats, favorite) * self.hesitation.weight_factor(passage_key(ref))
+
+    def _record_hesitation(self):
+        """
+        Map this attempt's keystroke timings onto the passage words, fold them into
+        the passage's hesitation averages and return a note naming the slowest words.
+        """
+        aligner = self._aligner
+        if aligner is None or not self._keys.count or not self.current_ref:
+            return ""
+        if not self._canonical.text:
+            # no passage text was loaded; an empty mapping would wipe the passage's averages
+            return ""
+        pauses = self._keys.word_pauses(len(aligner.words))
+        try:
+            self.hesitation.record(passage_key(self.current_ref), pauses)
+        except Exception:
+            pass
+        slow = hesitations(pauses, aligner.display_words)
+        if not slow:
+            return ""
+        return "\nLongest pauses before: " + ", ".join(f"\"{word}\" ({seconds:.1f} s)" for word, seconds in slow)
+
+    def _sheath_changed(self, entries):
+        """True if the sheath's passages differ from the ones the sampler was built over."""
+        if self.model.version == self._sampler_version:
+            return False
+        # favorite/status edits also bump the version; only a different passage set matters
+        self._sampler_version = self.model.version
+        return {entry.key for entry in entries} != self._sampler_keys
+
+    def _record_result(self, percent):
+        """
+        Log the attempt to the history, feed the first graded recitation of this passage
+        to the scheduler and promote it to Memorized once its interval is long enough.
+        Reference-recall attempts are only logged. Returns a note for the result message.
+        """
+        if not self.current_ref:
+            return ""
+        try:
+            self.history.record(self.current_ref, percent, time.monotonic() - self._attempt_started,
+                                self.mode_var.get(), self.pass_score, hints=self._hints_used)
+        except Exception:
+            pass
+        if self._sampler is not None:
+            entry = self.model.get(self.current_ref)
+            favorite = entry.favorite if entry is not None else False
+            self._sampler.update(self.current_ref, self._passage_weight(self.current_ref, favorite))
+
+        if self._reviewed or self.mode_var.get() == REFERENCE_MODE:
+            return ""
+        self._reviewed = True
+        try:
+            if self.scheduler.review(self.current_ref, percent, pass_score=self.pass_score):
+                self.model.set_status(self.current_ref, 1)
+                return " Moved to Memorized!"
+        except Exception:
+            pass
+        return ""
+
+    def _show_result_controls(self, percent):
+        """Swap Submit for the post-submit buttons; a passing score releases fullscreen."""
+        # Hide Submit until user presses Try Again
+        self.submit_btn.pack_forget()
+        self.try_again_btn.pack()
+
+        if percent >= self.pass_score:
+            root = self.winfo_toplevel()
+            root.attributes("-fullscreen", False)
+            root.protocol("WM_DELETE_WINDOW", root.destroy)
+            self.fav_btn.pack()
+            self.another_btn.pack()
+            self.return_btn.pack()
+        else:
+            self.fav_btn.pack_forget()
+            self.another_btn.pack_forget()
+            self.return_btn.pack_forget()
+
     def _try_again(self):
         # Clear the text field
         try:
@@ -588,6 +575,7 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
             self._canonical_job_id += 1
             job_id = self._canonical_job_id
             self._canonical_ready = False
+            self._aligner = None
 
         # disable submit while loading and show loading message
         try:
@@ -596,28 +584,38 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
             pass
         self.result_var.set("Loading verse text...")
 
-        def worker(ref, jid):
-            try:
-                full_text = self._get_full_range_text(ref) or ""
-            except Exception:
-                full_text = ""
+        requested = time.perf_counter()
 
-            # Truncate to safe size to avoid huge diffs
-            if len(full_text) > self._max_canonical_chars:
-                full_text = full_text[: self._max_canonical_chars] + " ..."
+        def worker(ref, jid):
+            canonical = self._fetch_canonical_text(ref)
+            full_text = canonical.text
 
             # Only accept result if job id still current
             with self._canonical_lock:
                 if jid != self._canonical_job_id:
                     return
-                self.current_canonical = _clean_text(full_text)
+                self.current_text = full_text
+                self.current_canonical = canonical.cleaned
+                self._canonical = canonical
+                self._aligner = PrefixAligner(full_text)
                 self._canonical_ready = True
+            _canonical_fetch.observe(time.perf_counter() - requested)
+
+            # In reference mode the passage text is the prompt
+            if self.mode_var.get() == REFERENCE_MODE:
+                try:
+                    self.submit_btn.after(0, lambda: self.ref_var.set(full_text or "(no text available)"))
+                except Exception:
+                    pass
 
             # Re-enable submit on the main thread
             try:
                 self.submit_btn.after(0, lambda: self.submit_btn.config(state="normal"))
-                # Clear any loading message
-                self.submit_btn.after(0, lambda: self.result_var.set(""))
+                # Replace the loading message
+                if self.mode_var.get() == REFERENCE_MODE:
+                    self.submit_btn.after(0, lambda: self.result_var.set(""))
+                else:
+                    self.submit_btn.after(0, lambda: self.result_var.set("Stuck? Press Ctrl+H for a hint."))
             except Exception:
                 pass
 
@@ -625,19 +623,14 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
 
     def _another_verse(self):
         try:
-            passages = self.sheath.getPassages()
-            if not passages:
+            entries = list(self.model.entries.values())
+            if not entries:
                 messagebox.showwarning("No verses", "No verses found.")
                 return
-            if len(passages) == 1:
-                self.current_ref = passages[0]
-            else:
-                new_ref = self.current_ref
-                attempts = 0
-                while new_ref == self.current_ref and attempts < 10:
-                    new_ref = random.choice(passages)
-                    attempts += 1
-                self.current_ref = new_ref
+            if self._sampler is None or self._sheath_changed(entries):
+                # first draw of the session, or passages were added/removed underneath us
+                self._sampler = self._build_sampler(entries)
+            self.current_ref = self._sampler.draw(exclude=self.current_ref) or entries[0].ref
         except Exception as e:
             messagebox.showerror("Error", f"Could not load verses: {e}")
             return
@@ -662,45 +655,22 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
 
     # ----------------- Favorite handling -----------------
     def _update_fav_button_label(self):
-        if not self.current_ref:
+        entry = self.model.get(self.current_ref) if self.current_ref else None
+        if entry is not None and entry.favorite:
+            self.fav_btn.config(text="Unmark Favorite")
+        else:
             self.fav_btn.config(text="Mark Favorite")
-            return
-        try:
-            rows = self.sheath.findPassages([self.current_ref])
-            if rows:
-                with open(self.sheath.filename, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-                line_idx = rows[0] + 1
-                if 0 <= line_idx < len(lines):
-                    parts = lines[line_idx].rstrip("\n").split(",")
-                    current_status = parts[7].strip() if len(parts) > 7 else "False"
-                    if current_status == "True":
-                        self.fav_btn.config(text="Unmark Favorite")
-                        return
-        except Exception:
-            pass
-        self.fav_btn.config(text="Mark Favorite")
 
     def _toggle_favorite(self):
         if not self.current_ref:
             messagebox.showwarning("No reference", "Start a quiz first.")
             return
         try:
-            rows = self.sheath.findPassages([self.current_ref])
-            if not rows:
-                messagebox.showerror("Error", "Could not locate the verse in the CSV.")
+            entry = self.model.get(self.current_ref)
+            if entry is None:
+                messagebox.showerror("Error", "Could not locate the verse in the sheath.")
                 return
-            with open(self.sheath.filename, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-            line_idx = rows[0] + 1
-            parts = lines[line_idx].rstrip("\n").split(",")
-            current_status = parts[7].strip() if len(parts) > 7 else "False"
-
-            if current_status == "True":
-                self.sheath.unsetFavorites([self.current_ref])
-            else:
-                self.sheath.setFavorites([self.current_ref])
-
+            self.model.set_favorite(self.current_ref, not entry.favorite)
             self._update_fav_button_label()
         except Exception as e:
             messagebox.showerror("Error", f"Could not toggle favorite: {e}")
@@ -714,10 +684,15 @@ class QuizMenu(ttk.Frame, MinSizeMixin):
         self._on_text_change()
         self.answer_text.focus_set()
         self.result_var.set("")
+        self._reset_hints()
+        self._attempt_started = time.monotonic()
+        self._keys.reset()
         self.submit_btn.pack()
         self.try_again_btn.pack_forget()
 
     def _return_to_main(self):
+        self._sampler = None  # the quiz session is over
+        self.quiz_active = False
         root = self.winfo_toplevel()
         root.attributes("-fullscreen", False)
         self.controller.show_frame("MainMenu")
\ No newline at end of file
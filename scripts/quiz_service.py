@@ -0,0 +1,327 @@
+# scripts/quiz_service.py
+"""
+Multi-user quiz service:  python -m scripts.quiz_service [--port 5050] [--shards 8]
+
+Clients send one JSON object per line over TCP and get one JSON reply per line:
+
+    {"user": "ann", "op": "add", "reference": "John 3:16"}
+    {"user": "ann", "op": "list"}
+    {"user": "ann", "op": "remove", "key": "43:3:16-3:16:"}
+    {"user": "ann", "op": "start"}                    -> passage to recite
+    {"user": "ann", "op": "submit", "attempt": "..."} -> score, message
+    {"user": "ann", "op": "stats"}
+
+Each user's sheath and attempts live in one of a fixed pool of SQLite shard
+files (chosen by a stable hash of the user name). Every shard has its own
+single writer thread, so users on different shards never wait on each other
+and there is no global lock. Passage text comes from the shared, read-only
+VerseIndex, so users don't get their own copies of the Bible.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pythonbible as bible
+
+from scripts.grading import DEFAULT_PASS_SCORE, grade_recitation
+from scripts.session_sampler import passage_weight
+from scripts.sheath import passage_key
+from scripts.verse_index import get_index
+
+log = logging.getLogger(__name__)
+
+SHARD_DIR = "resources/users"
+SHARD_COUNT = 8
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS passages (
+    user TEXT NOT NULL, key TEXT NOT NULL,
+    book INTEGER, start_chapter INTEGER, start_verse INTEGER,
+    end_chapter INTEGER, end_verse INTEGER, end_book INTEGER,
+    status INTEGER NOT NULL DEFAULT 0, favorite INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user, key)
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    user TEXT NOT NULL, key TEXT NOT NULL, t REAL NOT NULL,
+    score INTEGER NOT NULL, duration REAL, mode TEXT
+);
+CREATE INDEX IF NOT EXISTS attempts_by_passage ON attempts (user, key, t);
+"""
+
+
+def shard_for(user, shard_count=SHARD_COUNT):
+    """Stable shard number for a user (the same across runs, unlike hash())."""
+    return zlib.crc32(user.encode("utf-8")) % shard_count
+
+
+def _ref_from_row(row):
+    book, sc, sv, ec, ev, end_book = row
+    return bible.NormalizedReference(bible.Book(book), sc, sv, ec, ev,
+                                     bible.Book(end_book) if end_book else None)
+
+
+class Shard:
+    """
+    One SQLite file holding many users. All access goes through a
+    single-thread executor, which owns the connection and orders the writes.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shard")
+        self._db = None
+
+    async def run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def _conn(self):
+        if self._db is None:
+            self._db = sqlite3.connect(self.filename)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(SCHEMA)
+        return self._db
+
+    # ----------------- Executor-side calls -----------------
+    def load_user(self, user):
+        """Return ({key: [ref, status, favorite]}, {key: stats}) for a user."""
+        db = self._conn()
+        passages = {}
+        for row in db.execute(
+                "SELECT key, book, start_chapter, start_verse, end_chapter, end_verse, end_book,"
+                " status, favorite FROM passages WHERE user = ? ORDER BY rowid", (user,)):
+            passages[row[0]] = [_ref_from_row(row[1:7]), row[7], bool(row[8])]
+        stats = {}
+        for key, score, t in db.execute(
+                "SELECT key, score, t FROM attempts WHERE user = ? ORDER BY t", (user,)):
+            _apply_attempt(stats.setdefault(key, _empty_stats()), score, t)
+        return passages, stats
+
+    def add(self, user, key, ref):
+        db = self._conn()
+        db.execute(
+            "INSERT OR IGNORE INTO passages (user, key, book, start_chapter, start_verse,"
+            " end_chapter, end_verse, end_book) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (user, key, ref.book.value, ref.start_chapter, ref.start_verse,
+             ref.end_chapter, ref.end_verse, ref.end_book.value if ref.end_book else None))
+        db.commit()
+
+    def remove(self, user, key):
+        db = self._conn()
+        db.execute("DELETE FROM passages WHERE user = ? AND key = ?", (user, key))
+        db.commit()
+
+    def record(self, user, key, t, score, duration, mode):
+        db = self._conn()
+        db.execute("INSERT INTO attempts VALUES (?, ?, ?, ?, ?, ?)",
+                   (user, key, t, score, duration, mode))
+        db.commit()
+
+    def close(self):
+        def close_db():
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+        self.executor.submit(close_db).result()
+        self.executor.shutdown()
+
+
+def _empty_stats():
+    return {"count": 0, "mean": 0.0, "last": None, "best": 0, "last_time": None}
+
+
+def _apply_attempt(stats, score, t):
+    stats["mean"] = round((stats["mean"] * stats["count"] + score) / (stats["count"] + 1), 2)
+    stats["count"] += 1
+    stats["last"] = score
+    stats["best"] = max(stats["best"], score)
+    stats["last_time"] = t
+
+
+class UserState:
+    """A user's sheath, attempt aggregates and current quiz, cached in memory."""
+
+    __slots__ = ("passages", "stats", "current", "started", "lock")
+
+    def __init__(self, passages, stats):
+        self.passages = passages    # key -> [ref, status, favorite]
+        self.stats = stats          # key -> aggregates
+        self.current = None         # key of the passage being quizzed
+        self.started = 0.0
+        self.lock = asyncio.Lock()  # orders one user's own requests
+
+
+class QuizService:
+    def __init__(self, shard_dir=SHARD_DIR, shard_count=SHARD_COUNT, pass_score=DEFAULT_PASS_SCORE):
+        os.makedirs(shard_dir, exist_ok=True)
+        self.shards = [Shard(os.path.join(shard_dir, f"shard-{i:02d}.sqlite3"))
+                       for i in range(shard_count)]
+        self.pass_score = pass_score
+        self.corpus = None          # shared VerseIndex, loaded by start()
+        self.users = {}
+
+    async def start(self):
+        # loading the index unpickles the whole translation; keep it off the event loop
+        self.corpus = await asyncio.get_running_loop().run_in_executor(None, get_index)
+
+    def close(self):
+        for shard in self.shards:
+            shard.close()
+
+    def shard(self, user):
+        return self.shards[shard_for(user, len(self.shards))]
+
+    async def user(self, user):
+        state = self.users.get(user)
+        if state is None:
+            passages, stats = await self.shard(user).run(self.shard(user).load_user, user)
+            # another request may have loaded it while we waited
+            state = self.users.setdefault(user, UserState(passages, stats))
+        return state
+
+    # ----------------- Operations -----------------
+    async def add(self, user, reference):
+        refs = bible.get_references(reference or "")
+        if not refs:
+            raise ValueError("reference not recognised")
+        ref = refs[0]
+        key = passage_key(ref)
+        state = await self.user(user)
+        async with state.lock:
+            if key not in state.passages:
+                await self.shard(user).run(self.shard(user).add, user, key, ref)
+                state.passages[key] = [ref, 0, False]
+        return {"key": key, "reference": bible.format_scripture_references([ref])}
+
+    async def remove(self, user, key):
+        state = await self.user(user)
+        async with state.lock:
+            if state.passages.pop(key, None) is None:
+                raise KeyError(key)
+            await self.shard(user).run(self.shard(user).remove, user, key)
+        return {"removed": key}
+
+    async def list_passages(self, user):
+        state = await self.user(user)
+        return {"passages": [
+            {"key": key, "reference": bible.format_scripture_references([ref]),
+             "memorized": bool(status), "favorite": favorite}
+            for key, (ref, status, favorite) in state.passages.items()
+        ]}
+
+    async def start_quiz(self, user):
+        """Pick a passage (weighted towards stale and weak ones) and start timing."""
+        state = await self.user(user)
+        async with state.lock:
+            if not state.passages:
+                raise ValueError("no passages in this user's sheath")
+            now = time.time()
+            keys = list(state.passages)
+            weights = [passage_weight(state.stats.get(key, {}), state.passages[key][2], now) for key in keys]
+            state.current = random.choices(keys, weights)[0]
+            state.started = time.monotonic()
+            ref = state.passages[state.current][0]
+        return {"key": state.current, "reference": bible.format_scripture_references([ref])}
+
+    async def submit(self, user, attempt, mode="recite"):
+        state = await self.user(user)
+        async with state.lock:
+            key = state.current
+            if key is None or key not in state.passages:
+                raise ValueError("no quiz in progress; send op=start first")
+            ref = state.passages[key][0]
+            # grading a long passage takes milliseconds; keep it off the event loop
+            percent, message = await asyncio.get_running_loop().run_in_executor(
+                None, grade_recitation, self.corpus.passage_text(ref), attempt, self.pass_score)
+            duration = round(time.monotonic() - state.started, 2)
+            t = round(time.time(), 3)
+            await self.shard(user).run(self.shard(user).record, user, key, t, percent, duration, mode)
+            _apply_attempt(state.stats.setdefault(key, _empty_stats()), percent, t)
+            if percent >= self.pass_score:
+                state.current = None
+        return {"key": key, "score": percent, "passed": percent >= self.pass_score, "message": message}
+
+    async def stats(self, user):
+        state = await self.user(user)
+        return {"stats": {key: state.stats.get(key, _empty_stats()) for key in state.passages}}
+
+    async def handle(self, request):
+        """Dispatch one request dict; errors come back as {"error": ...}."""
+        user = request.get("user")
+        if not user or not isinstance(user, str):
+            return {"error": "user is required"}
+        op = request.get("op")
+        try:
+            if op == "add":
+                return await self.add(user, request.get("reference"))
+            if op == "remove":
+                return await self.remove(user, request.get("key"))
+            if op == "list":
+                return await self.list_passages(user)
+            if op == "start":
+                return await self.start_quiz(user)
+            if op == "submit":
+                return await self.submit(user, str(request.get("attempt", "")), request.get("mode", "recite"))
+            if op == "stats":
+                return await self.stats(user)
+            return {"error": f"unknown op {op!r}"}
+        except KeyError as e:
+            return {"error": f"no such passage {e}"}
+        except ValueError as e:
+            return {"error": str(e)}
+        except Exception as e:
+            # malformed fields (wrong types) must not drop the client's connection
+            log.exception("request failed: %r", request)
+            return {"error": f"bad request: {e}"}
+
+    # ----------------- TCP front end -----------------
+    async def serve_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    reply = {"error": "invalid JSON"}
+                else:
+                    reply = await self.handle(request) if isinstance(request, dict) else {"error": "expected an object"}
+                writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def main(host, port, shard_dir, shard_count):
+    service = QuizService(shard_dir, shard_count)
+    await service.start()
+    server = await asyncio.start_server(service.serve_client, host, port)
+    print(f"Quiz service listening on {host}:{port} ({shard_count} shards in {shard_dir})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sword of the Spirit multi-user quiz service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5050)
+    parser.add_argument("--shards", type=int, default=SHARD_COUNT)
+    parser.add_argument("--shard-dir", default=SHARD_DIR)
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.host, args.port, args.shard_dir, args.shards))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,124 @@
+# scripts/quiz_timer.py
+import tkinter as tk
+from tkinter import ttk
+
+
+class QuizTimer:
+    """
+    Schedules timed quizzes on the Tk event loop.
+    Between quizzes there is exactly one pending after() callback, so the app
+    makes no wakeups until the next quiz is due; the once-a-second countdown
+    ticks only run during the short warning before the quiz locks the screen.
+    """
+
+    def __init__(self, root, start_quiz, is_busy=None, interval_minutes=60, countdown_seconds=30):
+        self.root = root
+        self.start_quiz = start_quiz            # called when the countdown finishes
+        self.is_busy = is_busy or (lambda: False)
+        self.interval_minutes = interval_minutes
+        self.countdown_seconds = countdown_seconds
+        self.enabled = False
+
+        self._job = None
+        self._countdown_win = None
+        self._remaining = 0
+        self._countdown_var = tk.StringVar(master=root, value="")
+
+    # ----------------- Arming -----------------
+    def configure(self, interval_minutes=None, countdown_seconds=None, enabled=None):
+        """Update settings; the next quiz is rescheduled from now."""
+        if interval_minutes is not None:
+            self.interval_minutes = max(1, int(interval_minutes))
+        if countdown_seconds is not None:
+            self.countdown_seconds = max(0, int(countdown_seconds))
+        if enabled is not None:
+            self.enabled = bool(enabled)
+        if self.enabled:
+            self.arm()
+        else:
+            self.cancel()
+
+    def start(self):
+        self.enabled = True
+        self.arm()
+
+    def arm(self):
+        """(Re)schedule the next quiz one interval from now."""
+        self.cancel()
+        self._job = self.root.after(int(self.interval_minutes * 60 * 1000), self._on_due)
+
+    def cancel(self):
+        if self._job is not None:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+        self._close_countdown()
+
+    # ----------------- Countdown -----------------
+    def _on_due(self):
+        self._job = None
+        if not self.enabled:
+            return
+        if self.is_busy():
+            # a quiz is already on screen; try again next interval
+            self.arm()
+            return
+        if self.countdown_seconds <= 0:
+            self._fire()
+            return
+        self._remaining = self.countdown_seconds
+        self._show_countdown()
+        self._tick()
+
+    def _show_countdown(self):
+        win = tk.Toplevel(self.root)
+        win.withdraw()
+        win.title("Sword of the Spirit")
+        win.resizable(False, False)
+        frm = ttk.Frame(win, padding=12)
+        frm.pack(fill="both", expand=True)
+        ttk.Label(frm, textvariable=self._countdown_var, font=("Arial", 14)).pack(pady=(0, 8))
+        ttk.Button(frm, text="Start Now", command=self._fire).pack()
+        win.protocol("WM_DELETE_WINDOW", lambda: None)  # the quiz can't be dismissed
+
+        # bottom-right corner, above other windows
+        win.update_idletasks()
+        w, h = win.winfo_reqwidth(), win.winfo_reqheight()
+        x = win.winfo_screenwidth() - w - 40
+        y = win.winfo_screenheight() - h - 80
+        win.geometry(f"+{x}+{y}")
+        win.attributes("-topmost", True)
+        win.deiconify()
+        self._countdown_win = win
+
+    def _tick(self):
+        if self._remaining <= 0:
+            self._fire()
+            return
+        self._countdown_var.set(f"Scripture quiz in {self._remaining} seconds")
+        self._remaining -= 1
+        self._job = self.root.after(1000, self._tick)
+
+    def _close_countdown(self):
+        if self._countdown_win is not None:
+            try:
+                self._countdown_win.destroy()
+            except Exception:
+                pass
+            self._countdown_win = None
+
+    def _fire(self):
+        if self._job is not None:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+        self._close_countdown()
+        try:
+            self.start_quiz()
+        finally:
+            if self.enabled:
+                self.arm()
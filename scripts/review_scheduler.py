@@ -0,0 +1,171 @@
+# scripts/review_scheduler.py
+import heapq
+import json
+import os
+import time
+
+from scripts.grading import DEFAULT_PASS_SCORE
+from scripts.sheath import passage_key
+
+DAY = 86400
+# A failed review comes back after this many seconds
+RELEARN_DELAY = 10 * 60
+# Passages whose interval reaches this many days are considered memorized
+MEMORIZED_INTERVAL_DAYS = 21
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# Cards of passages no longer in the sheath are kept (in case they come back)
+# until this long after they were due, and at most this many of them
+ORPHAN_KEEP_DAYS = 90
+MAX_ORPHANS = 200
+
+
+def score_to_quality(percent, pass_score=DEFAULT_PASS_SCORE):
+    """
+    Map a quiz similarity percentage to an SM-2 quality grade (0-5).
+    A pass is quality 3; the grades above and below are spread evenly over
+    the ranges either side of pass_score (75 gives cutoffs 25/50/75/85/95).
+    """
+    if percent >= pass_score + (100 - pass_score) * 0.8:
+        return 5
+    if percent >= pass_score + (100 - pass_score) * 0.4:
+        return 4
+    if percent >= pass_score:
+        return 3
+    if percent >= pass_score * 2 / 3:
+        return 2
+    if percent >= pass_score / 3:
+        return 1
+    return 0
+
+
+class ReviewScheduler:
+    """
+    SM-2 spaced-repetition scheduler.
+    Per-passage interval/ease/repetitions are kept in a JSON file and the due
+    dates in a min-heap, so picking the next passage is O(log n).
+    Heap entries are invalidated lazily: a passage's live due date is the one
+    in self.cards, and older heap entries for it are skipped when popped.
+    Cards of passages missing from the sheath are kept for a while (an edit or
+    a partial load must not wipe their history) but never picked.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.cards = {}     # passage key -> {"interval", "ease", "reps", "due"}
+        self._heap = []     # (due, key)
+        self._active = None  # keys in the sheath at the last sync (None = all cards)
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.filename, "r", encoding="utf-8") as f:
+                self.cards = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.cards = {}
+        self._heap = [(card["due"], key) for key, card in self.cards.items()]
+        heapq.heapify(self._heap)
+
+    def save(self):
+        tmp = self.filename + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.cards, f, indent=1)
+        os.replace(tmp, self.filename)
+
+    def sync(self, passages):
+        """
+        Match the scheduler to the sheath: new passages become due now, passages
+        missing from it are set aside (their cards are kept and skipped, up to
+        ORPHAN_KEEP_DAYS past due and MAX_ORPHANS of them), and passages that
+        come back resume their old schedule.
+        """
+        now = time.time()
+        keys = set()
+        returned = False
+        for ref in passages:
+            key = passage_key(ref)
+            keys.add(key)
+            if key not in self.cards:
+                self.cards[key] = {"interval": 0, "ease": DEFAULT_EASE, "reps": 0, "due": now}
+                heapq.heappush(self._heap, (now, key))
+            elif self._active is not None and key not in self._active:
+                returned = True
+        self._active = keys
+        self._prune_orphans(keys, now)
+        if returned:
+            # its heap entry may have been discarded while it was set aside
+            self._heap = [(card["due"], key) for key, card in self.cards.items() if key in keys]
+            heapq.heapify(self._heap)
+
+    def _prune_orphans(self, keys, now):
+        orphans = [key for key in self.cards if key not in keys]
+        if not orphans:
+            return
+        cutoff = now - ORPHAN_KEEP_DAYS * DAY
+        expired = [key for key in orphans if self.cards[key]["due"] < cutoff]
+        kept = [key for key in orphans if self.cards[key]["due"] >= cutoff]
+        if len(kept) > MAX_ORPHANS:
+            # drop the ones that have been due the longest
+            kept.sort(key=lambda key: self.cards[key]["due"])
+            expired += kept[:len(kept) - MAX_ORPHANS]
+        for key in expired:
+            del self.cards[key]
+
+    def _is_live(self, entry):
+        due, key = entry
+        card = self.cards.get(key)
+        return (card is not None and card["due"] == due
+                and (self._active is None or key in self._active))
+
+    def next_due(self, exclude=None):
+        """Return the key of the most overdue passage (skipping `exclude`), or None."""
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        if not heap:
+            return None
+        if heap[0][1] != exclude:
+            return heap[0][1]
+
+        # set the excluded passage aside to peek at the runner-up
+        top = heapq.heappop(heap)
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        runner_up = heap[0][1] if heap else None
+        heapq.heappush(heap, top)
+        return runner_up
+
+    def review(self, ref, percent, now=None, pass_score=DEFAULT_PASS_SCORE):
+        """
+        Record a graded attempt and reschedule the passage; scores below
+        pass_score count as lapses.
+        Returns True when the passage has just reached the memorized interval.
+        """
+        now = time.time() if now is None else now
+        key = passage_key(ref)
+        card = self.cards.setdefault(key, {"interval": 0, "ease": DEFAULT_EASE, "reps": 0, "due": now})
+        was_memorized = card["interval"] >= MEMORIZED_INTERVAL_DAYS
+
+        q = score_to_quality(percent, pass_score)
+        if q < 3:
+            # lapse: start the repetitions over and see it again shortly
+            card["reps"] = 0
+            card["interval"] = 0
+            card["due"] = now + RELEARN_DELAY
+        else:
+            card["reps"] += 1
+            if card["reps"] == 1:
+                card["interval"] = 1
+            elif card["reps"] == 2:
+                card["interval"] = 6
+            else:
+                card["interval"] = round(card["interval"] * card["ease"])
+            card["due"] = now + card["interval"] * DAY
+        card["ease"] = max(MIN_EASE, card["ease"] + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
+
+        heapq.heappush(self._heap, (card["due"], key))
+        try:
+            self.save()
+        except Exception:
+            pass
+        return not was_memorized and card["interval"] >= MEMORIZED_INTERVAL_DAYS
@@ -0,0 +1,128 @@
+# scripts/session_sampler.py
+import random
+import time
+
+from scripts.sheath import passage_key
+
+DAY = 86400
+FAVORITE_BOOST = 1.5
+
+
+def passage_weight(stats, favorite=False, now=None):
+    """
+    Sampling weight for a passage from its history aggregates:
+    stale passages, weak passages and favorites are picked more often.
+    """
+    now = time.time() if now is None else now
+    # staleness: 1.0 (just practiced) up to 3.0 (two weeks or more, or never)
+    if stats.get("last_time") is None:
+        stale = 3.0
+    else:
+        stale = 1.0 + min(max(now - stats["last_time"], 0), 14 * DAY) / (7 * DAY)
+    # weakness: 1.0 (last score 100%) up to 3.0 (0% or never attempted)
+    last = stats.get("last")
+    weak = 1.0 + (100 - (last if last is not None else 0)) / 50
+    return stale * weak * (FAVORITE_BOOST if favorite else 1.0)
+
+
+class FenwickTree:
+    """Binary indexed tree over float weights: point update and prefix search in O(log n)."""
+
+    def __init__(self, weights):
+        n = len(weights)
+        self.n = n
+        self.tree = [0.0] * (n + 1)
+        for i, w in enumerate(weights, 1):
+            self.tree[i] += w
+            parent = i + (i & -i)
+            if parent <= n:
+                self.tree[parent] += self.tree[i]
+
+    def add(self, i, delta):
+        i += 1
+        while i <= self.n:
+            self.tree[i] += delta
+            i += i & -i
+
+    def total(self):
+        i, s = self.n, 0.0
+        while i > 0:
+            s += self.tree[i]
+            i -= i & -i
+        return s
+
+    def find(self, target):
+        """Smallest index whose prefix sum exceeds `target`."""
+        pos = 0
+        step = 1 << self.n.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= self.n and self.tree[nxt] <= target:
+                pos = nxt
+                target -= self.tree[nxt]
+            step >>= 1
+        return min(pos, self.n - 1)
+
+
+class SessionSampler:
+    """
+    Weighted sampling without replacement over the sheath for one quiz session.
+    A drawn passage's weight drops to zero until every passage has been drawn,
+    then the session starts a fresh round.
+    """
+
+    def __init__(self, passages, weights, rng=None):
+        self.passages = list(passages)
+        self.base = list(weights)           # weight each passage returns to on a new round
+        self.live = list(self.base)         # current weights (0 once drawn)
+        self.index = {passage_key(ref): i for i, ref in enumerate(self.passages)}
+        self.tree = FenwickTree(self.live)
+        self.rng = rng or random.Random()
+
+    def __len__(self):
+        return len(self.passages)
+
+    def _set(self, i, weight):
+        self.tree.add(i, weight - self.live[i])
+        self.live[i] = weight
+
+    def _new_round(self):
+        self.live = list(self.base)
+        self.tree = FenwickTree(self.live)
+
+    def mark_drawn(self, ref):
+        """Remove `ref` from the rest of this round (e.g. the passage picked by the scheduler)."""
+        i = self.index.get(passage_key(ref))
+        if i is not None:
+            self._set(i, 0.0)
+
+    def draw(self, exclude=None):
+        """
+        Return a passage with probability proportional to its weight, or None if empty.
+        `exclude` (the passage on screen) is never repeated straight away when a new round starts.
+        """
+        if not self.passages:
+            return None
+        total = self.tree.total()
+        if total <= 1e-9:
+            self._new_round()
+            if exclude is not None and len(self.passages) > 1:
+                self.mark_drawn(exclude)
+            total = self.tree.total()
+            if total <= 1e-9:
+                return None
+        i = self.tree.find(self.rng.random() * total)
+        if self.live[i] <= 0:
+            # float drift can land on an already-drawn slot; take the first live one
+            i = next((j for j in range(len(self.live)) if self.live[j] > 0), i)
+        self._set(i, 0.0)
+        return self.passages[i]
+
+    def update(self, ref, weight):
+        """Change a passage's weight after a result; takes effect now if it is still undrawn."""
+        i = self.index.get(passage_key(ref))
+        if i is None:
+            return
+        self.base[i] = weight
+        if self.live[i] > 0:
+            self._set(i, weight)
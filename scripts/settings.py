@@ -0,0 +1,141 @@
+# scripts/settings.py
+import atexit
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, fields, replace
+
+SETTINGS_FILE = "resources/settings.json"
+# Quiet period before changed settings are written (keeps spinbox drags to one write)
+SAVE_DELAY = 1.0
+
+
+@dataclass(frozen=True)
+class Settings:
+    username: str = ""
+    enable_feature: bool = False
+    theme: str = "MidnightIndigo"
+    volume: int = 50
+    brightness: float = 0.5
+    max_items: int = 10
+    timer_enabled: bool = True
+    quiz_interval_minutes: int = 60
+    countdown_seconds: int = 30
+    pass_score: int = 75        # percent needed to pass a quiz
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build Settings from JSON data; unknown keys are ignored, bad values fall back to defaults."""
+        values = {}
+        for field in fields(cls):
+            if field.name in data:
+                try:
+                    values[field.name] = _coerce(field.type, data[field.name])
+                except (TypeError, ValueError):
+                    pass
+        return cls(**values)
+
+
+def _coerce(kind, value):
+    if kind in (bool, "bool"):
+        if isinstance(value, str):
+            return value.strip().lower() in ("1", "true", "yes", "on")
+        return bool(value)
+    if kind in (int, "int"):
+        return int(value)
+    if kind in (float, "float"):
+        return float(value)
+    return str(value)
+
+
+class SettingsStore:
+    """
+    Settings loaded once into an immutable Settings object. Components read
+    `store.settings` (no disk access) and subscribe to hear about changes;
+    `update` notifies subscribers at once and saves after SAVE_DELAY of quiet,
+    replacing the file atomically.
+
+    Listeners are called as listener(settings, changed) with the set of
+    changed field names, on the thread that called update().
+    """
+
+    def __init__(self, filename=SETTINGS_FILE):
+        self.filename = filename
+        self.settings = Settings()
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._save_timer = None
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}  # missing or empty file: defaults
+        self.settings = Settings.from_dict(data if isinstance(data, dict) else {})
+
+    def subscribe(self, listener, *names):
+        """Call listener on changes; if names are given, only when one of them changes."""
+        self._listeners.append((listener, set(names)))
+
+    def unsubscribe(self, listener):
+        self._listeners = [(l, n) for l, n in self._listeners if l is not listener]
+
+    def update(self, **changes):
+        """Apply changes (validated against the Settings types), notify and schedule a save."""
+        new = replace(self.settings, **{
+            name: _coerce(type(getattr(self.settings, name)), value)
+            for name, value in changes.items()
+        })
+        changed = {name for name in changes if getattr(new, name) != getattr(self.settings, name)}
+        if not changed:
+            return self.settings
+        self.settings = new
+        for listener, names in list(self._listeners):
+            if not names or names & changed:
+                listener(new, changed)
+        self._schedule_save()
+        return new
+
+    # ----------------- Persistence -----------------
+    def _schedule_save(self):
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(SAVE_DELAY, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def save(self):
+        """Write the settings now (atomic replace)."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            tmp = self.filename + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(asdict(self.settings), f, indent=4)
+            os.replace(tmp, self.filename)
+
+    def flush(self):
+        """Save now if a save is pending (called at exit)."""
+        if self._save_timer is not None:
+            try:
+                self.save()
+            except OSError:
+                pass
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_settings():
+    """Return the app-wide SettingsStore."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SettingsStore()
+            atexit.register(_store.flush)
+        return _store
@@ -1,9 +1,9 @@
 # settings_menu.py
 import tkinter as tk
 from tkinter import ttk, simpledialog, messagebox
-from scripts.theme_manager import themes, apply_theme
+from scripts.theme_manager import theme_names, apply_theme
 from scripts.ui_common import MinSizeMixin
-import json
+from scripts.settings import get_settings
 
 class SettingsMenu(ttk.Frame, MinSizeMixin):
     def __init__(self, parent, controller):
@@ -24,13 +24,19 @@ class SettingsMenu(ttk.Frame, MinSizeMixin):
         # Title
         ttk.Label(content, text="Settings Menu", font=("Arial", 30)).pack(pady=(0, 15))
 
-        # Variables
-        self.username_var = tk.StringVar()
-        self.feature_var = tk.BooleanVar()
-        self.theme_var = tk.StringVar(value="MidnightIndigo")
-        self.volume_var = tk.IntVar(value=50)
-        self.brightness_var = tk.DoubleVar(value=0.5)
-        self.max_items_var = tk.IntVar(value=10)
+        # Variables, starting from the saved settings
+        self.store = get_settings()
+        settings = self.store.settings
+        self.username_var = tk.StringVar(value=settings.username)
+        self.feature_var = tk.BooleanVar(value=settings.enable_feature)
+        self.theme_var = tk.StringVar(value=settings.theme)
+        self.volume_var = tk.IntVar(value=settings.volume)
+        self.brightness_var = tk.DoubleVar(value=settings.brightness)
+        self.max_items_var = tk.IntVar(value=settings.max_items)
+        self.timer_enabled_var = tk.BooleanVar(value=settings.timer_enabled)
+        self.quiz_interval_var = tk.IntVar(value=settings.quiz_interval_minutes)
+        self.countdown_var = tk.IntVar(value=settings.countdown_seconds)
+        self.pass_score_var = tk.IntVar(value=settings.pass_score)
 
         # Widgets
         ttk.Label(content, text="Username:").pack(anchor="w")
@@ -42,7 +48,7 @@ class SettingsMenu(ttk.Frame, MinSizeMixin):
         theme_dropdown = ttk.Combobox(
             content,
             textvariable=self.theme_var,
-            values=list(themes.keys()),
+            values=theme_names(),
             state="readonly"
         )
         theme_dropdown.pack(fill="x", pady=5)
@@ -57,6 +63,17 @@ class SettingsMenu(ttk.Frame, MinSizeMixin):
         ttk.Label(content, text="Max Items:").pack(anchor="w")
         ttk.Spinbox(content, from_=1, to=100, textvariable=self.max_items_var).pack(fill="x", pady=5)
 
+        ttk.Checkbutton(content, text="Timed quizzes", variable=self.timer_enabled_var).pack(anchor="w", pady=5)
+
+        ttk.Label(content, text="Quiz every (minutes):").pack(anchor="w")
+        ttk.Spinbox(content, from_=1, to=1440, textvariable=self.quiz_interval_var).pack(fill="x", pady=5)
+
+        ttk.Label(content, text="Countdown before lockout (seconds):").pack(anchor="w")
+        ttk.Spinbox(content, from_=0, to=600, textvariable=self.countdown_var).pack(fill="x", pady=5)
+
+        ttk.Label(content, text="Passing score (%):").pack(anchor="w")
+        ttk.Spinbox(content, from_=1, to=100, textvariable=self.pass_score_var).pack(fill="x", pady=5)
+
         # Buttons
         ttk.Button(content, text="Save Settings", command=self.save_settings).pack(pady=(15, 5))
         ttk.Button(content, text="Back", command=lambda: controller.show_frame("MainMenu")).pack(pady=10)
@@ -67,17 +84,25 @@ class SettingsMenu(ttk.Frame, MinSizeMixin):
 
 
     def save_settings(self):
-        settings_data = {
-            "username": self.username_var.get(),
-            "enable_feature": self.feature_var.get(),
-            "theme": self.theme_var.get(),
-            "volume": self.volume_var.get(),
-            "brightness": self.brightness_var.get(),
-            "max_items": self.max_items_var.get()
-        }
         try:
-            with open("settings.json", "w") as f:
-                json.dump(settings_data, f, indent=4)
-            messagebox.showinfo("Saved", "Settings saved to settings.json")
+            settings_data = {
+                "username": self.username_var.get(),
+                "enable_feature": self.feature_var.get(),
+                "theme": self.theme_var.get(),
+                "volume": self.volume_var.get(),
+                "brightness": self.brightness_var.get(),
+                "max_items": self.max_items_var.get(),
+                "timer_enabled": self.timer_enabled_var.get(),
+                "quiz_interval_minutes": max(1, self.quiz_interval_var.get()),
+                "countdown_seconds": max(0, self.countdown_var.get()),
+                "pass_score": min(100, max(1, self.pass_score_var.get())),
+            }
+        except (tk.TclError, ValueError) as e:
+            messagebox.showerror("Error", f"Invalid setting: {e}")
+            return
+        try:
+            # subscribers (theme, quiz timer, quiz) update at once; the file is written shortly after
+            self.store.update(**settings_data)
+            messagebox.showinfo("Saved", "Settings saved")
         except Exception as e:
-            messagebox.showerror("Error", f"Could not save settings: {e}")
\ No newline at end of file
+            messagebox.showerror("Error", f"Could not save settings: {e}")
@@ -1,6 +1,24 @@
-import pythonbible as bible
 import csv
 
+from scripts.metrics import metrics
+
+_read_timed = metrics.timed("sheath_read_seconds", "Time to read and parse the sheath CSV")
+_write_timed = metrics.timed("sheath_write_seconds", "Time to rewrite or append to the sheath CSV")
+_rows_parsed = metrics.counter("sheath_rows_parsed_total", "Sheath CSV rows parsed")
+
+# pythonbible takes ~0.3 s to import, so it is only imported by the methods that
+# build references; getRows/row_key let light tools (the terminal quiz) skip it.
+
+def passage_key(ref):
+    """Returns a stable string key for a reference (NormalizedReference is not hashable)."""
+    end_book = ref.end_book.value if ref.end_book else ""
+    return f"{ref.book.value}:{ref.start_chapter}:{ref.start_verse}-{ref.end_chapter}:{ref.end_verse}:{end_book}"
+
+def row_key(row):
+    """Returns the passage_key for a row from Sheath.getRows."""
+    end_book = row[5] if isinstance(row[5], int) else ""
+    return f"{row[0]}:{row[1]}:{row[2]}-{row[3]}:{row[4]}:{end_book}"
+
 class Sheath():
 
     def __init__(self, filename):
@@ -10,6 +28,7 @@ class Sheath():
         """Sets the filename of the csv file associated with the sheath."""
         self.filename = filename
 
+    @_write_timed
     def addPassages(self, passages):
         """Adds new passages if not already present."""
         allPassages = self.getPassages()
@@ -18,15 +37,16 @@ class Sheath():
             for reference in passages:
                 if reference not in allPassages:
                     writer.writerow([
-                        reference.book,
+                        reference.book.value,
                         reference.start_chapter,
                         reference.start_verse,
                         reference.end_chapter,
                         reference.end_verse,
-                        reference.end_book,
+                        reference.end_book.value if reference.end_book else None,
                         0, "False"
                     ])
 
+    @_write_timed
     def removePassages(self, passages):
         rows = []
         for item in passages:
@@ -48,8 +68,10 @@ class Sheath():
             file.writelines(lines)
         
 
+    @_read_timed
     def getPassages(self):
         """Returns a list of references currently in the sheath."""
+        import pythonbible as bible
         references = []
         with open(self.filename, newline="", encoding="utf-8") as fin:
             reader = csv.reader(fin)
@@ -63,13 +85,45 @@ class Sheath():
                         bible.Book(row[5]) if isinstance(row[5], int) else None
                     )
                 )
-        return references  
+        _rows_parsed.inc(len(references))
+        return references
+
+    @_read_timed
+    def getRows(self):
+        """Returns the raw rows in file order (numbers as ints, padded to all 8 columns)."""
+        rows = []
+        with open(self.filename, newline="", encoding="utf-8") as fin:
+            reader = csv.reader(fin)
+            headers = next(reader, None)  # skip header
+            for row in reader:
+                row = [(int(item) if item.isnumeric() else item) for item in row]
+                while len(row) < 8:
+                    row.append("")
+                rows.append(row)
+        _rows_parsed.inc(len(rows))
+        return rows
 
+    def getEntries(self):
+        """Returns a list of (reference, memorization status, favorite) tuples in file order."""
+        import pythonbible as bible
+        entries = []
+        for row in self.getRows():
+            reference = bible.NormalizedReference(
+                bible.Book(row[0]),
+                row[1], row[2], row[3], row[4],
+                bible.Book(row[5]) if isinstance(row[5], int) else None
+            )
+            status = row[6] if isinstance(row[6], int) else 0
+            entries.append((reference, status, str(row[7]).strip() == "True"))
+        return entries
+
+    @_write_timed
     def emptySheath(self):
         """Deletes all references in the sheath and resets header."""
         with open(self.filename, "w", newline="", encoding="utf-8") as fout:
             fout.write("Book,StartChapter,StartVerse,EndChapter,EndVerse,EndBook,WIP,Favorite\n")
 
+    @_write_timed
     def setFavorites(self,passages):
         """Marks the given passages as favorites"""
         rows = []
@@ -90,6 +144,7 @@ class Sheath():
         with open(self.filename, 'w') as file:
             file.writelines(lines)
 
+    @_write_timed
     def unsetFavorites(self,passages):
         """Unmarks the given passages as favorites"""
         rows = []
@@ -122,6 +177,7 @@ class Sheath():
                 raise ValueError("Reference is not in the sheath.")
         return rows
 
+    @_write_timed
     def setMemStatus(self,passages,statuses):
         """Sets the memorization status of the given passages in the sheath.
         Accepts list of statuses either one for each passage or a single one for all passages."""
@@ -0,0 +1,70 @@
+# scripts/sheath_io.py
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class SheathWriter:
+    """
+    Runs Sheath file operations on one background thread, in the order they
+    were submitted, so the Tk thread never waits on disk. Each call returns a
+    concurrent.futures.Future; use `deliver` to get its result back on the Tk thread.
+    """
+
+    def __init__(self, sheath):
+        self.sheath = sheath
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue fn(*args, **kwargs) on the writer thread and return its Future."""
+        future = Future()
+        self._queue.put((future, fn, args, kwargs))
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sheath-writer", daemon=True)
+                self._thread.start()
+        return future
+
+    def call(self, method, *args):
+        """Queue a Sheath method by name, e.g. call("setFavorites", [ref])."""
+        return self.submit(getattr(self.sheath, method), *args)
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far has run (used at exit)."""
+        if self._thread is None:
+            return
+        try:
+            self.submit(lambda: None).result(timeout)
+        except Exception:
+            pass
+
+    def _run(self):
+        while True:
+            future, fn, args, kwargs = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+
+def deliver(widget, future, callback, errback=None):
+    """
+    Call callback(result) -- or errback(exception) -- on `widget`'s Tk thread
+    once `future` completes.
+    """
+    def done(f):
+        error = f.exception()
+        try:
+            if error is None:
+                widget.after(0, callback, f.result())
+            elif errback is not None:
+                widget.after(0, errback, error)
+        except Exception:
+            pass  # widget destroyed / interpreter shutting down
+
+    future.add_done_callback(done)
+    return future
@@ -0,0 +1,224 @@
+# scripts/sheath_model.py
+import atexit
+import threading
+
+from scripts.sheath import Sheath, passage_key
+from scripts.sheath_io import SheathWriter, deliver
+
+SHEATH_FILE = "resources/verses.csv"
+
+
+class SheathEntry:
+    """One passage in the sheath with its flags. `seq` orders entries as in the file."""
+
+    __slots__ = ("ref", "key", "status", "favorite", "seq")
+
+    def __init__(self, ref, status, favorite, seq):
+        self.ref = ref
+        self.key = passage_key(ref)
+        self.status = status
+        self.favorite = favorite
+        self.seq = seq
+
+    @property
+    def memorized(self):
+        return bool(self.status)
+
+
+class SheathModel:
+    """
+    In-memory copy of the sheath that writes every change through to the CSV
+    file and tells subscribers exactly what changed, so views can patch single
+    rows instead of reloading everything.
+
+    Listeners are called as listener(event, entry, changes) where event is
+    "reset" (entry is None), "added", "removed" or "changed" (changes maps each
+    changed field to its old value). A failed file read or write is reported as
+    "error" with changes={"error": exception, "op": "load" or "write"}.
+
+    Changes are applied in memory at once and written by a SheathWriter thread,
+    so the UI never waits on disk. Once attached to a Tk widget, loading and
+    write errors are delivered on the Tk thread.
+    """
+
+    def __init__(self, sheath, load=True):
+        self.sheath = sheath
+        self.io = SheathWriter(sheath)
+        self.entries = {}       # key -> SheathEntry, in file order
+        self.loaded = False
+        self.version = 0        # bumped on every change (used for HTTP ETags)
+        self.widget = None      # Tk widget used to marshal results back to the Tk thread
+        self._listeners = []
+        self._waiting = []      # callbacks for when_loaded
+        self._next_seq = 0
+        self._lock = threading.RLock()
+        if load:
+            self.load()
+
+    def attach(self, widget):
+        """Deliver background results (loads, write errors) through widget.after()."""
+        self.widget = widget
+
+    # ----------------- Observers -----------------
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _emit(self, event, entry=None, changes=None):
+        if event != "error":
+            with self._lock:
+                self.version += 1
+        for listener in list(self._listeners):
+            try:
+                listener(event, entry, changes or {})
+            except Exception:
+                pass
+
+    # ----------------- Reading -----------------
+    def load(self):
+        """(Re)read the sheath file on the calling thread."""
+        self._apply_entries(self.sheath.getEntries())
+
+    def load_async(self):
+        """(Re)read the sheath file on the writer thread; listeners get "reset" on the Tk thread."""
+        future = self.io.submit(self.sheath.getEntries)
+        if self.widget is None:
+            def done(f):
+                if f.exception() is None:
+                    self._apply_entries(f.result())
+                else:
+                    self._on_load_error(f.exception())
+            future.add_done_callback(done)
+        else:
+            deliver(self.widget, future, self._apply_entries, self._on_load_error)
+        return future
+
+    def _on_load_error(self, error):
+        """Report a failed read as "error" and fail the when_loaded callbacks waiting on it."""
+        with self._lock:
+            waiting, self._waiting = self._waiting, []
+        self._emit("error", None, {"error": error, "op": "load"})
+        for callback, errback in waiting:
+            if errback is not None:
+                errback(error)
+
+    def _apply_entries(self, rows):
+        with self._lock:
+            self.entries = {}
+            self._next_seq = 0
+            for ref, status, favorite in rows:
+                entry = SheathEntry(ref, status, favorite, self._next_seq)
+                self._next_seq += 1
+                self.entries.setdefault(entry.key, entry)
+            self.loaded = True
+            waiting, self._waiting = self._waiting, []
+        self._emit("reset")
+        for callback, errback in waiting:
+            callback()
+
+    def when_loaded(self, callback, errback=None):
+        """
+        Call `callback` now if the sheath is loaded, otherwise right after it loads.
+        If the pending load fails, `errback(error)` is called instead (when given).
+        """
+        with self._lock:
+            if not self.loaded:
+                self._waiting.append((callback, errback))
+                return
+        callback()
+
+    def get(self, ref):
+        """Return the entry for a reference, or None if it is not in the sheath."""
+        return self.entries.get(passage_key(ref))
+
+    def passages(self):
+        return [entry.ref for entry in self.entries.values()]
+
+    def __len__(self):
+        return len(self.entries)
+
+    # ----------------- Writing -----------------
+    def _write(self, fn, *args):
+        """Queue a file write; failures are reported to listeners as "error"."""
+        future = self.io.submit(fn, *args)
+        if self.widget is not None:
+            deliver(self.widget, future, lambda result: None, self._on_write_error)
+        return future
+
+    def _on_write_error(self, error):
+        self._emit("error", None, {"error": error, "op": "write"})
+
+    def _write_add(self, ref, status, favorite):
+        self.sheath.addPassages([ref])
+        if status:
+            self.sheath.setMemStatus([ref], [status])
+        if favorite:
+            self.sheath.setFavorites([ref])
+
+    def add(self, ref, status=0, favorite=False):
+        """Add a passage (no-op if present). Returns its entry."""
+        with self._lock:
+            existing = self.get(ref)
+            if existing is not None:
+                return existing
+            self._write(self._write_add, ref, status, favorite)
+            entry = SheathEntry(ref, status, favorite, self._next_seq)
+            self._next_seq += 1
+            self.entries[entry.key] = entry
+        self._emit("added", entry)
+        return entry
+
+    def remove(self, ref):
+        with self._lock:
+            entry = self.get(ref)
+            if entry is None:
+                return None
+            self._write(self.sheath.removePassages, [ref])
+            del self.entries[entry.key]
+        self._emit("removed", entry)
+        return entry
+
+    def set_status(self, ref, status):
+        with self._lock:
+            entry = self.get(ref)
+            if entry is None or entry.status == status:
+                return entry
+            self._write(self.sheath.setMemStatus, [ref], [status])
+            old, entry.status = entry.status, status
+        self._emit("changed", entry, {"status": old})
+        return entry
+
+    def set_favorite(self, ref, favorite):
+        with self._lock:
+            entry = self.get(ref)
+            if entry is None or entry.favorite == favorite:
+                return entry
+            self._write(self.sheath.setFavorites if favorite else self.sheath.unsetFavorites, [ref])
+            old, entry.favorite = entry.favorite, favorite
+        self._emit("changed", entry, {"favorite": old})
+        return entry
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_sheath_model(widget=None):
+    """
+    Return the SheathModel shared by every view of the sheath.
+    The first caller that passes a Tk widget gets a model that loads in the
+    background (see SheathModel.when_loaded); otherwise it loads synchronously.
+    """
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = SheathModel(Sheath(SHEATH_FILE), load=widget is None)
+            # pending writes must reach the file before the process exits
+            atexit.register(_model.io.flush, 5)
+            if widget is not None:
+                _model.attach(widget)
+                _model.load_async()
+        return _model
@@ -0,0 +1,217 @@
+# scripts/sheath_search.py
+import re
+import threading
+from bisect import bisect_left, insort
+
+from scripts.passage_text import get_passage_text
+from scripts.sheath import passage_key
+from scripts.sheath_model import get_sheath_model
+
+QUERY_TOKEN = re.compile(r"[a-z0-9:']+")
+TEXT_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def query_tokens(text):
+    return QUERY_TOKEN.findall((text or "").lower())
+
+
+def reference_tokens(ref):
+    """Tokens that find a passage by its reference: book names and chapter:verse."""
+    tokens = set()
+    for book in {ref.book, getattr(ref, "end_book", None) or ref.book}:
+        tokens.update(TEXT_TOKEN.findall(book.title.lower()))
+        tokens.update(TEXT_TOKEN.findall(book.name.lower().replace("_", " ")))
+        for abbreviation in getattr(book, "abbreviations", ()):
+            tokens.update(TEXT_TOKEN.findall(abbreviation.lower()))
+    tokens.add(f"{ref.start_chapter}:{ref.start_verse}")
+    tokens.add(f"{ref.end_chapter}:{ref.end_verse}")
+    tokens.add(str(ref.start_chapter))
+    tokens.add(str(ref.end_chapter))
+    return tokens
+
+
+class SheathSearch:
+    """
+    Token index over the passages in the sheath, used to filter VersesMenu as
+    the user types. Every query token is treated as a prefix so partial words
+    match while typing.
+
+    Reference tokens are indexed as soon as a passage appears in the model; the
+    passage words are added by a background thread, which calls subscribed
+    listeners (from that thread) once it has caught up. When a query only extends the
+    previous one, the previous result is narrowed instead of searched again.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.vocab = []            # sorted list of every indexed token
+        self.postings = {}         # token -> set of passage keys
+        self.entry_tokens = {}     # passage key -> sorted list of its tokens
+        self.version = 0           # bumped whenever the index changes
+        self._listeners = []
+        self._lock = threading.RLock()
+        self._pending = []         # refs still waiting for their text to be indexed
+        self._worker = None
+        self._last = None          # (version, tokens, result) of the previous search
+
+        self.rebuild()
+        model.subscribe(self._on_model_change)
+
+    # ----------------- Listeners -----------------
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    # ----------------- Indexing -----------------
+    def rebuild(self):
+        with self._lock:
+            postings = {}
+            entry_tokens = {}
+            for entry in self.model.entries.values():
+                tokens = reference_tokens(entry.ref)
+                entry_tokens[entry.key] = sorted(tokens)
+                for token in tokens:
+                    postings.setdefault(token, set()).add(entry.key)
+            self.postings = postings
+            self.entry_tokens = entry_tokens
+            self.vocab = sorted(postings)
+            self.version += 1
+            self._pending = [entry.ref for entry in self.model.entries.values()]
+        self._start_worker()
+
+    def _add_tokens(self, key, tokens):
+        """Index extra tokens for a passage (caller holds the lock)."""
+        known = set(self.entry_tokens.get(key, ()))
+        new = tokens - known
+        if not new:
+            return
+        for token in new:
+            keys = self.postings.get(token)
+            if keys is None:
+                self.postings[token] = keys = set()
+                insort(self.vocab, token)
+            keys.add(key)
+        self.entry_tokens[key] = sorted(known | new)
+        self.version += 1
+
+    def _remove(self, key):
+        for token in self.entry_tokens.pop(key, ()):
+            keys = self.postings.get(token)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self.postings[token]
+                i = bisect_left(self.vocab, token)
+                if i < len(self.vocab) and self.vocab[i] == token:
+                    del self.vocab[i]
+        self.version += 1
+
+    def _on_model_change(self, event, entry, changes):
+        if event == "reset":
+            self.rebuild()
+        elif event == "added":
+            with self._lock:
+                self._add_tokens(entry.key, reference_tokens(entry.ref))
+                self._pending.append(entry.ref)
+            self._start_worker()
+        elif event == "removed":
+            with self._lock:
+                self._remove(entry.key)
+
+    def _start_worker(self):
+        with self._lock:
+            if self._worker is not None or not self._pending:
+                return
+            self._worker = threading.Thread(target=self._index_texts, daemon=True)
+            self._worker.start()
+
+    def _index_texts(self):
+        """Background: add the words of each pending passage to the index."""
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._worker = None
+                    break
+                ref = self._pending.pop()
+            try:
+                text = get_passage_text(ref, cache=False)
+            except Exception:
+                continue
+            tokens = set(TEXT_TOKEN.findall(text.lower()))
+            with self._lock:
+                key = passage_key(ref)
+                if key in self.entry_tokens:
+                    self._add_tokens(key, tokens)
+        for listener in list(self._listeners):
+            try:
+                listener()
+            except Exception:
+                pass
+
+    # ----------------- Searching -----------------
+    def _prefix_keys(self, prefix):
+        """Union of the postings of every token starting with `prefix`."""
+        keys = set()
+        i = bisect_left(self.vocab, prefix)
+        vocab = self.vocab
+        while i < len(vocab) and vocab[i].startswith(prefix):
+            keys |= self.postings[vocab[i]]
+            i += 1
+        return keys
+
+    def _entry_has_prefix(self, key, prefix):
+        tokens = self.entry_tokens.get(key, ())
+        i = bisect_left(tokens, prefix)
+        return i < len(tokens) and tokens[i].startswith(prefix)
+
+    def search(self, query):
+        """
+        Return the set of passage keys matching every token of `query`,
+        or None for an empty query (no filter).
+        """
+        tokens = query_tokens(query)
+        if not tokens:
+            return None
+
+        with self._lock:
+            last = self._last
+            if last is not None and last[0] == self.version and _extends(last[1], tokens):
+                # narrowing: only the previous matches can still match
+                result = {key for key in last[2]
+                          if all(self._entry_has_prefix(key, t) for t in tokens)}
+            else:
+                result = None
+                for token in sorted(set(tokens), key=len, reverse=True):
+                    keys = self._prefix_keys(token)
+                    result = keys if result is None else result & keys
+                    if not result:
+                        break
+            self._last = (self.version, tokens, result)
+            return result
+
+
+def _extends(old, new):
+    """True if query `new` can only match a subset of what `old` matched."""
+    if not old or len(new) < len(old):
+        return False
+    for o, n in zip(old, new):
+        if not n.startswith(o):
+            return False
+    return True
+
+
+_search = None
+_search_lock = threading.Lock()
+
+
+def get_sheath_search():
+    """Return the search index over the shared sheath model."""
+    global _search
+    with _search_lock:
+        if _search is None:
+            _search = SheathSearch(get_sheath_model())
+        return _search
@@ -0,0 +1,51 @@
+# scripts/startup_profile.py
+import time
+from contextlib import contextmanager
+
+REPORT_FILE = "startup_profile.txt"
+
+
+class StartupProfiler:
+    """
+    Wall-clock timer for startup phases (main.py --profile-startup).
+    Only uses the standard library so it can be imported before anything it measures.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.t0 = time.perf_counter()
+        self.phases = []  # (name, offset from t0, duration), in order of completion
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start - self.t0, time.perf_counter() - start))
+
+    def mark(self, name):
+        """Record a milestone (zero-length phase), e.g. "window shown"."""
+        if self.enabled:
+            self.phases.append((name, time.perf_counter() - self.t0, 0.0))
+
+    def report(self):
+        lines = ["Startup profile (ms)", f"{'phase':<40}{'at':>10}{'took':>10}"]
+        for name, offset, duration in self.phases:
+            lines.append(f"{name:<40}{offset * 1000:>10.1f}{duration * 1000:>10.1f}")
+        measured = sum(d for _, _, d in self.phases)
+        lines.append(f"{'total measured':<40}{'':>10}{measured * 1000:>10.1f}")
+        return "\n".join(lines)
+
+    def write_report(self, filename=REPORT_FILE):
+        text = self.report()
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(text)
+        print(f"Startup profile written to {filename}")
+
+
+profiler = StartupProfiler()
@@ -0,0 +1,168 @@
+# scripts/terminal_quiz.py
+"""
+Quiz in a terminal (no window, works over SSH):  python -m scripts.terminal_quiz [--count N]
+
+Shows a reference from the sheath, reads the recitation (finish with an empty
+line), grades it like QuizMenu and prints a colored word diff. Attempts go to
+the same history the app uses; AttemptHistory locks the log while appending or
+compacting, so this can run next to the app or the resident timer.
+
+Startup skips tkinter and pythonbible: references and passage text are kept
+in CACHE_FILE, and pythonbible is only imported to fill in passages that are
+not cached yet.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from scripts.grading import result_message, similarity, clean_text, word_diff
+from scripts.history import get_history
+from scripts.session_sampler import passage_weight
+from scripts.settings import get_settings
+from scripts.sheath import Sheath, row_key
+
+SHEATH_FILE = "resources/verses.csv"
+CACHE_FILE = "resources/terminal_cache.json"
+
+GREEN = "\033[32m"
+RED = "\033[31m"
+YELLOW = "\033[33m"
+STRIKE = "\033[9m"
+BOLD = "\033[1m"
+RESET = "\033[0m"
+
+
+# ----------------- Passage cache -----------------
+def load_cache(filename=CACHE_FILE):
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache, filename=CACHE_FILE):
+    tmp = filename + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(tmp, filename)
+
+
+def fill_cache(rows, cache):
+    """Add the label and text of every uncached row (imports pythonbible)."""
+    missing = [row for row in rows if row_key(row) not in cache]
+    if not missing:
+        return False
+    import pythonbible as bible
+    from scripts.passage_text import get_passage_text
+
+    for row in missing:
+        ref = bible.NormalizedReference(
+            bible.Book(row[0]), row[1], row[2], row[3], row[4],
+            bible.Book(row[5]) if isinstance(row[5], int) else None)
+        cache[row_key(row)] = {
+            "label": bible.format_scripture_references([ref]),
+            "text": get_passage_text(ref, cache=False),
+        }
+    return True
+
+
+# ----------------- Output -----------------
+def render_diff(ops, color=True):
+    """Attempt vs. passage: correct words plain, wrong/extra struck out in red, missed words in yellow."""
+    def paint(code, words):
+        text = " ".join(words)
+        return f"{code}{text}{RESET}" if color else text
+
+    parts = []
+    for op, canon, typed in ops:
+        if op == "equal":
+            parts.append(paint(GREEN, canon))
+        elif op == "insert":
+            parts.append(paint(RED + STRIKE, typed) if color else "{-" + " ".join(typed) + "-}")
+        elif op == "delete":
+            parts.append(paint(YELLOW, canon) if color else "{+" + " ".join(canon) + "+}")
+        else:
+            if color:
+                parts.append(paint(RED + STRIKE, typed) + " " + paint(YELLOW, canon))
+            else:
+                parts.append("{-" + " ".join(typed) + "-} {+" + " ".join(canon) + "+}")
+    return " ".join(parts)
+
+
+def read_attempt(prompt):
+    """Read lines until an empty line or end of input."""
+    print(prompt)
+    lines = []
+    for line in sys.stdin:
+        if not line.strip():
+            break
+        lines.append(line)
+    return " ".join(lines)
+
+
+def pick(rows, history, exclude=None):
+    """Weighted pick (stale, weak and favorite passages more often), like the app's session sampler."""
+    candidates = [row for row in rows if row_key(row) != exclude] or rows
+    now = time.time()
+    weights = [passage_weight(history.stats.get(row_key(row), {}), str(row[7]).strip() == "True", now)
+               for row in candidates]
+    return random.choices(candidates, weights)[0]
+
+
+def run(count, color):
+    rows = Sheath(SHEATH_FILE).getRows()
+    if not rows:
+        print("No verses found in the verses file.")
+        return 1
+    cache = load_cache()
+    history = get_history()
+    pass_score = get_settings().settings.pass_score
+
+    last = None
+    for n in range(count):
+        row = pick(rows, history, exclude=last)
+        key = last = row_key(row)
+        if key not in cache:
+            print("Loading passage text...")
+            if fill_cache(rows, cache):
+                save_cache(cache)
+        passage = cache[key]
+
+        title = f"{BOLD}{passage['label']}{RESET}" if color else passage["label"]
+        started = time.monotonic()
+        attempt = read_attempt(f"\nRecite {title} (empty line to submit):")
+        if not clean_text(attempt):
+            print("No attempt entered; stopping.")
+            break
+
+        percent = similarity(clean_text(passage["text"]), clean_text(attempt))
+        print(result_message(percent, pass_score))
+        print(render_diff(word_diff(passage["text"], attempt), color))
+        history.record(key, percent, time.monotonic() - started, "recite", pass_score, source="terminal")
+        # write it now (under the history lock) so a running app's next compaction folds it in
+        history.flush()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sword of the Spirit terminal quiz")
+    parser.add_argument("--count", type=int, default=1, help="passages to quiz (default 1)")
+    parser.add_argument("--no-color", action="store_true", help="plain text diff markers instead of colors")
+    args = parser.parse_args(argv)
+
+    color = not args.no_color and sys.stdout.isatty() and "NO_COLOR" not in os.environ
+    if color and os.name == "nt":
+        os.system("")  # enables ANSI escape codes in the Windows console
+    try:
+        return run(max(1, args.count), color)
+    except (KeyboardInterrupt, EOFError):
+        print()
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,11 @@ import json
 import os
 
 THEME_FILE = "resources/themes.json"
+DEFAULT_THEME = "MidnightIndigo"
+
+_themes = None        # parsed themes.json, loaded on first use
+_plans = {}           # theme name -> compiled style plan
+_applied = {}         # str(root) -> name of the theme currently applied to it
 
 def load_themes():
     if not os.path.exists(THEME_FILE):
@@ -11,108 +16,120 @@ def load_themes():
     with open(THEME_FILE, "r") as f:
         return json.load(f)
 
-themes = load_themes()
+def get_themes():
+    """Returns the themes dict, parsing themes.json the first time it is needed."""
+    global _themes
+    if _themes is None:
+        _themes = load_themes()
+    return _themes
+
+def theme_names():
+    return list(get_themes().keys())
+
+def compile_theme(theme_name):
+    """
+    Turns a theme into a cached plan: the root background plus the list of
+    (method, style, options) calls that apply it. Built once per theme.
+    """
+    if theme_name in _plans:
+        return _plans[theme_name]
+
+    themes = get_themes()
+    theme = themes.get(theme_name, themes[DEFAULT_THEME])
+    calls = [
+        # --- TFrame ---
+        ("configure", "TFrame", dict(
+            background=theme["frame_background"],
+            bordercolor=theme["frame_bordercolor"],
+            borderwidth=theme["frame_borderwidth"],
+            relief=theme["frame_relief"],
+            padding=theme["frame_padding"],
+        )),
+        # --- TLabel ---
+        ("configure", "TLabel", dict(
+            background=theme["label_background"],
+            foreground=theme["label_foreground"],
+            font=theme["label_font"],
+            anchor=theme["label_anchor"],
+            justify=theme["label_justify"],
+            padding=theme["label_padding"],
+        )),
+        # --- TButton ---
+        ("configure", "TButton", dict(
+            background=theme["button_background"],
+            foreground=theme["button_foreground"],
+            font=theme["button_font"],
+            relief=theme["button_relief"],
+            padding=theme["button_padding"],
+            lightcolor=theme["button_lightcolor"],
+            darkcolor=theme["button_darkcolor"],
+        )),
+        ("map", "TButton", dict(
+            background=[("active", theme["button_lightcolor"])],
+            foreground=[("active", theme["button_foreground"])],
+        )),
+        # --- TEntry ---
+        ("configure", "TEntry", dict(
+            fieldbackground=theme["entry_fieldbackground"],
+            foreground=theme["entry_foreground"],
+            background=theme["entry_background"],
+            bordercolor=theme["entry_bordercolor"],
+        )),
+        # --- TCheckbutton ---
+        ("configure", "TCheckbutton", dict(
+            background=theme["check_background"],
+            foreground=theme["check_foreground"],
+            font=theme["check_font"],
+        )),
+        # --- TCombobox ---
+        ("configure", "TCombobox", dict(
+            fieldbackground=theme["combo_fieldbackground"],
+            background=theme["combo_background"],
+            foreground=theme["combo_foreground"],
+        )),
+        # --- TScale ---
+        ("configure", "TScale", dict(
+            background=theme["scale_background"],
+            troughcolor=theme["scale_troughcolor"],
+        )),
+        # --- TSpinbox ---
+        ("configure", "TSpinbox", dict(
+            fieldbackground=theme["spin_fieldbackground"],
+            background=theme["spin_background"],
+            foreground=theme["spin_foreground"],
+        )),
+        # --- TNotebook ---
+        ("configure", "TNotebook", dict(
+            background=theme["note_background"],
+        )),
+        ("configure", "TNotebook.Tab", dict(
+            background=theme["note_tab_background"],
+            foreground=theme["note_tab_foreground"],
+        )),
+        ("map", "TNotebook.Tab", dict(
+            background=[("selected", theme["note_tab_active"])],
+            foreground=[("selected", theme["note_tab_foreground"])],
+        )),
+    ]
+    plan = (theme["bg"], calls)
+    _plans[theme_name] = plan
+    return plan
 
 def apply_theme(theme_name, root):
+    """Applies a theme to `root`; re-applying the theme already in use does nothing."""
+    if _applied.get(str(root)) == theme_name:
+        return
 
-    theme = themes.get(theme_name, themes["MidnightIndigo"])
+    bg, calls = compile_theme(theme_name)
 
-    style = ttk.Style()
-    style.theme_use("clam")  # ensures colors apply
+    style = ttk.Style(root)
+    if style.theme_use() != "clam":
+        style.theme_use("clam")  # ensures colors apply
 
     # --- Root background ---
-    root.configure(bg=theme["bg"])
-
-    # --- TFrame ---
-    style.configure(
-        "TFrame",
-        background=theme["frame_background"],
-        bordercolor=theme["frame_bordercolor"],
-        borderwidth=theme["frame_borderwidth"],
-        relief=theme["frame_relief"],
-        padding=theme["frame_padding"],
-    )
-
-    # --- TLabel ---
-    style.configure(
-        "TLabel",
-        background=theme["label_background"],
-        foreground=theme["label_foreground"],
-        font=theme["label_font"],
-        anchor=theme["label_anchor"],
-        justify=theme["label_justify"],
-        padding=theme["label_padding"],
-    )
-
-    # --- TButton ---
-    style.configure(
-        "TButton",
-        background=theme["button_background"],
-        foreground=theme["button_foreground"],
-        font=theme["button_font"],
-        relief=theme["button_relief"],
-        padding=theme["button_padding"],
-        lightcolor=theme["button_lightcolor"],
-        darkcolor=theme["button_darkcolor"],
-    )
-    style.map(
-        "TButton",
-        background=[("active", theme["button_lightcolor"])],
-        foreground=[("active", theme["button_foreground"])],
-    )
-
-    # --- TEntry ---
-    style.configure(
-        "TEntry",
-        fieldbackground=theme["entry_fieldbackground"],
-        foreground=theme["entry_foreground"],
-        background=theme["entry_background"],
-        bordercolor=theme["entry_bordercolor"],
-    )
-
-    # --- TCheckbutton ---
-    style.configure(
-        "TCheckbutton",
-        background=theme["check_background"],
-        foreground=theme["check_foreground"],
-        font=theme["check_font"],
-    )
-
-    # --- TCombobox ---
-    style.configure(
-        "TCombobox",
-        fieldbackground=theme["combo_fieldbackground"],
-        background=theme["combo_background"],
-        foreground=theme["combo_foreground"],
-    )
-
-    # --- TScale ---
-    style.configure(
-        "TScale",
-        background=theme["scale_background"],
-        troughcolor=theme["scale_troughcolor"],
-    )
+    root.configure(bg=bg)
 
-    # --- TSpinbox ---
-    style.configure(
-        "TSpinbox",
-        fieldbackground=theme["spin_fieldbackground"],
-        background=theme["spin_background"],
-        foreground=theme["spin_foreground"],
-    )
+    for method, style_name, options in calls:
+        getattr(style, method)(style_name, **options)
 
-    # --- TNotebook ---
-    style.configure(
-        "TNotebook",
-        background=theme["note_background"],
-    )
-    style.configure(
-        "TNotebook.Tab",
-        background=theme["note_tab_background"],
-        foreground=theme["note_tab_foreground"],
-    )
-    style.map(
-        "TNotebook.Tab",
-        background=[("selected", theme["note_tab_active"])],
-        foreground=[("selected", theme["note_tab_foreground"])],
-    )
+    _applied[str(root)] = theme_name
@@ -1,17 +1,82 @@
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import ttk, simpledialog, messagebox
 import pythonbible as bible
 import sys
+import threading
+from scripts.verse_index import lookup_references
 
 class MinSizeMixin:
     """
     Mixin to compute the requested size of a frame and set the toplevel minsize.
     This version attempts to include window decorations (title bar, icon, buttons, borders).
+    Decorations are measured once per toplevel, and requests made before the next
+    idle moment collapse into a single recalculation (the last frame asked wins).
     """
 
+    _decoration_cache = {}   # str(toplevel) -> (decoration_width, decoration_height)
+    _pending = {}            # str(toplevel) -> frame waiting for the idle recalculation
+
     def enforce_minsize(self):
-        """Instance method wrapper for the static helper."""
-        MinSizeMixin.enforce_minsize_for_frame(self)
+        """Queue a min-size recalculation for this frame's toplevel."""
+        MinSizeMixin.schedule_minsize_for_frame(self)
+
+    @staticmethod
+    def schedule_minsize_for_frame(frame):
+        """
+        Coalesce min-size updates into one after_idle callback per toplevel.
+        By the time it runs, Tk's own idle layout pass has updated the requested
+        sizes, so no synchronous update_idletasks() is needed.
+        """
+        try:
+            toplevel = frame.winfo_toplevel()
+        except Exception:
+            return
+        key = str(toplevel)
+        already_queued = key in MinSizeMixin._pending
+        MinSizeMixin._pending[key] = frame
+        if not already_queued:
+            toplevel.after_idle(MinSizeMixin._flush_minsize, key)
+
+    @staticmethod
+    def _flush_minsize(key):
+        frame = MinSizeMixin._pending.pop(key, None)
+        if frame is not None:
+            MinSizeMixin.enforce_minsize_for_frame(frame)
+
+    @staticmethod
+    def _get_decoration(frame):
+        """
+        Decoration size for the frame's toplevel. Cached once it can be trusted:
+        system metrics always, a measurement only when the window is mapped
+        (a withdrawn root reports frame-dependent sizes).
+        """
+        toplevel = frame.winfo_toplevel()
+        key = str(toplevel)
+        cached = MinSizeMixin._decoration_cache.get(key)
+        if cached:
+            return cached
+
+        # Try platform-specific decoration measurement
+        dec_w = dec_h = 0
+        if sys.platform.startswith("win"):
+            win_dec = MinSizeMixin._get_windows_decoration()
+            if win_dec:
+                dec_w, dec_h = win_dec
+        if dec_w == 0 and dec_h == 0:
+            # fallback measurement by difference; only meaningful once the window is on screen
+            dec_w, dec_h = MinSizeMixin._measure_decoration_by_difference(frame)
+            if not toplevel.winfo_ismapped():
+                return dec_w, dec_h
+
+        MinSizeMixin._decoration_cache[key] = (dec_w, dec_h)
+        # forget the measurement if a secondary window goes away (resident-mode quiz windows)
+        if toplevel.winfo_parent():
+            def forget(event):
+                if event.widget is toplevel:
+                    MinSizeMixin._decoration_cache.pop(key, None)
+            toplevel.bind("<Destroy>", forget, add="+")
+        return dec_w, dec_h
 
     @staticmethod
     def _get_windows_decoration():
@@ -89,29 +154,15 @@ class MinSizeMixin:
     def enforce_minsize_for_frame(frame):
         """
         Compute required size for `frame` and set the toplevel minsize including decorations.
-        Call after layout (update_idletasks) and after dynamic content changes.
+        Uses the current requested size; call after layout (e.g. via schedule_minsize_for_frame).
         """
-        try:
-            frame.update_idletasks()
-        except Exception:
-            pass
-
         try:
             req_w = frame.winfo_reqwidth()
             req_h = frame.winfo_reqheight()
+            dec_w, dec_h = MinSizeMixin._get_decoration(frame)
         except Exception:
             return
 
-        # Try platform-specific decoration measurement
-        dec_w = dec_h = 0
-        if sys.platform.startswith("win"):
-            win_dec = MinSizeMixin._get_windows_decoration()
-            if win_dec:
-                dec_w, dec_h = win_dec
-        if dec_w == 0 and dec_h == 0:
-            # fallback measurement by difference
-            dec_w, dec_h = MinSizeMixin._measure_decoration_by_difference(frame)
-
         # Add a small padding so icon/title/buttons don't clip
         pad_w, pad_h = 12, 8
 
@@ -126,6 +177,141 @@ class MinSizeMixin:
 
 
 
+class VirtualList(ttk.Frame):
+    """
+    Listbox look-alike that only renders the rows currently in view.
+    Rows are identified by index; `row_count()` gives the total and
+    `label_for(index)` is asked for a label only when that row scrolls into view,
+    so memory and redraw time depend on the viewport, not the number of rows.
+    Selection is single and tracked by absolute index. Emits <<ListboxSelect>>.
+    """
+
+    def __init__(self, parent, row_count, label_for, width=50, height=20, **listbox_options):
+        super().__init__(parent)
+        self.row_count = row_count
+        self.label_for = label_for
+        self.top = 0            # index of the first visible row
+        self.page = height      # rows that fit in the viewport
+        self.selected = None    # absolute index of the selected row
+
+        self.listbox = tk.Listbox(self, width=width, height=height, exportselection=False,
+                                  activestyle="none", **listbox_options)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.listbox.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.listbox.bind("<<ListboxSelect>>", self._on_click_select)
+        self.listbox.bind("<Configure>", self._on_resize)
+        self.listbox.bind("<MouseWheel>", self._on_wheel)
+        self.listbox.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll(3))
+        self.listbox.bind("<Up>", lambda e: self._move_selection(-1))
+        self.listbox.bind("<Down>", lambda e: self._move_selection(1))
+        self.listbox.bind("<Prior>", lambda e: self.scroll(-self.page) or "break")
+        self.listbox.bind("<Next>", lambda e: self.scroll(self.page) or "break")
+
+    # ----------------- Rendering -----------------
+    def _row_height(self):
+        font = tkfont.nametofont(self.listbox.cget("font"))
+        return font.metrics("linespace") + 1 + 2 * int(self.listbox.cget("selectborderwidth"))
+
+    def _on_resize(self, event):
+        page = max(1, event.height // self._row_height())
+        if page != self.page:
+            self.page = page
+            self.refresh()
+
+    def refresh(self):
+        """Redraw the visible rows (call after the underlying rows change)."""
+        total = self.row_count()
+        self.top = max(0, min(self.top, total - self.page))
+        end = min(total, self.top + self.page)
+        self.listbox.delete(0, tk.END)
+        if end > self.top:
+            self.listbox.insert(tk.END, *(self.label_for(i) for i in range(self.top, end)))
+        if self.selected is not None and self.top <= self.selected < end:
+            self.listbox.selection_set(self.selected - self.top)
+        if total:
+            self.scrollbar.set(self.top / total, end / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def reset(self):
+        """Forget scroll position and selection, then redraw."""
+        self.top = 0
+        self.selected = None
+        self.refresh()
+
+    # ----------------- Row changes -----------------
+    def row_inserted(self, index):
+        """A row was inserted at `index`; keep the selection on the same item."""
+        if self.selected is not None and index <= self.selected:
+            self.selected += 1
+        self.refresh()
+
+    def row_deleted(self, index):
+        """The row at `index` was deleted; a deleted selection is cleared."""
+        if self.selected is not None:
+            if index == self.selected:
+                self.selected = None
+            elif index < self.selected:
+                self.selected -= 1
+        self.refresh()
+
+    # ----------------- Scrolling -----------------
+    def scroll(self, rows):
+        self.top += rows
+        self.refresh()
+
+    def see(self, index):
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + self.page:
+            self.top = index - self.page + 1
+        self.refresh()
+
+    def _on_scrollbar(self, *args):
+        total = self.row_count()
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            self.top += amount * self.page if args[2] == "pages" else amount
+        self.refresh()
+
+    def _on_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    # ----------------- Selection (Listbox-compatible) -----------------
+    def curselection(self):
+        return () if self.selected is None else (self.selected,)
+
+    def selection_set(self, index):
+        self.selected = index
+        self.refresh()
+
+    def selection_clear(self, first=0, last=None):
+        if self.selected is not None:
+            self.selected = None
+            self.listbox.selection_clear(0, tk.END)
+
+    def _on_click_select(self, event):
+        sel = self.listbox.curselection()
+        self.selected = self.top + sel[0] if sel else None
+        self.event_generate("<<ListboxSelect>>")
+
+    def _move_selection(self, delta):
+        total = self.row_count()
+        if not total:
+            return "break"
+        current = self.selected if self.selected is not None else self.top - delta
+        self.selected = max(0, min(total - 1, current + delta))
+        self.see(self.selected)
+        self.event_generate("<<ListboxSelect>>")
+        return "break"
+
+
 class AddVerseDialog(tk.Toplevel):
     def __init__(self, parent, theme=None, apply_theme_fn=None, initial_ref=None):
         super().__init__(parent)
@@ -300,3 +486,114 @@ class AddVerseDialog(tk.Toplevel):
     def on_cancel(self):
         self.result = None
         self.destroy()
+
+
+class FindReferenceDialog(tk.Toplevel):
+    """
+    "Where is this from?" lookup: type some remembered words and pick the
+    matching verse. `result` is the chosen NormalizedReference (or None).
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.withdraw()
+        self.parent = parent
+        self.result = None
+        self._matches = []
+        self._search_id = 0
+
+        self.title("Where is this from?")
+
+        frm = ttk.Frame(self, padding=12)
+        frm.pack(fill="both", expand=True)
+
+        ttk.Label(frm, text="Type the words you remember:").pack(anchor="w")
+        self.query_text = tk.Text(frm, height=3, width=60, wrap="word")
+        self.query_text.pack(fill="x", pady=4)
+        self.query_text.bind("<Return>", self._on_return)
+
+        ttk.Button(frm, text="Search", command=self.on_search).pack(pady=4)
+
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(frm, textvariable=self.status_var).pack(anchor="w")
+
+        self.results_list = tk.Listbox(frm, width=80, height=10, exportselection=False)
+        self.results_list.pack(fill="both", expand=True, pady=4)
+        self.results_list.bind("<Double-Button-1>", lambda e: self.on_ok())
+
+        btn_frame = ttk.Frame(frm)
+        btn_frame.pack(pady=(10, 0))
+        ttk.Button(btn_frame, text="Add to Sheath", command=self.on_ok).pack(side="left", padx=6)
+        ttk.Button(btn_frame, text="Close", command=self.on_cancel).pack(side="left", padx=6)
+
+        self.bind("<Escape>", lambda e: self.on_cancel())
+
+        try:
+            self.transient(parent)
+            self.grab_set()
+        except Exception:
+            pass
+
+        self.update_idletasks()
+        w = self.winfo_reqwidth()
+        h = self.winfo_reqheight()
+        x = (self.winfo_screenwidth() - w) // 2
+        y = (self.winfo_screenheight() - h) // 2
+        self.geometry(f"{w}x{h}+{x}+{y}")
+        self.deiconify()
+        self.lift()
+        self.query_text.focus_set()
+        self.wait_window(self)
+
+    def _on_return(self, event):
+        # Enter searches instead of inserting a newline
+        self.on_search()
+        return "break"
+
+    def on_search(self):
+        query = self.query_text.get("1.0", "end-1c").strip()
+        if not query:
+            return
+        self._search_id += 1
+        search_id = self._search_id
+        # the first search may have to build the index, so keep it off the UI thread
+        self.status_var.set("Searching (the first search builds the verse index)...")
+
+        def worker():
+            try:
+                matches = lookup_references(query)
+            except Exception:
+                matches = []
+
+            def update_ui():
+                if search_id != self._search_id or not self.winfo_exists():
+                    return
+                self._show_matches(matches)
+            try:
+                self.after(0, update_ui)
+            except Exception:
+                pass
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _show_matches(self, matches):
+        self._matches = matches
+        self.results_list.delete(0, tk.END)
+        for ref, text in matches:
+            label = f"{ref.book.title} {ref.start_chapter}:{ref.start_verse} - {text}"
+            self.results_list.insert(tk.END, label)
+        self.status_var.set(f"{len(matches)} match(es)" if matches else "No matches found.")
+        if matches:
+            self.results_list.selection_set(0)
+
+    def on_ok(self):
+        sel = self.results_list.curselection()
+        if not sel:
+            messagebox.showwarning("No selection", "Search and select a verse first.", parent=self)
+            return
+        self.result = self._matches[sel[0]][0]
+        self.destroy()
+
+    def on_cancel(self):
+        self.result = None
+        self.destroy()
@@ -0,0 +1,239 @@
+# scripts/verse_index.py
+import os
+import pickle
+import re
+import threading
+from array import array
+from bisect import bisect_left
+
+import pythonbible as bible
+from pythonbible import get_verse_text
+from pythonbible.verses import VERSE_IDS
+
+INDEX_FILE = "resources/verse_index.pickle"
+INDEX_FORMAT = 1
+
+# Words this common show up in thousands of verses; they are still used for
+# exact intersections but skipped when ranking fuzzy (near-miss) lookups.
+COMMON_WORD_LIMIT = 4000
+# Lookups stop checking candidates for an exact phrase after this many
+# (common phrases such as "and the" match thousands of verses)
+MAX_SCAN = 1000
+
+
+def _words(s):
+    """Lowercase words with punctuation removed (same rules as the quiz grader)."""
+    if not s:
+        return []
+    s = re.sub(r"[^\w\s]", "", s)
+    return s.lower().split()
+
+
+def _contains(postings, value):
+    """Binary search for `value` in a sorted posting array."""
+    i = bisect_left(postings, value)
+    return i < len(postings) and postings[i] == value
+
+
+class VerseIndex:
+    """
+    Inverted word -> verse index over the whole translation.
+    Verses are stored by position (0..n-1 in canonical order) so posting lists
+    stay sorted and compact as array('I').
+    """
+
+    def __init__(self, verse_ids, texts, postings):
+        self.verse_ids = verse_ids    # array('I') of pythonbible verse ids
+        self.texts = texts            # cleaned verse text, aligned with verse_ids
+        self.postings = postings      # word -> sorted array('I') of positions
+
+    @classmethod
+    def build(cls):
+        """Walk every verse in the translation and index its words."""
+        verse_ids = array("I")
+        texts = []
+        postings = {}
+        for vid in VERSE_IDS:
+            try:
+                text = get_verse_text(vid)
+            except Exception:
+                # some translations skip verses (e.g. textual variants)
+                continue
+            words = _words(text)
+            pos = len(verse_ids)
+            verse_ids.append(vid)
+            texts.append(" ".join(words))
+            for word in set(words):
+                postings.setdefault(word, array("I")).append(pos)
+        return cls(verse_ids, texts, postings)
+
+    @classmethod
+    def load(cls, filename=INDEX_FILE):
+        """Return the cached index, or None if it is missing or stale."""
+        try:
+            with open(filename, "rb") as f:
+                data = pickle.load(f)
+        except Exception:
+            return None
+        if data.get("format") != INDEX_FORMAT or data.get("bible") != bible.__version__:
+            return None
+        return cls(data["verse_ids"], data["texts"], data["postings"])
+
+    def save(self, filename=INDEX_FILE):
+        data = {
+            "format": INDEX_FORMAT,
+            "bible": bible.__version__,
+            "verse_ids": self.verse_ids,
+            "texts": self.texts,
+            "postings": self.postings,
+        }
+        # write to a temp file first so a crash never leaves a half-written cache
+        tmp = filename + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, filename)
+
+    def _intersect(self, words):
+        """Positions containing every word (lazily), intersecting from the rarest list."""
+        lists = [self.postings.get(w) for w in words]
+        if not all(lists):
+            return iter(())
+        lists.sort(key=len)
+        rarest, rest = lists[0], lists[1:]
+        return (p for p in rarest if all(_contains(l, p) for l in rest))
+
+    def _rank(self, words, limit):
+        """Fallback for typos/paraphrases: rank verses by how many words they share."""
+        terms = [w for w in words if w in self.postings]
+        rare = [w for w in terms if len(self.postings[w]) <= COMMON_WORD_LIMIT]
+        counts = {}
+        for w in (rare or terms):
+            for p in self.postings[w]:
+                counts[p] = counts.get(p, 0) + 1
+        if not counts:
+            return []
+        best = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [p for p, _ in best[:limit]]
+
+    def passage_text(self, ref):
+        """Cleaned text of every verse in `ref` (multi-chapter ranges included)."""
+        words = []
+        for vid in bible.convert_reference_to_verse_ids(ref):
+            pos = bisect_left(self.verse_ids, vid)
+            if pos < len(self.verse_ids) and self.verse_ids[pos] == vid:
+                words.append(self.texts[pos])
+        return " ".join(words)
+
+    def lookup(self, text, limit=10):
+        """
+        Return up to `limit` verse ids that best match the typed text.
+        Exact phrase matches come first, then verses containing all the words,
+        then verses sharing the most (uncommon) words.
+        """
+        words = _words(text)
+        if not words:
+            return []
+        unique = list(dict.fromkeys(words))
+
+        phrase = " " + " ".join(words) + " "
+        exact, partial = [], []
+        scanned = 0
+        for p in self._intersect(unique):
+            if phrase in " " + self.texts[p] + " ":
+                exact.append(p)
+                if len(exact) >= limit:
+                    break
+            elif len(partial) < limit:
+                partial.append(p)
+            scanned += 1
+            if scanned >= MAX_SCAN:
+                break
+        if exact or partial:
+            ordered = exact + partial
+        else:
+            ordered = self._rank(unique, limit)
+        return [self.verse_ids[p] for p in ordered[:limit]]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """
+    Return the shared VerseIndex, loading it from disk or building (and caching)
+    it on first use. Building walks the whole translation, so call this off the
+    Tk main thread.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = VerseIndex.load()
+            if _index is None:
+                _index = VerseIndex.build()
+                try:
+                    _index.save()
+                except Exception:
+                    pass
+        return _index
+
+
+def lookup_references(text, limit=10):
+    """Return (NormalizedReference, verse text) pairs for the typed text."""
+    results = []
+    for vid in get_index().lookup(text, limit):
+        book, chapter, verse = bible.get_book_chapter_verse(vid)
+        ref = bible.NormalizedReference(book, chapter, verse, chapter, verse, None)
+        try:
+            results.append((ref, get_verse_text(vid)))
+        except Exception:
+            results.append((ref, ""))
+    return results
+
+
+def grade_reference(answer, ref):
+    """
+    Score a typed reference against the quizzed passage.
+    Returns (percent, message). Near misses get partial credit:
+    overlapping ranges, then the right chapter with a neighboring verse,
+    then the right chapter, then the right book.
+    """
+    try:
+        guesses = bible.get_references(answer or "")
+    except Exception:
+        guesses = []
+    if not guesses:
+        return 0, "Could not read a reference from your answer (try e.g. \"John 3:16\")."
+
+    target = set(bible.convert_reference_to_verse_ids(ref))
+    best = (0, "Wrong book.")
+    for guess in guesses:
+        try:
+            guessed = set(bible.convert_reference_to_verse_ids(guess))
+        except Exception:
+            continue
+        if guessed == target:
+            return 100, "Exactly right!"
+        if guess.book != ref.book:
+            continue
+        if guessed & target:
+            # scored by overlap, floored at the chapter/book tier, so naming just
+            # the book or chapter (which "overlaps" everything in it) can't pass
+            overlap = len(guessed & target) / len(guessed | target)
+            if guess.start_chapter < ref.start_chapter or (guess.end_chapter or guess.start_chapter) > ref.end_chapter:
+                floor = (25, "Right book; name the chapter and verse.")
+            else:
+                floor = (50, "Right chapter; name the verse(s).")
+            score = max((int(100 * overlap), "Close: your range overlaps the passage."), floor,
+                        key=lambda s: s[0])
+        elif guess.start_chapter in range(ref.start_chapter, ref.end_chapter + 1):
+            # ranges are disjoint here, so compare the nearest ends of each
+            distance = min(abs(min(guessed) - max(target)), abs(max(guessed) - min(target)))
+            if distance <= 2:
+                score = (90 - 10 * distance, "Almost: right chapter, neighboring verse.")
+            else:
+                score = (50, "Right chapter, wrong verse.")
+        else:
+            score = (25, "Right book, wrong chapter.")
+        best = max(best, score, key=lambda s: s[0])
+    return best
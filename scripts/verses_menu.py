@@ -1,21 +1,41 @@
 import threading
 import tkinter as tk
-from tkinter import ttk, simpledialog, messagebox
-from scripts.theme_manager import themes, apply_theme
-from scripts.sheath import Sheath
-from scripts.ui_common import AddVerseDialog, MinSizeMixin
-import pythonbible as bible
-from pythonbible import InvalidVerseError, get_verse_id, get_verse_text
-import json
+from bisect import bisect_left
+from tkinter import ttk, messagebox
+from scripts.sheath_model import get_sheath_model
+from scripts.sheath_search import get_sheath_search
+from scripts.ui_common import AddVerseDialog, FindReferenceDialog, MinSizeMixin, VirtualList
+from scripts.history import get_history
+from scripts.grading import build_word_list, tokenize_for_diff
+from scripts.passage_text import get_passage_text
+from scripts.sheath import passage_key
+from scripts.word_errors import get_word_errors
+
+# Preview backgrounds for heat levels 1..4 (words missed in a growing share of attempts)
+HEAT_COLORS = ("#fff3b0", "#ffd27f", "#ff9f6b", "#ff6b6b")
+
 
 class VersesMenu(ttk.Frame, MinSizeMixin):
     def __init__(self, parent, controller):
         super().__init__(parent)
 
-        self.sheath = Sheath("resources/verses.csv")
+        # Shared in-memory sheath; its change events patch the listboxes row by row
+        self.model = get_sheath_model()
+        self.sheath = self.model.sheath
+        # Search index over the sheath (subscribed to the model before this view)
+        self.search = get_sheath_search()
+        self._matches = None  # passage keys passing the search filter, None = show all
 
         ttk.Label(self, text="Verses", font=("Arial", 30)).pack(pady=10)
 
+        # Search box: filters both lists by book, reference or passage words as you type
+        search_frame = ttk.Frame(self)
+        search_frame.pack(fill="x", padx=20)
+        ttk.Label(search_frame, text="Search:").pack(side="left")
+        self.search_var = tk.StringVar(value="")
+        ttk.Entry(search_frame, textvariable=self.search_var).pack(side="left", fill="x", expand=True, padx=5)
+        self.search_var.trace_add("write", lambda *args: self.apply_filter())
+
         # Main container for two lists + move buttons
         main_frame = ttk.Frame(self)
         main_frame.pack(fill="both", expand=True, padx=20, pady=10)
@@ -25,11 +45,10 @@ class VersesMenu(ttk.Frame, MinSizeMixin):
         wip_frame.pack(side="left", fill="both", expand=True)
 
         ttk.Label(wip_frame, text="Works in Progress").pack()
-        self.wip_list = tk.Listbox(wip_frame, width=50, height=20, exportselection=False)
-        wip_scroll = ttk.Scrollbar(wip_frame, orient="vertical", command=self.wip_list.yview)
-        self.wip_list.config(yscrollcommand=wip_scroll.set)
-        self.wip_list.pack(side="left", fill="both", expand=True)
-        wip_scroll.pack(side="right", fill="y")
+        # Virtual lists only build labels for the rows in view, so large sheaths stay fast
+        self.wip_list = VirtualList(wip_frame, lambda: len(self.wip_entries),
+                                    lambda i: self._label(self.wip_entries[i]))
+        self.wip_list.pack(fill="both", expand=True)
 
         # Middle buttons
         btn_frame = ttk.Frame(main_frame)
@@ -43,15 +62,13 @@ class VersesMenu(ttk.Frame, MinSizeMixin):
         mem_frame.pack(side="left", fill="both", expand=True)
 
         ttk.Label(mem_frame, text="Memorized").pack()
-        self.mem_list = tk.Listbox(mem_frame, width=50, height=20, exportselection=False)
-        mem_scroll = ttk.Scrollbar(mem_frame, orient="vertical", command=self.mem_list.yview)
-        self.mem_list.config(yscrollcommand=mem_scroll.set)
-        self.mem_list.pack(side="left", fill="both", expand=True)
-        mem_scroll.pack(side="right", fill="y")
+        self.mem_list = VirtualList(mem_frame, lambda: len(self.mem_entries),
+                                    lambda i: self._label(self.mem_entries[i]))
+        self.mem_list.pack(fill="both", expand=True)
 
         try:
-            self.wip_list.config(selectbackground="#4a90e2", selectforeground="#ffffff")
-            self.mem_list.config(selectbackground="#4a90e2", selectforeground="#ffffff")
+            self.wip_list.listbox.config(selectbackground="#4a90e2", selectforeground="#ffffff")
+            self.mem_list.listbox.config(selectbackground="#4a90e2", selectforeground="#ffffff")
         except Exception:
             pass
 
@@ -60,6 +77,27 @@ class VersesMenu(ttk.Frame, MinSizeMixin):
         self.verse_display.pack(fill="x", padx=20, pady=10)
         self.verse_display.bind("<Key>", self._preview_key_handler)
 
+        # Weak-word heatmap over the preview, from the per-word error counters
+        self.word_errors = get_word_errors()
+        self.heatmap_var = tk.BooleanVar(value=True)
+        self._configure_heat_tags()
+
+        # Attempt statistics for the selected passage (read from the history aggregates)
+        self.history = get_history()
+        self.stats_var = tk.StringVar(value="")
+        stats_frame = ttk.Frame(self)
+        stats_frame.pack(fill="x", padx=20)
+        ttk.Label(stats_frame, textvariable=self.stats_var).pack(side="left")
+        ttk.Checkbutton(stats_frame, text="Highlight weak words", variable=self.heatmap_var,
+                        command=self._configure_heat_tags).pack(side="right")
+
+        # Row maps: each list shows its entries in file order. `*_seqs` holds the
+        # entries' file-order numbers so a row is found with a binary search.
+        self.wip_entries = []
+        self.wip_seqs = []
+        self.mem_entries = []
+        self.mem_seqs = []
+
         # Bind selection events (selection pins preview)
         self.wip_list.bind("<<ListboxSelect>>", self._on_listbox_select)
         self.mem_list.bind("<<ListboxSelect>>", self._on_listbox_select)
@@ -72,17 +110,16 @@ class VersesMenu(ttk.Frame, MinSizeMixin):
         ttk.Button(action_frame, text="Edit Selected", command=self.edit_selected).pack(side="left", padx=5)
         ttk.Button(action_frame, text="Remove Selected", command=self.remove_selected).pack(side="left", padx=5)
         ttk.Button(action_frame, text="Toggle Favorite", command=self.toggle_favorite).pack(side="left", padx=5)
+        ttk.Button(action_frame, text="Where is this from?", command=self.find_reference).pack(side="left", padx=5)
 
         ttk.Button(action_frame, text="Back to Main Menu",
                    command=lambda: controller.show_frame("MainMenu")).pack(side="left", padx=5)
 
-        # Internal maps
-        self.passages = []        # full list from sheath.getPassages()
-        self.wip_indices = []     # indices into self.passages that are WIP
-        self.mem_indices = []     # indices into self.passages that are Memorized
-
         # Load verses into lists
         self.load_verses()
+        self.model.subscribe(self._on_model_change)
+        # passage words are indexed in the background; re-run the filter when they land
+        self.search.subscribe(lambda: self.after(0, self._on_index_updated))
         self.enforce_minsize()
 
     # ----------------- Loading / formatting -----------------
@@ -100,59 +137,133 @@ class VersesMenu(ttk.Frame, MinSizeMixin):
             label = "⭐ " + label
         return label
 
-    def load_verses(self):
-        """Load passages from sheath and populate both listboxes and index maps."""
-        self.wip_list.delete(0, tk.END)
-        self.mem_list.delete(0, tk.END)
-
-        # reset maps
-        self.passages = []
-        self.wip_indices = []
-        self.mem_indices = []
+    def _label(self, entry):
+        return self.format_range_label(entry.ref, entry.favorite)
 
-        try:
-            # canonical list of NormalizedReference objects
-            self.passages = self.sheath.getPassages()
-
-            # read CSV metadata (WIP and Favorite flags) in file order
-            metadata = []
-            with open(self.sheath.filename, "r", encoding="utf-8") as f:
-                rows = [r.rstrip("\n") for r in f.readlines()]
-            if rows and rows[0].lower().startswith("book,"):
-                rows = rows[1:]
-
-            for row in rows:
-                parts = row.split(",")
-                while len(parts) < 8:
-                    parts.append("")
-                wip_flag = parts[6].strip() if len(parts) > 6 else "0"
-                fav_flag = parts[7].strip() if len(parts) > 7 else "False"
-                metadata.append((wip_flag, fav_flag == "True"))
-
-            # iterate passages and metadata in parallel (file order)
-            for idx, ref in enumerate(self.passages):
-                wip_flag, is_fav = metadata[idx] if idx < len(metadata) else ("0", False)
-                label = self.format_range_label(ref, is_fav)
-                if wip_flag == "0" or wip_flag == "":
-                    self.wip_indices.append(idx)
-                    self.wip_list.insert(tk.END, label)
-                else:
-                    self.mem_indices.append(idx)
-                    self.mem_list.insert(tk.END, label)
-        except Exception as e:
-            self.wip_list.insert(tk.END, f"Error loading verses: {e}")
+    def load_verses(self):
+        """Rebuild both row maps from the sheath model; the lists draw only what is in view."""
+        self.wip_entries, self.wip_seqs = [], []
+        self.mem_entries, self.mem_seqs = [], []
+
+        for entry in self.model.entries.values():
+            if not self._visible(entry):
+                continue
+            _, entries, seqs = self._rows_for(entry.memorized)
+            entries.append(entry)
+            seqs.append(entry.seq)
+        self.wip_list.reset()
+        self.mem_list.reset()
+
+    # ----------------- Search filter -----------------
+    def _visible(self, entry):
+        return self._matches is None or entry.key in self._matches
+
+    def apply_filter(self):
+        """Filter both lists to the passages matching the search box, keeping the selection."""
+        selected = self.get_selected_entry()
+        self._matches = self.search.search(self.search_var.get())
+        self.load_verses()
+        if selected is not None:
+            listbox, row = self._find_row(selected)
+            if row is not None:
+                listbox.selection_set(row)
+                listbox.see(row)
+            else:
+                self.on_selection_change()
+
+    def _on_index_updated(self):
+        if self._matches is not None:
+            self.apply_filter()
+
+    # ----------------- Incremental updates -----------------
+    def _rows_for(self, memorized):
+        """Return (list widget, entries, seqs) for the Memorized or WIP list."""
+        if memorized:
+            return self.mem_list, self.mem_entries, self.mem_seqs
+        return self.wip_list, self.wip_entries, self.wip_seqs
+
+    def _find_row(self, entry, memorized=None):
+        """Return (list widget, row) where the entry is shown, or (list widget, None)."""
+        memorized = entry.memorized if memorized is None else memorized
+        listbox, entries, seqs = self._rows_for(memorized)
+        row = bisect_left(seqs, entry.seq)
+        if row < len(seqs) and seqs[row] == entry.seq:
+            return listbox, row
+        return listbox, None
+
+    def _insert_row(self, entry):
+        if not self._visible(entry):
+            return
+        listbox, entries, seqs = self._rows_for(entry.memorized)
+        row = bisect_left(seqs, entry.seq)
+        seqs.insert(row, entry.seq)
+        entries.insert(row, entry)
+        listbox.row_inserted(row)
+
+    def _delete_row(self, entry, memorized):
+        listbox, row = self._find_row(entry, memorized)
+        if row is None:
+            return
+        _, entries, seqs = self._rows_for(memorized)
+        del seqs[row]
+        del entries[row]
+        listbox.row_deleted(row)
+
+    def _on_model_change(self, event, entry, changes):
+        """Patch only the rows affected by a sheath change."""
+        if event == "reset":
+            self.load_verses()
+        elif event == "error" and changes.get("op") == "load":
+            # reading the file failed; retrying would just fail again, so only report it
+            messagebox.showerror("Error", f"Could not read verses: {changes['error']}")
+        elif event == "error":
+            # a background write failed; show it and re-read the file so the lists match the disk
+            messagebox.showerror("Error", f"Could not save verses: {changes['error']}")
+            self.model.load_async()
+        elif event == "added":
+            self._insert_row(entry)
+        elif event == "removed":
+            self._delete_row(entry, entry.memorized)
+        elif event == "changed":
+            was_memorized = bool(changes.get("status", entry.status))
+            if was_memorized != entry.memorized:
+                # moved between lists
+                self._delete_row(entry, was_memorized)
+                self._insert_row(entry)
+            else:
+                # relabel in place (only redraws if the row is in view)
+                listbox, row = self._find_row(entry)
+                if row is not None:
+                    listbox.refresh()
+
+    def _select_entry(self, entry):
+        """Select the entry's row (clearing the other list) and refresh the preview."""
+        self.wip_list.selection_clear(0, tk.END)
+        self.mem_list.selection_clear(0, tk.END)
+        if entry is not None:
+            if not self._visible(entry):
+                # the search would hide it; clear the search so it can be shown
+                self.search_var.set("")
+            listbox, row = self._find_row(entry)
+            if row is not None:
+                listbox.selection_set(row)
+                listbox.see(row)
+        self.on_selection_change()
 
     # ----------------- Selection mapping -----------------
-    def get_selected_ref(self):
-        """Return the currently selected reference from either list (or None)."""
+    def get_selected_entry(self):
+        """Return the SheathEntry selected in either list (or None)."""
         if self.wip_list.curselection():
-            sel = self.wip_list.curselection()[0]
-            return self.passages[self.wip_indices[sel]]
+            return self.wip_entries[self.wip_list.curselection()[0]]
         if self.mem_list.curselection():
-            sel = self.mem_list.curselection()[0]
-            return self.passages[self.mem_indices[sel]]
+            return self.mem_entries[self.mem_list.curselection()[0]]
         return None
 
+    def get_selected_ref(self):
+        """Return the currently selected reference from either list (or None)."""
+        entry = self.get_selected_entry()
+        return entry.ref if entry is not None else None
+
     # ----------------- Selection-driven preview -----------------
     def _on_listbox_select(self, event):
         """Clear selection in the other list and update the preview."""
@@ -174,60 +285,39 @@ class VersesMenu(ttk.Frame, MinSizeMixin):
         ref = self.get_selected_ref()
         if ref:
             self._fetch_and_show_full_range(ref)
+            self._show_stats(ref)
         else:
             # clear preview if nothing selected
             self.verse_display.config(state="normal")
             self.verse_display.delete("1.0", tk.END)
+            self.stats_var.set("")
+
+    def _show_stats(self, ref):
+        stats = self.history.get_stats(ref)
+        if not stats["count"]:
+            self.stats_var.set("Not quizzed yet.")
+            return
+        self.stats_var.set(
+            f"Attempts: {stats['count']}   Average: {stats['mean']:.0f}%   "
+            f"Last: {stats['last']}%   Best: {stats['best']}%   Passing streak: {stats['streak']}"
+        )
 
     def _fetch_and_show_full_range(self, ref):
-        """Background fetch of the full range text (concatenated) and update preview."""
+        """Background fetch of the full range text (shared passage cache) and update preview."""
         def fetch_and_show():
             try:
-                verse_texts = []
-                start_ch = ref.start_chapter
-                end_ch = ref.end_chapter or start_ch
-
-                for ch in range(start_ch, end_ch + 1):
-                    if ch == ref.start_chapter:
-                        v_start = ref.start_verse
-                    else:
-                        v_start = 1
-
-                    if ch == ref.end_chapter:
-                        v_end_target = ref.end_verse
-                    else:
-                        v_end_target = None
-
-                    v = v_start
-                    while True:
-                        try:
-                            vid = get_verse_id(ref.book, ch, v)
-                        except InvalidVerseError:
-                            break
-                        except Exception:
-                            break
-
-                        try:
-                            vtext = get_verse_text(vid)
-                        except Exception:
-                            vtext = None
-
-                        if vtext:
-                            verse_texts.append(vtext.strip())
-
-                        if v_end_target is not None and v >= v_end_target:
-                            break
-                        v += 1
-
-                display_text = " ".join(verse_texts).replace("\n", " ").strip()
-                if not display_text:
-                    display_text = "(no text available)"
+                # the shared passage text is what QuizMenu grades, so heatmap word indices line up
+                display_text = get_passage_text(ref).replace("\n", " ").strip()
+                if display_text:
+                    segments = self._heat_segments(ref, display_text)
+                else:
+                    segments = ["(no text available)"]
 
                 def update_ui():
                     # keep Text widget editable only for selection/copy; block typing via key binding
                     self.verse_display.config(state="normal")
                     self.verse_display.delete("1.0", tk.END)
-                    self.verse_display.insert(tk.END, display_text)
+                    self.verse_display.insert(tk.END, *segments)
                     # do not disable; allow selection and copy
                 self.after(0, update_ui)
             except Exception:
@@ -236,6 +326,36 @@ class VersesMenu(ttk.Frame, MinSizeMixin):
         t = threading.Thread(target=fetch_and_show, daemon=True)
         t.start()
 
+    def _heat_segments(self, ref, text):
+        """
+        Preview text as Text.insert arguments (text, tags, text, tags, ...), each word
+        tagged with its heat level. Counters are per passage word, so nothing is re-diffed.
+        """
+        levels = self.word_errors.heat_levels(passage_key(ref))
+        if not levels:
+            return [text]
+        tokens = tokenize_for_diff(text)
+        tags = [""] * len(tokens)
+        for word_index, token_index in enumerate(build_word_list(tokens)[1]):
+            if word_index < len(levels) and levels[word_index]:
+                tags[token_index] = f"heat{levels[word_index]}"
+        # merge runs with the same tag so the insert stays short
+        args = []
+        run_start = 0
+        for i in range(1, len(tokens) + 1):
+            if i == len(tokens) or tags[i] != tags[run_start]:
+                args.append("".join(tokens[run_start:i]))
+                args.append(tags[run_start] or ())
+                run_start = i
+        return args
+
+    def _configure_heat_tags(self):
+        """Show or hide the heatmap; only the tag colors change, the text is left alone."""
+        show = self.heatmap_var.get()
+        for level, color in enumerate(HEAT_COLORS, 1):
+            self.verse_display.tag_configure(f"heat{level}", background=color if show else "",
+                                             foreground="black" if show else "")
+
     def _preview_key_handler(self, event):
         """
         Allow Ctrl+A / Cmd+A and Ctrl+C / Cmd+C for selection and copy.
@@ -262,8 +382,7 @@ class VersesMenu(ttk.Frame, MinSizeMixin):
         """
         Open AddVerseDialog and add the returned NormalizedReference.
         Place the new passage in the same list as the current selection:
-        - if a Memorized item is selected -> setMemStatus([ref], [1])
-        - otherwise -> setMemStatus([ref], [0]) (WIP)
+        Memorized if a Memorized item is selected, otherwise WIP.
         """
         dialog = AddVerseDialog(self)
         ref = dialog.result
@@ -271,207 +390,52 @@ class VersesMenu(ttk.Frame, MinSizeMixin):
             return
 
         try:
-            # Add the passage first (sheath may append it)
-            self.sheath.addPassages([ref])
-            # Determine target mem status based on current selection
-            # If a memorized item is selected, put new passage in Memorized
-            if self.mem_list.curselection():
-                self.sheath.setMemStatus([ref], [1])
-            else:
-                # default to WIP if WIP selected or nothing selected
-                self.sheath.setMemStatus([ref], [0])
-
-            # Reload lists and try to select the newly added passage
-            self.load_verses()
-
-            # Re-select the newly added passage if found
-            try:
-                new_idx = self.passages.index(ref)
-                if new_idx in self.wip_indices:
-                    listbox = self.wip_list
-                    list_index = self.wip_indices.index(new_idx)
-                elif new_idx in self.mem_indices:
-                    listbox = self.mem_list
-                    list_index = self.mem_indices.index(new_idx)
-                else:
-                    return
-
-                # clear other list selection and select the new item
-                if listbox is self.wip_list:
-                    self.mem_list.selection_clear(0, tk.END)
-                else:
-                    self.wip_list.selection_clear(0, tk.END)
-
-                listbox.selection_clear(0, tk.END)
-                listbox.selection_set(list_index)
-                listbox.see(list_index)
+            self._add_and_select(ref)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not add verse: {e}")
 
-                if hasattr(self, "on_selection_change"):
-                    self.on_selection_change()
-            except ValueError:
-                # nothing to do if not found
-                pass
+    def find_reference(self):
+        """Look up a passage by the words the user remembers and add it to the sheath."""
+        dialog = FindReferenceDialog(self)
+        ref = dialog.result
+        if not ref:
+            return
 
+        try:
+            self._add_and_select(ref)
         except Exception as e:
             messagebox.showerror("Error", f"Could not add verse: {e}")
 
-            dialog = AddVerseDialog(self)
-            ref = dialog.result
-            if ref:
-                try:
-                    self.sheath.addPassages([ref])
-                    self.load_verses()
-                except Exception as e:
-                    messagebox.showerror("Error", f"Could not add verse: {e}")
+    def _add_and_select(self, ref):
+        """Add `ref` to the list matching the current selection and select it."""
+        status = 1 if self.mem_list.curselection() else 0
+        entry = self.model.add(ref, status)
+        self._select_entry(entry)
 
     def edit_selected(self):
         """
         Open AddVerseDialog prepopulated with the currently selected verse.
         Replace the old passage with the edited one and preserve the memorization status
-        (WIP vs Memorized) of the original passage.
+        (WIP vs Memorized) and favorite flag of the original passage.
         """
-        ref = self.get_selected_ref()
-        if not ref:
+        entry = self.get_selected_entry()
+        if entry is None:
             messagebox.showwarning("No selection", "Please select a verse to edit.")
             return
 
-        # Determine original mem status (0 = WIP, 1 = Memorized)
-        original_mem_status = 0
-        try:
-            # If the selected index is in mem_indices, it's memorized
-            passage_idx = self.passages.index(ref)
-            if passage_idx in self.mem_indices:
-                original_mem_status = 1
-            else:
-                original_mem_status = 0
-        except Exception:
-            # fallback: assume WIP
-            original_mem_status = 0
-
         # Open dialog with initial values
-        dialog = AddVerseDialog(self, initial_ref=ref)
+        dialog = AddVerseDialog(self, initial_ref=entry.ref)
         new_ref = dialog.result
         if new_ref is None:
             return  # user cancelled
 
         try:
-            # Remove old and add new passage
-            # If your Sheath has an update method, prefer that to preserve ordering/metadata
-            self.sheath.removePassages([ref])
-            self.sheath.addPassages([new_ref])
-
-            # Ensure the new passage has the same mem status as the original
-            self.sheath.setMemStatus([new_ref], [original_mem_status])
-
-            # Reload lists
-            self.load_verses()
-
-            # Re-select the edited passage in the appropriate list
-            try:
-                new_passage_idx = self.passages.index(new_ref)
-                if new_passage_idx in self.wip_indices:
-                    listbox = self.wip_list
-                    list_index = self.wip_indices.index(new_passage_idx)
-                elif new_passage_idx in self.mem_indices:
-                    listbox = self.mem_list
-                    list_index = self.mem_indices.index(new_passage_idx)
-                else:
-                    # not found; clear selections
-                    self.wip_list.selection_clear(0, tk.END)
-                    self.mem_list.selection_clear(0, tk.END)
-                    if hasattr(self, "on_selection_change"):
-                        self.on_selection_change()
-                    return
-
-                # Clear other list selection, set selection in the correct list, and ensure it's visible
-                if listbox is self.wip_list:
-                    self.mem_list.selection_clear(0, tk.END)
-                else:
-                    self.wip_list.selection_clear(0, tk.END)
-
-                listbox.selection_clear(0, tk.END)
-                listbox.selection_set(list_index)
-                listbox.see(list_index)
-
-                # Update preview
-                if hasattr(self, "on_selection_change"):
-                    self.on_selection_change()
-            except ValueError:
-                # fallback: clear selection and update preview
-                self.wip_list.selection_clear(0, tk.END)
-                self.mem_list.selection_clear(0, tk.END)
-                if hasattr(self, "on_selection_change"):
-                    self.on_selection_change()
-
+            self.model.remove(entry.ref)
+            new_entry = self.model.add(new_ref, entry.status, entry.favorite)
+            self._select_entry(new_entry)
         except Exception as e:
             messagebox.showerror("Error", f"Could not edit verse: {e}")
 
-            """
-            Open the AddVerseDialog prepopulated with the currently selected verse.
-            Replace the old passage with the edited one and preserve selection.
-            """
-            # Get currently selected ref
-            ref = self.get_selected_ref()
-            if not ref:
-                messagebox.showwarning("No selection", "Please select a verse to edit.")
-                return
-
-            # Open dialog with initial_ref set
-            dialog = AddVerseDialog(self, initial_ref=ref)
-            new_ref = dialog.result
-            if new_ref is None:
-                return  # user cancelled
-
-            try:
-                # Replace the old passage with the new one in the sheath
-                # Use sheath API: remove old, add new (preserves file-based canonical ordering if addPassages appends)
-                # If your Sheath supports an update method, use that instead.
-                self.sheath.removePassages([ref])
-                self.sheath.addPassages([new_ref])
-
-                # Reload lists
-                self.load_verses()
-
-                # Re-select the edited passage in the appropriate list (if present)
-                try:
-                    new_passage_idx = self.passages.index(new_ref)
-                    if new_passage_idx in self.wip_indices:
-                        listbox = self.wip_list
-                        list_index = self.wip_indices.index(new_passage_idx)
-                    elif new_passage_idx in self.mem_indices:
-                        listbox = self.mem_list
-                        list_index = self.mem_indices.index(new_passage_idx)
-                    else:
-                        # not found; clear selections
-                        self.wip_list.selection_clear(0, tk.END)
-                        self.mem_list.selection_clear(0, tk.END)
-                        if hasattr(self, "on_selection_change"):
-                            self.on_selection_change()
-                        return
-
-                    # Clear other list selection, set selection in the correct list, and ensure it's visible
-                    if listbox is self.wip_list:
-                        self.mem_list.selection_clear(0, tk.END)
-                    else:
-                        self.wip_list.selection_clear(0, tk.END)
-
-                    listbox.selection_clear(0, tk.END)
-                    listbox.selection_set(list_index)
-                    listbox.see(list_index)
-
-                    # Update preview
-                    if hasattr(self, "on_selection_change"):
-                        self.on_selection_change()
-                except ValueError:
-                    # fallback: clear selection and update preview
-                    self.wip_list.selection_clear(0, tk.END)
-                    self.mem_list.selection_clear(0, tk.END)
-                    if hasattr(self, "on_selection_change"):
-                        self.on_selection_change()
-
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not edit verse: {e}")
-
     def remove_selected(self):
         ref = self.get_selected_ref()
         if not ref:
@@ -479,154 +443,48 @@ class VersesMenu(ttk.Frame, MinSizeMixin):
             return
         confirm = messagebox.askyesno("Confirm Delete", f"Remove {ref.book.name} {ref.start_chapter}:{ref.start_verse}?")
         if confirm:
-            self.sheath.removePassages([ref])
-            self.load_verses()
+            try:
+                self.model.remove(ref)
+            except Exception as e:
+                messagebox.showerror("Error", f"Could not remove verse: {e}")
+            self.on_selection_change()
 
     def toggle_favorite(self):
         """
         Toggle favorite for the currently selected passage while preserving selection.
         """
-        # Get currently selected ref (from either list)
-        ref = self.get_selected_ref()
-        if not ref:
+        entry = self.get_selected_entry()
+        if entry is None:
             messagebox.showwarning("No selection", "Please select a verse.")
             return
 
         try:
-            # Remember the identity of the passage in self.passages (index)
-            try:
-                passage_idx = self.passages.index(ref)
-            except ValueError:
-                # fallback: try to locate via sheath.findPassages
-                rows = self.sheath.findPassages([ref])
-                if not rows:
-                    messagebox.showerror("Error", "Could not locate the selected passage.")
-                    return
-                passage_idx = rows[0]
-
-            # Toggle favorite using sheath helpers
-            # Read CSV line to determine current favorite state (if your sheath doesn't provide a getter)
-            with open(self.sheath.filename, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-            # sheath.findPassages returns file-row index (0-based for data rows) — adjust if needed
-            # Try to find the CSV row that corresponds to passage_idx
-            csv_row_idx = passage_idx  # if your sheath.getPassages() preserves file order
-            # If your sheath.findPassages returns a different mapping, prefer that:
-            try:
-                rows = self.sheath.findPassages([ref])
-                if rows:
-                    csv_row_idx = rows[0]
-            except Exception:
-                pass
-
-            # Read the CSV line and check favorite column (safe parsing)
-            line_idx = csv_row_idx + 1  # account for header row if present
-            current_status = "False"
-            if 0 <= line_idx < len(lines):
-                parts = lines[line_idx].rstrip("\n").split(",")
-                current_status = parts[7].strip() if len(parts) > 7 else "False"
-
-            # Toggle using sheath API
-            if current_status == "True":
-                self.sheath.unsetFavorites([ref])
-            else:
-                self.sheath.setFavorites([ref])
-
-            # Reload lists (this repopulates self.passages, wip_indices, mem_indices)
-            self.load_verses()
-
-            # After reload, find the passage object again and re-select it
-            try:
-                # find the passage object in self.passages (NormalizedReference equality should work)
-                new_passage_idx = self.passages.index(ref)
-                # determine which list it belongs to
-                if new_passage_idx in self.wip_indices:
-                    listbox = self.wip_list
-                    list_index = self.wip_indices.index(new_passage_idx)
-                elif new_passage_idx in self.mem_indices:
-                    listbox = self.mem_list
-                    list_index = self.mem_indices.index(new_passage_idx)
-                else:
-                    # not found in either list — just clear selection
-                    self.wip_list.selection_clear(0, tk.END)
-                    self.mem_list.selection_clear(0, tk.END)
-                    if hasattr(self, "on_selection_change"):
-                        self.on_selection_change()
-                    return
-
-                # Clear other list selection, set selection in the correct list, and ensure it's visible
-                if listbox is self.wip_list:
-                    self.mem_list.selection_clear(0, tk.END)
-                else:
-                    self.wip_list.selection_clear(0, tk.END)
-
-                listbox.selection_clear(0, tk.END)
-                listbox.selection_set(list_index)
-                listbox.see(list_index)
-
-                # Update preview/other UI
-                if hasattr(self, "on_selection_change"):
-                    self.on_selection_change()
-            except ValueError:
-                # If we can't find it, just clear selections and update UI
-                self.wip_list.selection_clear(0, tk.END)
-                self.mem_list.selection_clear(0, tk.END)
-                if hasattr(self, "on_selection_change"):
-                    self.on_selection_change()
-
+            self.model.set_favorite(entry.ref, not entry.favorite)
         except Exception as e:
             messagebox.showerror("Error", f"Could not toggle favorite: {e}")
 
     def move_to_memorized(self):
-        """Move selected verse from WIP to Memorized (uses get_selected_ref())."""
-        # ensure a WIP item is selected
+        """Move selected verse from WIP to Memorized."""
         if not self.wip_list.curselection():
             messagebox.showwarning("No selection", "Select a verse in WIP.")
             return
-
-        # get the currently selected ref (works with your get_selected_ref())
-        ref = self.get_selected_ref()
-        if not ref:
-            return
-
-        # update memorization status and refresh lists
-        self.sheath.setMemStatus([ref], [1])
-        self.load_verses()
-
-        # clear WIP selection and try to select the moved item in Memorized
-        try:
-            self.wip_list.selection_clear(0, tk.END)
-            new_index = self.mem_indices.index(self.passages.index(ref))
-            self.mem_list.selection_clear(0, tk.END)
-            self.mem_list.selection_set(new_index)
-        except Exception:
-            # if we can't find it, just clear selection
-            self.wip_list.selection_clear(0, tk.END)
-
-        # update preview/selection-driven UI
-        if hasattr(self, "on_selection_change"):
-            self.on_selection_change()
+        self._move_selected(1)
 
     def move_to_wip(self):
-        """Move selected verse from Memorized to WIP (uses get_selected_ref())."""
+        """Move selected verse from Memorized to WIP."""
         if not self.mem_list.curselection():
             messagebox.showwarning("No selection", "Select a verse in Memorized.")
             return
+        self._move_selected(0)
 
-        ref = self.get_selected_ref()
-        if not ref:
+    def _move_selected(self, status):
+        entry = self.get_selected_entry()
+        if entry is None:
             return
-
-        self.sheath.setMemStatus([ref], [0])
-        self.load_verses()
-
         try:
-            self.mem_list.selection_clear(0, tk.END)
-            new_index = self.wip_indices.index(self.passages.index(ref))
-            self.wip_list.selection_clear(0, tk.END)
-            self.wip_list.selection_set(new_index)
-        except Exception:
-            self.mem_list.selection_clear(0, tk.END)
-
-        if hasattr(self, "on_selection_change"):
-            self.on_selection_change()
\ No newline at end of file
+            self.model.set_status(entry.ref, status)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not move verse: {e}")
+            return
+        # follow the moved item into its new list
+        self._select_entry(entry)
@@ -0,0 +1,63 @@
+# scripts/word_errors.py
+from array import array
+from bisect import bisect_right
+
+from scripts.persisted_store import PersistedStore, shared_store
+
+WORD_ERRORS_FILE = "resources/word_errors.json"
+
+# Error rates (errors / attempts) where each heat level starts; level 0 is "never missed"
+HEAT_THRESHOLDS = (0.01, 0.2, 0.4, 0.7)
+
+
+class WordErrorStore(PersistedStore):
+    """
+    Per-passage error counters: for each passage word (grading.build_word_list
+    order) how many recited attempts missed or mistyped it, in an array('I'),
+    plus the number of attempts. Recording an attempt touches only its wrong
+    words, so the heatmap never has to re-diff old attempts.
+    """
+
+    def __init__(self, filename=WORD_ERRORS_FILE):
+        self.errors = {}     # passage key -> array('I') of per-word error counts
+        self.attempts = {}   # passage key -> attempts recorded
+        super().__init__(filename)
+
+    def from_json(self, data):
+        for key, entry in data.items():
+            self.errors[key] = array("I", entry.get("errors", []))
+            self.attempts[key] = entry.get("attempts", 0)
+
+    def to_json(self):
+        return {key: {"attempts": self.attempts.get(key, 0), "errors": counts.tolist()}
+                for key, counts in self.errors.items()}
+
+    def record(self, key, positions):
+        """Count one attempt whose wrong or missed words are at `positions`."""
+        with self._lock:
+            counts = self.errors.get(key)
+            if counts is None:
+                counts = self.errors[key] = array("I")
+            if positions:
+                needed = max(positions) + 1 - len(counts)
+                if needed > 0:
+                    counts.extend(array("I", [0]) * needed)
+                for i in set(positions):
+                    counts[i] += 1
+            self.attempts[key] = self.attempts.get(key, 0) + 1
+            due = self._changed()
+        if due:
+            self.save()
+
+    def heat_levels(self, key):
+        """Per-word heat level (0 to len(HEAT_THRESHOLDS)) for a passage, or None if never attempted."""
+        attempts = self.attempts.get(key, 0)
+        counts = self.errors.get(key)
+        if not attempts or counts is None:
+            return None
+        return [bisect_right(HEAT_THRESHOLDS, n / attempts) for n in counts]
+
+
+def get_word_errors():
+    """Return the shared WordErrorStore (saved automatically at exit)."""
+    return shared_store(WordErrorStore)
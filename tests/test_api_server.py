@@ -0,0 +1,89 @@
+import pytest
+
+from scripts.api_server import create_app
+from scripts.history import AttemptHistory
+from scripts.settings import SettingsStore
+from scripts.sheath import Sheath
+from scripts.sheath_model import SheathModel
+
+JOHN_3_16 = "43:3:16-3:16:"
+UNKNOWN = "1:1:1-1:2:"
+
+
+@pytest.fixture
+def model(tmp_path):
+    csv = tmp_path / "verses.csv"
+    csv.write_text("Book,StartChapter,StartVerse,EndChapter,EndVerse,EndBook,WIP,Favorite\n"
+                   "43,3,16,3,16,None,0,False\n", encoding="utf-8")
+    model = SheathModel(Sheath(str(csv)))
+    yield model
+    model.io.flush(5)
+
+
+@pytest.fixture
+def client(tmp_path, model):
+    history = AttemptHistory(str(tmp_path / "history.log"), str(tmp_path / "history_stats.json"))
+    settings = SettingsStore(str(tmp_path / "settings.json"))
+    return create_app(model, history, settings).test_client()
+
+
+def test_add_passage_is_201_then_200_with_flags_applied(client):
+    response = client.post("/api/passages", json={"reference": "Jude 1:24"})
+    assert response.status_code == 201
+    assert response.get_json()["favorite"] is False
+
+    response = client.post("/api/passages", json={"reference": "Jude 1:24", "favorite": True})
+    assert response.status_code == 200
+    assert response.get_json()["favorite"] is True
+    assert client.get(f"/api/passages/{response.get_json()['key']}").get_json()["favorite"] is True
+
+
+def test_add_passage_rejects_unknown_reference(client):
+    assert client.post("/api/passages", json={"reference": "not a verse"}).status_code == 400
+
+
+@pytest.mark.parametrize("path", ["/api/passages", "/api/history", f"/api/passages/{JOHN_3_16}/text"])
+def test_matching_etag_is_304(client, path):
+    first = client.get(path)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    again = client.get(path, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+
+
+def test_etag_changes_with_the_sheath(client):
+    etag = client.get("/api/passages").headers["ETag"]
+    client.patch(f"/api/passages/{JOHN_3_16}", json={"memorized": True})
+    assert client.get("/api/passages", headers={"If-None-Match": etag}).status_code == 200
+
+
+@pytest.mark.parametrize("method, path", [
+    ("get", f"/api/passages/{UNKNOWN}"),
+    ("patch", f"/api/passages/{UNKNOWN}"),
+    ("delete", f"/api/passages/{UNKNOWN}"),
+    ("get", f"/api/passages/{UNKNOWN}/text"),
+    ("post", f"/api/passages/{UNKNOWN}/grade"),
+    ("get", f"/api/history/{UNKNOWN}"),
+])
+def test_unknown_key_is_404(client, method, path):
+    response = getattr(client, method)(path, json={"attempt": "In the beginning"})
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("body", [
+    {"attempt": "For God so loved the world", "mode": "bogus"},
+    {"attempt": "   "},
+    {},
+])
+def test_bad_grade_request_is_400(client, body):
+    response = client.post(f"/api/passages/{JOHN_3_16}/grade", json=body)
+    assert response.status_code == 400
+
+
+def test_grade_records_attempt(client):
+    response = client.post(f"/api/passages/{JOHN_3_16}/grade",
+                           json={"attempt": "John 3:16", "mode": "reference"})
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result["score"] == 100 and result["passed"]
+    assert result["stats"]["count"] == 1
@@ -0,0 +1,42 @@
+from scripts.history import AttemptHistory
+
+
+def make_history(tmp_path):
+    return AttemptHistory(str(tmp_path / "history.log"), str(tmp_path / "history_stats.json"))
+
+
+def test_record_compact_reload_counts_each_attempt_once(tmp_path):
+    history = make_history(tmp_path)
+    history.record("k", 80, 1.0, "recite")
+    history.flush()
+    history.record("k", 90, 1.0, "recite")   # still buffered when compaction starts
+    history.compact()
+    history.record("k", 70, 1.0, "recite")
+    history.flush()
+
+    assert history.get_stats("k")["count"] == 3
+    reloaded = make_history(tmp_path)
+    assert reloaded.get_stats("k")["count"] == 3
+    assert reloaded.get_stats("k")["last"] == 70
+
+
+def test_compact_folds_in_attempts_from_another_writer(tmp_path):
+    first = make_history(tmp_path)
+    second = make_history(tmp_path)
+    first.record("k", 80, 1.0, "recite")
+    second.record("k", 60, 1.0, "recite")
+    second.flush()
+    first.compact()
+    second.compact()
+
+    assert make_history(tmp_path).get_stats("k")["count"] == 2
+
+
+def test_reference_attempts_are_kept_apart(tmp_path):
+    history = make_history(tmp_path)
+    history.record("k", 100, 1.0, "reference")
+    history.compact()
+
+    reloaded = make_history(tmp_path)
+    assert reloaded.get_stats("k")["count"] == 0
+    assert reloaded.get_stats("k", "reference")["count"] == 1
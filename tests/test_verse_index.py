@@ -0,0 +1,32 @@
+import pythonbible as bible
+
+from scripts.grading import DEFAULT_PASS_SCORE
+from scripts.verse_index import grade_reference
+
+
+def grade(answer, target):
+    return grade_reference(answer, bible.get_references(target)[0])[0]
+
+
+def test_exact_reference_scores_full_marks():
+    assert grade("John 3:16", "John 3:16") == 100
+
+
+def test_book_only_answer_does_not_pass():
+    assert grade("John", "John 3:16") < DEFAULT_PASS_SCORE
+    assert grade("Romans", "Romans 12:1-3") < DEFAULT_PASS_SCORE
+
+
+def test_chapter_only_answer_does_not_pass():
+    assert grade("John 3", "John 3:16") < DEFAULT_PASS_SCORE
+    assert grade("John 3:1-36", "John 3:16") < DEFAULT_PASS_SCORE
+    assert grade("Romans 12", "Romans 12:1-3") < DEFAULT_PASS_SCORE
+
+
+def test_book_only_scores_below_chapter_only():
+    assert grade("John", "John 3:16") < grade("John 3", "John 3:16")
+
+
+def test_partial_overlap_scores_above_chapter_only():
+    partial = grade("Romans 12:1-2", "Romans 12:1-3")
+    assert grade("Romans 12", "Romans 12:1-3") < partial < 100